@@ -1,11 +1,11 @@
 from __future__ import annotations
-from app.repositories.analytics import find_airline_occupancy_orm, find_top_routes_by_country_orm
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from datetime import date
 from typing import Optional, List
 from app.api.deps import get_session
 from app.services import analytics as svc
+from app.services.cache import analytics_cache
 from app.schemas.analytics import (
     AirlineOccupancyOut,
     DomesticAltitudePercentage,
@@ -40,12 +40,9 @@ def airline_occupancy(
     Returns:
         List[AirlineOccupancyOut]: Lista de aerolíneas con su ocupación promedio y estadísticas.
     """
-    return find_airline_occupancy_orm(
-        db,
-        start=start,
-        end=end,
-        only_operated=only_operated,
-        min_flights=min_flights,
+    params = {"start": start, "end": end, "only_operated": only_operated, "min_flights": min_flights}
+    return analytics_cache.get_or_compute(
+        "airline-occupancy", params, lambda: svc.airline_occupancy(db, **params)
     )
 
 
@@ -70,7 +67,10 @@ def domestic_altitude_percentage(
     Returns:
         DomesticAltitudePercentage: Porcentaje de rutas domésticas con ocupación ≥ umbral.
     """
-    return svc.domestic_altitude_percentage(db, min_occupancy=min_occupancy)
+    params = {"min_occupancy": min_occupancy}
+    return analytics_cache.get_or_compute(
+        "domestic-altitude-percentage", params, lambda: svc.domestic_altitude_percentage(db, **params)
+    )
 
 
 @router.get("/top-routes-by-country", response_model=List[TopRouteOut])
@@ -103,14 +103,16 @@ def top_routes_by_country(
     Returns:
         List[TopRouteOut]: Lista de rutas con conteo de vuelos y métricas agregadas.
     """
-    return find_top_routes_by_country_orm(
-        db,
-        country=country,
-        start=start,
-        end=end,
-        scope=scope,
-        limit=limit,
-        only_operated=only_operated,
+    params = {
+        "country": country,
+        "start": start,
+        "end": end,
+        "scope": scope,
+        "limit": limit,
+        "only_operated": only_operated,
+    }
+    return analytics_cache.get_or_compute(
+        "top-routes-by-country", params, lambda: svc.top_routes(db, **params)
     )
 
 
@@ -122,6 +124,7 @@ def consecutive_high_occupancy_routes(
     min_occupancy: float = Query(0.85, ge=0, le=1),
     start: Optional[date] = None,
     end: Optional[date] = None,
+    min_streak: int = Query(2, ge=2, le=366, description="Mínimo de días consecutivos"),
     db: Session = Depends(get_session),
 ):
     """
@@ -132,15 +135,31 @@ def consecutive_high_occupancy_routes(
             Por defecto 0.85 (85%).
         start (date, optional): Fecha inicial del rango a evaluar.
         end (date, optional): Fecha final del rango a evaluar.
+        min_streak (int): Mínimo de días consecutivos de la racha. Por defecto 2.
         db (Session): Sesión de base de datos inyectada por dependencia.
 
     Returns:
-        List[ConsecutiveHighOccRoute]: Lista de rutas con pares de fechas consecutivas
-        donde la ocupación supera el umbral.
+        List[ConsecutiveHighOccRoute]: Una fila por racha: primer día (`streak_start`),
+        último día (`streak_end`) y cantidad de días (`days`). `first_date`/`second_date`
+        se mantienen como alias obsoletos de `streak_start`/`streak_end`.
     """
-    return svc.consecutive_high_occupancy_routes(
-        db,
-        min_occupancy=min_occupancy,
-        start=start,
-        end=end,
+    params = {"min_occupancy": min_occupancy, "start": start, "end": end, "min_streak": min_streak}
+    return analytics_cache.get_or_compute(
+        "consecutive-high-occupancy-routes", params, lambda: svc.consecutive_high_occupancy_routes(db, **params)
     )
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    """
+    Estado de la caché de resultados de analítica.
+
+    Los endpoints de `/analytics` guardan su resultado por endpoint y parámetros
+    (LRU de `ANALYTICS_CACHE_SIZE` entradas). Cada ingesta incrementa `data_version`
+    y vacía la caché.
+
+    Returns:
+        dict: {"data_version", "size", "max_entries", "hits", "misses", "hit_rate",
+            "evictions", "invalidations"}
+    """
+    return analytics_cache.stats()
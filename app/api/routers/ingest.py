@@ -1,85 +1,228 @@
 # from __future__ import annotations
-from fastapi import APIRouter, UploadFile, File, Depends, Query
-from sqlalchemy.orm import Session
-from app.api.deps import get_session
-from app.ingest.airlines_csv import parse_airlines_csv
-from app.ingest.airport_csv import parse_airports_csv 
-from app.services.airlines import ensure_airline
-from app.services.airports import ensure_airport
-from app.services.routes import ingest_routes_service
+import os
+from fastapi import APIRouter, UploadFile, File, Query, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.ingest.error_log import read_error_log
+from app.services.jobs import jobs, spool_upload
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
 
-@router.post("/airlines")
-async def ingest_airlines(file: UploadFile = File(...), db: Session = Depends(get_session)):
+async def _enqueue(kind: str, file: UploadFile, **options) -> dict:
+    # La copia a disco es bloqueante: se hace en el threadpool para no frenar el event loop
+    path, sha256 = await run_in_threadpool(spool_upload, file.file)
+    job = jobs.submit(
+        kind,
+        path,
+        filename=file.filename,
+        sha256=sha256,
+        content_type=file.content_type,
+        content_encoding=file.headers.get("content-encoding"),
+        **options,
+    )
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": router.url_path_for("get_ingest_job", job_id=job.id),
+    }
+
+
+@router.post("/airlines", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_airlines(file: UploadFile = File(...)):
     """
-    Ingresa aerolíneas desde un archivo CSV.
+    Encola la ingesta de aerolíneas desde un archivo CSV, Parquet o Arrow IPC.
 
-    El CSV se parsea y por cada fila se intenta crear o actualizar la aerolínea
-    en la base de datos. Si la aerolínea ya existe (por IATA o ICAO), no se inserta nuevamente.
+    El archivo se guarda en disco y se procesa en background: se parsea y las
+    aerolíneas se cargan en lote (se consultan de una vez las existentes por id,
+    IATA o ICAO y solo las nuevas se insertan, con `ON CONFLICT DO NOTHING`).
 
     Args:
         file (UploadFile): Archivo CSV con los datos de aerolíneas.
-        db (Session): Sesión de base de datos inyectada por dependencia.
 
     Returns:
-        dict: Cantidad de registros insertados o ya existentes, en la forma:
-            {"inserted_or_existing": N}
-
-    Mejoras futuras:
-        - Insert en batch para optimizar rendimiento.
-        - Informar en logs los registros que no pudieron insertarse.
-        - Insert asíncrono con colas de background tasks.
+        dict: {"job_id", "status", "status_url"}. Al terminar, el `result` del job es
+            {"inserted": N, "existing": M, "conflicting": K, "inserted_or_existing": N + M}
     """
-    airlines = parse_airlines_csv(file.file)
-    inserted = 0
-    for it in airlines:
-        al_inserted = ensure_airline(db, iata=it.get("iata"), icao=it.get("icao"), defaults=it)
-        if al_inserted:
-            inserted += 1
-    return {"inserted_or_existing": inserted}
+    return await _enqueue("airlines", file)
 
 
-@router.post("/routes")
-async def ingest_routes(file: UploadFile = File(...), db: Session = Depends(get_session)):
+@router.post("/routes", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_routes(
+    file: UploadFile = File(...),
+    chunk_size: int | None = Query(
+        None, ge=1, le=settings.INGEST_MAX_CHUNK_SIZE,
+        description="Filas por chunk (default: INGEST_CHUNK_SIZE, máximo: INGEST_MAX_CHUNK_SIZE)",
+    ),
+):
     """
-    Ingresa rutas (vuelos) desde un archivo CSV.
+    Encola la ingesta de rutas (vuelos) desde un archivo CSV, Parquet o Arrow IPC.
+
+    El archivo se guarda en disco y un worker lo procesa con `ingest_routes_service`,
+    que lee, valida e inserta por chunks (commit por chunk). Acepta `.csv.gz` y
+    `.csv.zst` (por extensión o `Content-Encoding`): se guardan comprimidos y se
+    descomprimen en streaming mientras se parsean.
 
-    Se delega la lógica de parseo e inserción al servicio `ingest_routes_service`.
-    Este servicio maneja la validación de datos y la inserción en la base.
+    Re-enviar un archivo idéntico a uno ya cargado no hace nada (`duplicate_file`), y
+    las rutas repetidas (misma aerolínea, origen, destino, fecha y equipamiento) se
+    descartan y se cuentan en `duplicates`.
 
     Args:
         file (UploadFile): Archivo CSV con los datos de rutas/vuelos.
-        db (Session): Sesión de base de datos inyectada por dependencia.
+        chunk_size (int, optional): Cantidad de filas por chunk (hasta `INGEST_MAX_CHUNK_SIZE`; si no, 422).
 
     Returns:
-        dict: Resumen del proceso de ingesta (cantidad de rutas insertadas,
-        rechazadas, etc. según defina el servicio).
+        dict: {"job_id", "status", "status_url"}. Al terminar, el `result` del job es
+            el resumen de la ingesta (insertadas, rechazadas, duplicadas, preview de errores).
     """
-    return ingest_routes_service(db, file.file)
+    return await _enqueue("routes", file, chunk_size=chunk_size)
 
 
-@router.post("/airports")
-async def ingest_airports(file: UploadFile = File(...), db: Session = Depends(get_session)):
+@router.post("/airports", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_airports(file: UploadFile = File(...)):
     """
-    Ingresa aeropuertos desde un archivo CSV.
+    Encola la ingesta de aeropuertos desde un archivo CSV, Parquet o Arrow IPC.
 
-    El CSV se parsea y por cada fila se intenta crear o actualizar el aeropuerto
-    en la base de datos. Si el aeropuerto ya existe (por IATA o ICAO), no se inserta nuevamente.
+    El archivo se guarda en disco y se procesa en background: los aeropuertos se
+    cargan en lote con un upsert por `id` (`INSERT ... ON CONFLICT (id) DO UPDATE`,
+    "último gana").
 
     Args:
         file (UploadFile): Archivo CSV con los datos de aeropuertos.
-        db (Session): Sesión de base de datos inyectada por dependencia.
 
     Returns:
-        dict: Cantidad de registros insertados o ya existentes, en la forma:
-            {"inserted_or_existing": N}
-    """
-    airports = parse_airports_csv(file.file)
-    inserted = 0
-    for ap in airports:
-        ap_inserted = ensure_airport(db, iata=ap.get("iata"), icao=ap.get("icao"), defaults=ap)
-        if ap_inserted:
-            inserted += 1
-    return {"inserted_or_existing": inserted}
+        dict: {"job_id", "status", "status_url"}. Al terminar, el `result` del job es
+            {"inserted": N, "updated": M, "skipped": K, "inserted_or_existing": N + M}
+    """
+    return await _enqueue("airports", file)
+
+
+@router.post("/bundle", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_bundle(
+    file: UploadFile = File(...),
+    chunk_size: int | None = Query(
+        None, ge=1, le=settings.INGEST_MAX_CHUNK_SIZE,
+        description="Filas por chunk de rutas (default: INGEST_CHUNK_SIZE, máximo: INGEST_MAX_CHUNK_SIZE)",
+    ),
+):
+    """
+    Encola la carga completa de un bundle `.zip` / `.tar` (o `.tar.gz`) con
+    aeropuertos, aerolíneas y rutas.
+
+    Los archivos se reconocen por el nombre (`airports*`/`aeropuertos*`,
+    `airlines*`/`aerolineas*`, `routes*`/`rutas*`/`vuelos*`) y pueden venir en
+    cualquiera de los formatos de los endpoints individuales. Se cargan primero las
+    dimensiones y después las rutas, en un único job; mientras se insertan las
+    dimensiones ya se van parseando las rutas.
+
+    Args:
+        file (UploadFile): Bundle zip/tar.
+        chunk_size (int, optional): Cantidad de filas por chunk de rutas (hasta `INGEST_MAX_CHUNK_SIZE`).
+
+    Returns:
+        dict: {"job_id", "status", "status_url"}. Al terminar, el `result` del job trae
+            un resumen por archivo en `files` (el mismo que las ingestas individuales).
+    """
+    return await _enqueue("bundle", file, chunk_size=chunk_size)
+
+
+@router.get("/jobs/{job_id}")
+def get_ingest_job(job_id: str):
+    """
+    Devuelve el estado de un job de ingesta.
+
+    Args:
+        job_id (str): Identificador devuelto por los endpoints `POST /ingest/*`.
+
+    Returns:
+        dict: Estado (`queued`, `running`, `succeeded`, `failed`), filas procesadas,
+            filas rechazadas, filas por segundo, error (si falló) y resultado final.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+def resume_ingest_job(job_id: str):
+    """
+    Reanuda un job de ingesta de rutas que falló (o quedó cortado por un reinicio).
+
+    Se continúa desde el último chunk commiteado, sobre el archivo que quedó en disco:
+    solo se vuelve a procesar el chunk que estaba en curso.
+
+    Args:
+        job_id (str): Identificador del job a reanudar.
+
+    Returns:
+        dict: {"job_id", "status", "status_url", "resumed_from_row"}
+    """
+    try:
+        job = jobs.resume(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if job is None:
+        raise HTTPException(status_code=404, detail="No hay checkpoint para ese job")
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": router.url_path_for("get_ingest_job", job_id=job.id),
+        "resumed_from_row": job.resumed_from_row,
+    }
+
+
+def _error_log_path(job_id: str) -> str:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    if job.error_log_path is None or not os.path.exists(job.error_log_path):
+        raise HTTPException(status_code=404, detail="El job no tiene registro de errores")
+    return job.error_log_path
+
+
+@router.get("/jobs/{job_id}/errors")
+def get_ingest_job_errors(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Pagina las filas rechazadas de un job de ingesta de rutas.
+
+    Args:
+        job_id (str): Identificador del job.
+        offset (int): Errores a saltear.
+        limit (int): Máximo de errores a devolver (hasta 1000).
+
+    Returns:
+        dict: {"job_id", "offset", "limit", "total", "by_reason", "items"}, donde cada
+            item tiene "row", "reason", "errors" y "rec". `total` y `by_reason` se
+            completan cuando el job terminó.
+    """
+    path = _error_log_path(job_id)
+    result = jobs.get(job_id).result or {}
+    return {
+        "job_id": job_id,
+        "offset": offset,
+        "limit": limit,
+        "total": result.get("skipped"),
+        "by_reason": result.get("skipped_by_reason"),
+        "items": read_error_log(path, offset, limit),
+    }
+
+
+@router.get("/jobs/{job_id}/errors.ndjson")
+def download_ingest_job_errors(job_id: str):
+    """
+    Descarga el registro completo de filas rechazadas (NDJSON, un error por línea).
+
+    Args:
+        job_id (str): Identificador del job.
+    """
+    return FileResponse(
+        _error_log_path(job_id),
+        media_type="application/x-ndjson",
+        filename=f"{job_id}-errors.ndjson",
+    )
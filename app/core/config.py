@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,4 +7,27 @@ class Settings(BaseSettings):
     APP_ENV: str = "local"
     LOG_LEVEL: str = "INFO"
 
+    # Ingesta: cantidad de filas que se leen, validan e insertan por chunk
+    INGEST_CHUNK_SIZE: int = 50_000
+    # Máximo `chunk_size` que acepta la API (10 x INGEST_CHUNK_SIZE): acota la memoria por chunk
+    INGEST_MAX_CHUNK_SIZE: int = 500_000
+    # En Postgres, hacer el COPY a una tabla temporal y pasar a `routes` con INSERT ... SELECT
+    INGEST_COPY_STAGING: bool = False
+    # Procesos para parsear/validar rutas en paralelo (1 = en el proceso actual)
+    INGEST_PARSE_WORKERS: int = 1
+    INGEST_PARSE_BLOCK_BYTES: int = 32 * 1024 * 1024
+    # Jobs de ingesta en background: threads del pool y carpeta donde se guardan los uploads
+    INGEST_WORKERS: int = 2
+    INGEST_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "airports-ingest")
+    # Archivos NDJSON con las filas rechazadas de cada job (uno por job)
+    INGEST_ERROR_DIR: str = os.path.join(tempfile.gettempdir(), "airports-ingest-errors")
+    # Horas que se guardan el spool y el checkpoint de un job fallido que nadie reanudó,
+    # los NDJSON de filas rechazadas y el estado en memoria de los jobs terminados
+    INGEST_RETENTION_HOURS: float = 72
+
+    # Caché LRU de resultados de /analytics (entradas; 0 = sin caché). Se invalida en cada ingesta
+    ANALYTICS_CACHE_SIZE: int = 256
+    # Motor de /analytics: "sql" (consultas a la base) o "columnar" (arrays de NumPy en memoria)
+    ANALYTICS_ENGINE: str = "sql"
+
 settings = Settings()
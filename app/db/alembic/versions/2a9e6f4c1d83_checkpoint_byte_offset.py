@@ -0,0 +1,23 @@
+"""Byte offset in ingest_checkpoints
+
+Revision ID: 2a9e6f4c1d83
+Revises: f3c8d21a7b64
+Create Date: 2026-10-17 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a9e6f4c1d83'
+down_revision = 'f3c8d21a7b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ingest_checkpoints', sa.Column('byte_offset', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingest_checkpoints', 'byte_offset')
@@ -0,0 +1,95 @@
+"""Ingest fingerprints (ingest_files + routes.fingerprint)
+
+Revision ID: 5b1e9c2d7f40
+Revises: ac5f4e6aae31
+Create Date: 2026-10-16 10:00:00.000000
+"""
+import hashlib
+import struct
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e9c2d7f40'
+down_revision = 'ac5f4e6aae31'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 50_000
+
+# Copia fija del algoritmo de `app.ingest.fingerprints.route_fingerprints` (no se importa:
+# un cambio posterior en el código de la app no puede cambiar lo que calculó esta migración)
+FINGERPRINT_COLUMNS = ["airline_id", "origin_airport_id", "destination_airport_id", "flight_date", "equipment"]
+_NULL = -2 ** 63
+_EPOCH = date(1970, 1, 1)
+
+
+def _fingerprint(airline_id, origin_id, destination_id, flight_date, equipment) -> int:
+    # BLAKE2b-64 de 4 x int64 little-endian (ids y días desde 1970; NULL = -2**63) + equipamiento UTF-8
+    ints = [_NULL if v is None else int(v) for v in (airline_id, origin_id, destination_id)]
+    ints.append(_NULL if flight_date is None else (flight_date - _EPOCH).days)
+    data = struct.pack("<4q", *ints) + ("" if equipment is None else str(equipment)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True)
+
+
+def _backfill_fingerprints() -> None:
+    # Las rutas ya cargadas reciben su huella, por lotes (keyset sobre `id`); en memoria
+    # queda solo el lote actual
+    conn = op.get_bind()
+    routes = sa.table("routes", sa.column("id"), sa.column("fingerprint"), *(sa.column(c) for c in FINGERPRINT_COLUMNS))
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            sa.select(routes.c.id, *(routes.c[c] for c in FINGERPRINT_COLUMNS))
+            .where(routes.c.id > last_id)
+            .order_by(routes.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        conn.execute(
+            routes.update().where(routes.c.id == sa.bindparam("rid")).values(fingerprint=sa.bindparam("fp")),
+            [{"rid": id_, "fp": _fingerprint(*key)} for id_, *key in batch],
+        )
+
+    # Si hay repetidas, solo la de menor id conserva la huella (las demás quedan en NULL
+    # para que se pueda crear el índice único); lo resuelve la base, no un set en memoria
+    op.execute(
+        """
+        UPDATE routes SET fingerprint = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY fingerprint ORDER BY id) AS rn
+                FROM routes
+                WHERE fingerprint IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+
+
+def upgrade() -> None:
+    op.create_table('ingest_files',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('rows_inserted', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'sha256', name='uq_ingest_files_kind_sha256')
+    )
+    op.add_column('routes', sa.Column('fingerprint', sa.BigInteger(), nullable=True))
+    _backfill_fingerprints()
+    op.create_index('ux_routes_fingerprint', 'routes', ['fingerprint'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_routes_fingerprint', table_name='routes')
+    op.drop_column('routes', 'fingerprint')
+    op.drop_table('ingest_files')
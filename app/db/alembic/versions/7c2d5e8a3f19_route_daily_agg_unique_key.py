@@ -0,0 +1,59 @@
+"""Unique key in route_daily_agg
+
+Revision ID: 7c2d5e8a3f19
+Revises: 2a9e6f4c1d83
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d5e8a3f19'
+down_revision = '2a9e6f4c1d83'
+branch_labels = None
+depends_on = None
+
+KEY = ['airline_id', 'origin_airport_id', 'destination_airport_id', 'flight_date', 'operated_carrier']
+# Misma expresión que `RouteDailyAgg` (NULL → '0001-01-01')
+UNIQUE_KEY = [
+    'airline_id', 'origin_airport_id', 'destination_airport_id',
+    sa.text("COALESCE(flight_date, '0001-01-01')"), 'operated_carrier',
+]
+SAME_KEY = ' AND '.join(f'a.{c} IS NOT DISTINCT FROM d.{c}' for c in KEY)
+
+
+def upgrade() -> None:
+    # Claves repetidas por refrescos concurrentes: se borran y se recalculan desde `routes`
+    op.execute(
+        f"""
+        CREATE TEMPORARY TABLE route_daily_agg_dups AS
+        SELECT {', '.join(KEY)} FROM route_daily_agg GROUP BY {', '.join(KEY)} HAVING COUNT(*) > 1
+        """
+    )
+    op.execute(f"DELETE FROM route_daily_agg a USING route_daily_agg_dups d WHERE {SAME_KEY}")
+    op.execute(
+        f"""
+        INSERT INTO route_daily_agg
+            (airline_id, origin_airport_id, destination_airport_id, flight_date, operated_carrier,
+             flights, tickets, capacity, revenue, max_occupancy)
+        SELECT a.airline_id, a.origin_airport_id, a.destination_airport_id, a.flight_date, a.operated_carrier,
+               COUNT(*),
+               COALESCE(SUM(a.tickets_sold), 0),
+               COALESCE(SUM(a.capacity), 0),
+               COALESCE(SUM(a.tickets_sold * a.price_ticket), 0.0),
+               MAX(a.occupancy)
+        FROM routes a
+        JOIN route_daily_agg_dups d ON {SAME_KEY}
+        GROUP BY a.airline_id, a.origin_airport_id, a.destination_airport_id, a.flight_date, a.operated_carrier
+        """
+    )
+    op.execute("DROP TABLE route_daily_agg_dups")
+
+    op.drop_index('ix_route_daily_agg_key', table_name='route_daily_agg')
+    op.create_index('uq_route_daily_agg_key', 'route_daily_agg', UNIQUE_KEY, unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_route_daily_agg_key', table_name='route_daily_agg')
+    op.create_index('ix_route_daily_agg_key', 'route_daily_agg', KEY, unique=False)
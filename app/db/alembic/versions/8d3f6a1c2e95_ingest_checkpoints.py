@@ -0,0 +1,34 @@
+"""Ingest checkpoints (resumable route ingestion)
+
+Revision ID: 8d3f6a1c2e95
+Revises: 5b1e9c2d7f40
+Create Date: 2026-10-16 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6a1c2e95'
+down_revision = '5b1e9c2d7f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('ingest_checkpoints',
+    sa.Column('job_id', sa.String(length=32), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('options', sa.JSON(), nullable=False),
+    sa.Column('rows_done', sa.Integer(), nullable=False),
+    sa.Column('stats', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingest_checkpoints')
@@ -0,0 +1,62 @@
+"""Route daily aggregates (route_daily_agg)
+
+Revision ID: c4a7e2b91d36
+Revises: 8d3f6a1c2e95
+Create Date: 2026-10-16 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7e2b91d36'
+down_revision = '8d3f6a1c2e95'
+branch_labels = None
+depends_on = None
+
+KEY = ['airline_id', 'origin_airport_id', 'destination_airport_id', 'flight_date', 'operated_carrier']
+
+
+def upgrade() -> None:
+    op.create_table('route_daily_agg',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('airline_id', sa.Integer(), nullable=False),
+    sa.Column('origin_airport_id', sa.Integer(), nullable=False),
+    sa.Column('destination_airport_id', sa.Integer(), nullable=False),
+    sa.Column('flight_date', sa.Date(), nullable=True),
+    sa.Column('operated_carrier', sa.Boolean(), nullable=False),
+    sa.Column('flights', sa.Integer(), nullable=False),
+    sa.Column('tickets', sa.BigInteger(), nullable=False),
+    sa.Column('capacity', sa.BigInteger(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('max_occupancy', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Backfill con las rutas ya cargadas (mismo agregado que `daily_aggregates`)
+    op.execute(
+        """
+        INSERT INTO route_daily_agg
+            (airline_id, origin_airport_id, destination_airport_id, flight_date, operated_carrier,
+             flights, tickets, capacity, revenue, max_occupancy)
+        SELECT airline_id, origin_airport_id, destination_airport_id, flight_date, operated_carrier,
+               COUNT(*),
+               COALESCE(SUM(tickets_sold), 0),
+               COALESCE(SUM(capacity), 0),
+               COALESCE(SUM(tickets_sold * price_ticket), 0.0),
+               MAX(CASE WHEN tickets_sold IS NOT NULL AND capacity IS NOT NULL AND capacity > 0
+                        THEN CAST(tickets_sold AS FLOAT) / CAST(capacity AS FLOAT) END)
+        FROM routes
+        WHERE airline_id IS NOT NULL
+        GROUP BY airline_id, origin_airport_id, destination_airport_id, flight_date, operated_carrier
+        """
+    )
+    op.create_index('ix_route_daily_agg_key', 'route_daily_agg', KEY, unique=False)
+    op.create_index('ix_route_daily_agg_date', 'route_daily_agg', ['flight_date'], unique=False)
+    op.create_index('ix_route_daily_agg_od', 'route_daily_agg', ['origin_airport_id', 'destination_airport_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_route_daily_agg_od', table_name='route_daily_agg')
+    op.drop_index('ix_route_daily_agg_date', table_name='route_daily_agg')
+    op.drop_index('ix_route_daily_agg_key', table_name='route_daily_agg')
+    op.drop_table('route_daily_agg')
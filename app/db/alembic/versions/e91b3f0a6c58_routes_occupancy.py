@@ -0,0 +1,33 @@
+"""Stored routes.occupancy + occupancy indexes
+
+Revision ID: e91b3f0a6c58
+Revises: c4a7e2b91d36
+Create Date: 2026-10-16 16:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e91b3f0a6c58'
+down_revision = 'c4a7e2b91d36'
+branch_labels = None
+depends_on = None
+
+OCCUPANCY_SQL = "CASE WHEN capacity > 0 THEN CAST(tickets_sold AS FLOAT) / capacity END"
+
+
+def upgrade() -> None:
+    # Columna generada STORED: al agregarla la base la calcula para todas las filas existentes
+    op.add_column('routes', sa.Column('occupancy', sa.Float(), sa.Computed(OCCUPANCY_SQL, persisted=True), nullable=True))
+    op.create_index('ix_routes_occupancy_od', 'routes', ['occupancy', 'origin_airport_id', 'destination_airport_id'], unique=False)
+    op.create_index(
+        'ix_route_daily_agg_max_occ', 'route_daily_agg',
+        ['max_occupancy', 'airline_id', 'origin_airport_id', 'destination_airport_id', 'flight_date'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_route_daily_agg_max_occ', table_name='route_daily_agg')
+    op.drop_index('ix_routes_occupancy_od', table_name='routes')
+    op.drop_column('routes', 'occupancy')
@@ -0,0 +1,53 @@
+"""Route pair dimension (route_pairs)
+
+Revision ID: f3c8d21a7b64
+Revises: e91b3f0a6c58
+Create Date: 2026-10-16 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8d21a7b64'
+down_revision = 'e91b3f0a6c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('route_pairs',
+    sa.Column('origin_airport_id', sa.Integer(), nullable=False),
+    sa.Column('destination_airport_id', sa.Integer(), nullable=False),
+    sa.Column('is_domestic', sa.Boolean(), nullable=False),
+    sa.Column('altitude_diff_m', sa.Float(), nullable=True),
+    sa.Column('distance_km', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['origin_airport_id'], ['airports.id'], ),
+    sa.ForeignKeyConstraint(['destination_airport_id'], ['airports.id'], ),
+    sa.PrimaryKeyConstraint('origin_airport_id', 'destination_airport_id')
+    )
+    # Backfill con los pares de las rutas ya cargadas (mismas fórmulas que `pair_attributes`)
+    op.execute(
+        """
+        INSERT INTO route_pairs (origin_airport_id, destination_airport_id, is_domestic, altitude_diff_m, distance_km)
+        SELECT p.origin_airport_id, p.destination_airport_id,
+               COALESCE(ao.country = ad.country, FALSE),
+               ABS((ao.altitude_ft - ad.altitude_ft) * 0.3048),
+               2 * 6371.0088 * ASIN(LEAST(1.0, SQRT(
+                   POWER(SIN(RADIANS(ad.latitude - ao.latitude) / 2), 2)
+                   + COS(RADIANS(ao.latitude)) * COS(RADIANS(ad.latitude))
+                     * POWER(SIN(RADIANS(ad.longitude - ao.longitude) / 2), 2)
+               )))
+        FROM (SELECT DISTINCT origin_airport_id, destination_airport_id FROM routes) p
+        JOIN airports ao ON ao.id = p.origin_airport_id
+        JOIN airports ad ON ad.id = p.destination_airport_id
+        """
+    )
+    op.create_index('ix_route_pairs_domestic_alt', 'route_pairs', ['is_domestic', 'altitude_diff_m'], unique=False)
+    op.create_index('ix_route_pairs_destination', 'route_pairs', ['destination_airport_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_route_pairs_destination', table_name='route_pairs')
+    op.drop_index('ix_route_pairs_domestic_alt', table_name='route_pairs')
+    op.drop_table('route_pairs')
@@ -1,8 +1,9 @@
-import pandas as pd
+from app.ingest.readers import CSV, detect_format, read_columnar, read_dimension_csv
+from app.ingest.timings import StageTimer
 from app.schemas.airlines import AirlineIn
 
 
-def parse_airlines_csv(file) -> list[AirlineIn]:
+def parse_airlines_csv(file, content_type: str | None = None, timer: StageTimer | None = None) -> list[AirlineIn]:
     """
     Parsea un archivo CSV de aerolíneas y devuelve registros validados.
 
@@ -12,6 +13,9 @@ def parse_airlines_csv(file) -> list[AirlineIn]:
 
     Args:
         file (IO): Objeto de archivo abierto (por ejemplo, `UploadFile.file`).
+        content_type (str, optional): Content type del upload; Parquet/Arrow IPC se
+            detectan también por la firma del archivo y se leen con `read_columnar`.
+        timer (StageTimer, optional): Acumula los tiempos de "read" y "validate".
 
     Returns:
         list[AirlineIn]: Lista de aerolíneas validadas y convertidas a 
@@ -23,12 +27,15 @@ def parse_airlines_csv(file) -> list[AirlineIn]:
             {"id": 2, "name": "Aerolíneas Argentinas", "iata": "AR", "icao": "ARG", "country": "Argentina"}
         ]
     """
-    try:
-        df = pd.read_csv(file, sep=",", encoding="utf-8")
-    except Exception:
-        file.seek(0)
-        df = pd.read_csv(file, sep=",", engine="python")
-    return [
-        AirlineIn.model_validate(rec).model_dump()
-        for rec in df.to_dict(orient="records")
-    ]
+    timer = timer or StageTimer()
+    with timer.stage("read"):
+        fmt = detect_format(file, content_type)
+        if fmt != CSV:
+            df = read_columnar(file, fmt)
+        else:
+            df = read_dimension_csv(file)
+    with timer.stage("validate"):
+        return [
+            AirlineIn.model_validate(rec).model_dump()
+            for rec in df.to_dict(orient="records")
+        ]
@@ -1,8 +1,13 @@
-import pandas as pd
-from app.schemas.airports import AirportIn
+from app.ingest.readers import CSV, detect_format, read_columnar, read_dimension_csv
+from app.ingest.timings import StageTimer
+from app.ingest.coords import fix_coords
+from app.schemas.airports import COORDS_FIXED, AirportIn
 
+# Columnas de coordenadas (alias del CSV → campo de `AirportIn`)
+COORD_COLUMNS = {"Latitud": "latitude", "Longitud": "longitude"}
 
-def parse_airports_csv(file) -> list[AirportIn]:
+
+def parse_airports_csv(file, content_type: str | None = None, timer: StageTimer | None = None) -> list[AirportIn]:
     """
     Parsea un archivo CSV de aeropuertos y devuelve registros validados.
 
@@ -10,8 +15,15 @@ def parse_airports_csv(file) -> list[AirportIn]:
     se reintenta con el motor de Python. Cada fila se valida contra el 
     esquema Pydantic `AirportIn`.
 
+    Las coordenadas se reparan antes por columna con `fix_coords` (mismas reglas
+    que el validador) y `AirportIn` las toma tal cual (contexto `COORDS_FIXED`); los
+    valores que no se pudieron reparar quedan crudos y los reporta `AirportIn` como siempre.
+
     Args:
         file (IO): Objeto de archivo abierto (por ejemplo, `UploadFile.file`).
+        content_type (str, optional): Content type del upload; Parquet/Arrow IPC se
+            detectan también por la firma del archivo y se leen con `read_columnar`.
+        timer (StageTimer, optional): Acumula los tiempos de "read" y "validate".
 
     Returns:
         list[AirportIn]: Lista de aeropuertos validados y convertidos a diccionarios
@@ -23,13 +35,23 @@ def parse_airports_csv(file) -> list[AirportIn]:
             {"id": 1234, "name": "Aeropuerto Internacional Ezeiza", "city": "Buenos Aires", "country": "Argentina", "iata": "EZE", "icao": "SAEZ"}
         ]
     """
-    try:
-        df = pd.read_csv(file, sep=",", encoding="utf-8")
-    except Exception:
-        file.seek(0)
-        df = pd.read_csv(file, sep=",", engine="python")
-
-    return [
-        AirportIn.model_validate(rec).model_dump()
-        for rec in df.to_dict(orient="records")
-    ]
+    timer = timer or StageTimer()
+    with timer.stage("read"):
+        fmt = detect_format(file, content_type)
+        if fmt != CSV:
+            df = read_columnar(file, fmt)
+        else:
+            df = read_dimension_csv(file)
+
+    with timer.stage("validate"):
+        for alias, field in COORD_COLUMNS.items():
+            if alias in df.columns:
+                fixed = fix_coords(df[alias], field)
+                df[alias] = fixed.astype(object).where(fixed.notna(), df[alias])
+
+        # Las coordenadas reparadas (float) no vuelven a pasar por `fix_coord` fila por fila
+        context = {COORDS_FIXED: True}
+        return [
+            AirportIn.model_validate(rec, context=context).model_dump()
+            for rec in df.to_dict(orient="records")
+        ]
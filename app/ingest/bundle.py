@@ -0,0 +1,99 @@
+"""
+Lectura de bundles: un `.zip` o `.tar` (también `.tar.gz`, `.tgz`, ...) con los
+archivos de aeropuertos, aerolíneas y rutas.
+
+Cada archivo del bundle se reconoce por el comienzo de su nombre (ver
+`MEMBER_NAMES`) y puede estar en cualquiera de los formatos que aceptan los
+endpoints individuales: CSV (opcionalmente `.gz`/`.zst`), Parquet o Arrow IPC.
+Los miembros se leen directo del archivo, sin extraerlos a disco; cada
+`open_member` abre el bundle de nuevo, así se pueden leer dos miembros a la vez
+desde threads distintos.
+"""
+import os
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Dict, Iterator
+
+from app.ingest.compression import detect_compression, open_decompressed
+
+# Prefijos de nombre de archivo → tipo de archivo del bundle
+MEMBER_NAMES = {
+    "airports": ("airports", "aeropuertos"),
+    "airlines": ("airlines", "aerolineas"),
+    "routes": ("routes", "rutas", "vuelos", "flights"),
+}
+# Orden de carga: primero las dimensiones, después los hechos
+LOAD_ORDER = ("airports", "airlines", "routes")
+
+
+def _classify(name: str) -> str | None:
+    base = os.path.basename(name).lower()
+    if not base or base.startswith("."):
+        return None
+    for kind, prefixes in MEMBER_NAMES.items():
+        if base.startswith(prefixes):
+            return kind
+    return None
+
+
+def list_members(path: str) -> Dict[str, str]:
+    """
+    Reconoce los archivos del bundle.
+
+    Args:
+        path (str): Bundle en disco (zip o tar).
+
+    Returns:
+        Dict[str, str]: tipo ("airports", "airlines", "routes") → nombre del miembro.
+
+    Raises:
+        ValueError: Si no es un zip/tar, no trae ningún archivo reconocible o trae
+            más de un archivo del mismo tipo.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            names = [i.filename for i in zf.infolist() if not i.is_dir()]
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, "r:*") as tf:
+            names = [m.name for m in tf.getmembers() if m.isfile()]
+    else:
+        raise ValueError("El bundle tiene que ser un .zip o un .tar (opcionalmente comprimido)")
+
+    members: Dict[str, str] = {}
+    for name in names:
+        kind = _classify(name)
+        if kind is None:
+            continue
+        if kind in members:
+            raise ValueError(f"El bundle trae más de un archivo de {kind}: {members[kind]}, {name}")
+        members[kind] = name
+    if not members:
+        raise ValueError("El bundle no trae archivos de aeropuertos, aerolíneas ni rutas")
+    return members
+
+
+@contextmanager
+def open_member(path: str, name: str) -> Iterator[IO[bytes]]:
+    """
+    Abre un miembro del bundle para lectura (descomprimiendo `.gz`/`.zst` si hace falta).
+
+    Args:
+        path (str): Bundle en disco.
+        name (str): Nombre del miembro (ver `list_members`).
+
+    Yields:
+        IO[bytes]: Stream binario con `peek` (lo necesitan la detección de formato y separador).
+    """
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        opener = lambda: archive.open(name)  # noqa: E731
+    else:
+        archive = tarfile.open(path, "r:*")
+        opener = lambda: archive.extractfile(name)  # noqa: E731
+    try:
+        with opener() as member:
+            compression = detect_compression(member, filename=name)
+            yield open_decompressed(member, compression) if compression else member
+    finally:
+        archive.close()
@@ -0,0 +1,100 @@
+"""
+Descompresión en streaming de uploads `.gz` / `.zst`.
+
+El upload se guarda comprimido y se descomprime a medida que el parser lo lee:
+nunca se escribe (ni se tiene en memoria) el archivo descomprimido completo.
+El stream resultante no es posicionable, así que se envuelve en un
+`io.BufferedReader` y la detección de formato/separador usa `peek`.
+
+`zstandard` está en requirements.txt; el import es opcional y, si falta, solo
+fallan los `.zst`.
+"""
+import gzip
+import io
+import os
+from typing import IO, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+GZIP, ZSTD = "gzip", "zstd"
+READ_BUFFER = 1024 * 1024
+
+_EXTENSIONS = {".gz": GZIP, ".gzip": GZIP, ".zst": ZSTD, ".zstd": ZSTD}
+_ENCODINGS = {"gzip": GZIP, "x-gzip": GZIP, "zstd": ZSTD}
+_MAGIC = ((b"\x1f\x8b", GZIP), (b"\x28\xb5\x2f\xfd", ZSTD))
+
+
+def peek(file: IO, n: int) -> bytes | str:
+    """
+    Devuelve los primeros `n` bytes/caracteres sin consumirlos.
+
+    Usa `peek` si el archivo lo tiene (streams descomprimidos) y si no
+    `tell`/`read`/`seek`.
+    """
+    if hasattr(file, "peek"):
+        return file.peek(n)[:n]
+    pos = file.tell()
+    head = file.read(n)
+    file.seek(pos)
+    return head
+
+
+def detect_compression(
+    file: IO[bytes],
+    *,
+    filename: Optional[str] = None,
+    content_encoding: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Detecta si el upload viene comprimido.
+
+    Se mira, en orden, el `Content-Encoding` de la parte del upload, la extensión
+    del nombre de archivo y la firma de los primeros bytes.
+
+    Args:
+        file (IO[bytes]): Archivo spooleado, abierto en binario.
+        filename (str, optional): Nombre original del upload.
+        content_encoding (str, optional): Header `Content-Encoding`.
+
+    Returns:
+        Optional[str]: `GZIP`, `ZSTD` o None si no está comprimido.
+    """
+    if content_encoding:
+        found = _ENCODINGS.get(content_encoding.strip().lower())
+        if found:
+            return found
+    if filename:
+        found = _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+        if found:
+            return found
+    head = peek(file, 4)
+    for magic, kind in _MAGIC:
+        if isinstance(head, bytes) and head.startswith(magic):
+            return kind
+    return None
+
+
+def open_decompressed(file: IO[bytes], compression: str) -> io.BufferedReader:
+    """
+    Envuelve `file` en un stream que lo descomprime a medida que se lee.
+
+    Args:
+        file (IO[bytes]): Archivo comprimido, abierto en binario.
+        compression (str): `GZIP` o `ZSTD`.
+
+    Returns:
+        io.BufferedReader: Stream de solo lectura (sin `seek`, con `peek`).
+    """
+    if compression == GZIP:
+        # filename="" para que el stream no herede el `name` del archivo comprimido
+        raw = gzip.GzipFile(fileobj=file, mode="rb", filename="")
+    elif compression == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Para ingerir archivos .zst hace falta instalar `zstandard`")
+        raw = zstandard.ZstdDecompressor().stream_reader(file, read_size=READ_BUFFER)
+    else:
+        raise ValueError(f"Compresión no soportada: {compression}")
+    return io.BufferedReader(raw, buffer_size=READ_BUFFER)
@@ -0,0 +1,64 @@
+"""
+Reparación vectorizada de coordenadas (Latitud/Longitud) de aeropuertos.
+
+Mismas reglas que `fix_coord` (el validador de `AirportIn`), sobre columnas:
+
+- Los valores que son un número decimal simple se parsean de una vez y, si no
+  son plausibles, se les corre la coma dividiendo por 10 en bloque (la misma
+  secuencia de `/ 10.0` que hace la versión fila por fila, así el float final
+  es idéntico).
+- El resto (vacíos, "nan"/"inf", exponentes, basura a reconstruir desde los
+  dígitos) se resuelve con `fix_coord`, una vez por valor distinto.
+"""
+import numpy as np
+import pandas as pd
+
+from app.schemas.airports import fix_coord
+
+_PLAIN_NUMBER_RE = r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)"
+
+
+def _fix_or_nan(v, field_name: str) -> float:
+    # `fix_coord` puede lanzar (p. ej. dígitos no ASCII); ahí se deja que lo reporte Pydantic
+    try:
+        r = fix_coord(v, field_name)
+    except ValueError:
+        return np.nan
+    return np.nan if r is None else r
+
+
+def fix_coords(values: pd.Series, field_name: str) -> pd.Series:
+    """
+    Repara una columna de coordenadas.
+
+    Args:
+        values (pd.Series): Columna cruda (strings o números, como la lea pandas).
+        field_name (str): "latitude" o "longitude" (define el rango plausible).
+
+    Returns:
+        pd.Series: float64 con el mismo índice; NaN donde `fix_coord` devuelve None o falla.
+    """
+    limit = 90 if field_name == "latitude" else 180
+    n = len(values)
+    x = np.full(n, np.nan)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        x[:] = values.to_numpy(dtype="float64")
+        fast = np.isfinite(x)
+    else:
+        s = values.astype(str).str.strip().str.replace(",", ".", regex=False)
+        fast = (s.str.fullmatch(_PLAIN_NUMBER_RE) & values.notna()).to_numpy(dtype=bool)
+        if fast.any():
+            x[fast] = s[fast].astype("float64").to_numpy()
+        fast &= np.isfinite(x)
+
+    # Correr el decimal a la izquierda mientras no entre en rango
+    move = fast & (np.abs(x) > limit)
+    while move.any():
+        x[move] /= 10.0
+        move &= np.abs(x) > limit
+
+    slow = ~fast
+    if slow.any():
+        codes, uniques = pd.factorize(values[slow], use_na_sentinel=False)
+        x[slow] = np.array([_fix_or_nan(u, field_name) for u in uniques], dtype="float64")[codes]
+    return pd.Series(x, index=values.index)
@@ -0,0 +1,119 @@
+"""
+Parseo de fechas de vuelo (columna `Fecha`).
+
+El camino de referencia es `pd.to_datetime(v, errors="coerce", dayfirst=False)`,
+que adivina el formato en cada llamada y es caro. Los archivos de rutas usan un
+solo formato y pocas fechas distintas, así que:
+
+- `detect_date_format` elige una vez, sobre una muestra, el primer formato de
+  `DATE_FORMATS` que parsea todos los valores (mes antes que día, igual que
+  `dayfirst=False`).
+- `parse_dates` parsea los valores con ese formato fijo y manda a `parse_date`
+  solo los que no encajan.
+- `parse_date` memoiza por string (caché acotada) y usa el camino de referencia
+  para lo que no coincide con ningún formato conocido.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import pandas as pd
+
+# Formatos que se prueban en orden; los ambiguos van con el mes primero
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+)
+DATE_CACHE_SIZE = 4096
+DETECT_SAMPLE_SIZE = 100
+# Rango representable en datetime64[ns]; afuera pandas devuelve NaT
+_MIN_DATE, _MAX_DATE = pd.Timestamp.min.date(), pd.Timestamp.max.date()
+
+
+def detect_date_format(values: Iterable[str], sample_size: int = DETECT_SAMPLE_SIZE) -> Optional[str]:
+    """
+    Devuelve el primer formato de `DATE_FORMATS` que parsea toda la muestra.
+
+    Args:
+        values (Iterable[str]): Fechas no vacías (idealmente ya sin repetidos).
+        sample_size (int): Cantidad de valores que se miran.
+
+    Returns:
+        Optional[str]: Formato `strptime`, o None si ninguno sirve para toda la muestra.
+    """
+    sample = []
+    for v in values:
+        sample.append(v)
+        if len(sample) >= sample_size:
+            break
+    if not sample:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            for v in sample:
+                datetime.strptime(v, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_str(s: str) -> Optional[date]:
+    for fmt in DATE_FORMATS:
+        try:
+            d = datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+        if _MIN_DATE < d < _MAX_DATE:
+            return d
+        break
+    dt = pd.to_datetime(s, errors="coerce", dayfirst=False)
+    return dt.date() if not pd.isna(dt) else None
+
+
+def parse_date(v) -> Optional[date]:
+    """
+    Parsea una fecha suelta con el mismo resultado que el camino de referencia de pandas.
+
+    Los strings se memoizan (LRU de `DATE_CACHE_SIZE`); otros tipos van directo a pandas.
+
+    Args:
+        v: Valor crudo de la columna `Fecha`.
+
+    Returns:
+        Optional[date]: Fecha, o None si está vacía o no se puede interpretar.
+    """
+    if v is None or str(v).strip() == "":
+        return None
+    if isinstance(v, str):
+        return _parse_str(v)
+    dt = pd.to_datetime(v, errors="coerce", dayfirst=False)
+    return dt.date() if not pd.isna(dt) else None
+
+
+def parse_dates(values, fmt: Optional[str] = None) -> pd.Series:
+    """
+    Parsea un array de fechas (strings no vacíos) a `datetime64[ns]` normalizado.
+
+    Args:
+        values: Fechas crudas, típicamente los valores distintos de un chunk.
+        fmt (str, optional): Formato fijo; si no se pasa se detecta con `detect_date_format`.
+
+    Returns:
+        pd.Series: Fechas a medianoche (NaT si no se pueden interpretar), en el mismo orden.
+    """
+    values = pd.Series(values, dtype=object)
+    if fmt is None:
+        fmt = detect_date_format(values)
+    if fmt is not None:
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    miss = parsed.isna()
+    if miss.any():
+        parsed[miss] = pd.to_datetime(pd.Series([parse_date(v) for v in values[miss]], index=values[miss].index, dtype=object))
+    return parsed.dt.normalize()
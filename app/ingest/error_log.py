@@ -0,0 +1,97 @@
+"""
+Registro de filas rechazadas durante una ingesta.
+
+Los errores se escriben a medida que aparecen en un archivo NDJSON (un objeto
+JSON por línea) y en memoria solo quedan los contadores por motivo y los
+primeros errores para el preview del resumen. Así el consumo de memoria no
+depende de cuántas filas malas traiga el archivo.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+PREVIEW_SIZE = 10
+
+
+class ErrorLog:
+    """
+    Acumula errores de ingesta: contadores + preview en memoria y, si se pasa
+    `path`, el detalle completo en un archivo NDJSON.
+    """
+
+    def __init__(self, path: Optional[str] = None, *, preview_size: int = PREVIEW_SIZE, append: bool = False):
+        self.path = path
+        self.total = 0
+        self.by_reason: Dict[str, int] = {}
+        self.preview: List[Dict[str, Any]] = []
+        self._preview_size = preview_size
+        self._fh = None
+        if path is not None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # append=True al reanudar una ingesta: se sigue el archivo del intento anterior
+            self._fh = open(path, "a" if append else "w", encoding="utf-8")
+
+    def restore(self, by_reason: Dict[str, int]) -> None:
+        """Suma contadores de un intento anterior (al reanudar desde un checkpoint)."""
+        for reason, n in by_reason.items():
+            self.by_reason[reason] = self.by_reason.get(reason, 0) + n
+            self.total += n
+
+    def write(self, errors: Iterable[Dict[str, Any]]) -> None:
+        """
+        Registra un lote de errores (cada uno con al menos "row" y "reason").
+
+        Al terminar el lote se hace `flush`: lo escrito ya se puede leer desde
+        `GET /ingest/jobs/{job_id}/errors` mientras el job sigue corriendo.
+        """
+        for e in errors:
+            self.total += 1
+            self.by_reason[e["reason"]] = self.by_reason.get(e["reason"], 0) + 1
+            if len(self.preview) < self._preview_size:
+                self.preview.append(e)
+            if self._fh is not None:
+                # `default=str`: los errores de Pydantic pueden traer excepciones en "ctx"
+                self._fh.write(json.dumps(e, default=str, ensure_ascii=False))
+                self._fh.write("\n")
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "ErrorLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_error_log(path: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    Lee una página del archivo de errores.
+
+    Args:
+        path (str): Archivo NDJSON escrito por `ErrorLog`.
+        offset (int): Cantidad de errores a saltear.
+        limit (int): Máximo de errores a devolver.
+
+    Returns:
+        List[Dict[str, Any]]: Errores en el orden en que se registraron.
+    """
+    out: List[Dict[str, Any]] = []
+    for i, line in enumerate(_lines(path)):
+        if i < offset:
+            continue
+        if len(out) >= limit:
+            break
+        out.append(json.loads(line))
+    return out
+
+
+def _lines(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield line
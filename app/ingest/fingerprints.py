@@ -0,0 +1,78 @@
+"""
+Huellas para hacer idempotente la re-ingesta de rutas.
+
+- Archivo: SHA-256 del contenido (se calcula mientras se guarda el upload en disco).
+- Fila: hash de 64 bits de (aerolínea, origen, destino, fecha, equipamiento),
+  guardado en `routes.fingerprint` con índice único; las filas repetidas se
+  descartan en el INSERT con `ON CONFLICT (fingerprint) DO NOTHING`.
+
+La huella de fila es BLAKE2b (digest de 8 bytes, leído como int64 little-endian)
+de una codificación de bytes fija: los tres ids y la fecha (días desde 1970-01-01)
+como int64 little-endian (NULL = -2**63), seguidos del equipamiento en UTF-8 (NULL
+= vacío). No depende de la versión de pandas ni de numpy: el índice único la
+compara contra huellas guardadas en deploys anteriores. Da lo mismo para un
+DataFrame salido de `validate_routes_frame` que para filas leídas de la base.
+La migración 5b1e9c2d7f40 tiene su propia copia del algoritmo: si se cambia acá,
+las huellas ya guardadas dejan de coincidir.
+"""
+import hashlib
+from typing import IO
+
+import numpy as np
+import pandas as pd
+
+FINGERPRINT_COLUMNS = ["airline_id", "origin_airport_id", "destination_airport_id", "flight_date", "equipment"]
+FINGERPRINT_DIGEST_SIZE = 8
+_NULL = np.iinfo(np.int64).min
+_COPY_BUFFER = 1024 * 1024
+
+
+def route_fingerprints(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Calcula la huella de cada ruta.
+
+    Args:
+        frame (pd.DataFrame): Rutas con las columnas de `FINGERPRINT_COLUMNS`.
+
+    Returns:
+        np.ndarray: int64 (cabe en un BIGINT), una por fila y en el mismo orden.
+    """
+    if len(frame) == 0:
+        return np.empty(0, dtype=np.int64)
+    ids = [
+        pd.to_numeric(frame[col], errors="coerce").astype("Float64").fillna(_NULL).astype("int64").to_numpy()
+        for col in FINGERPRINT_COLUMNS[:3]
+    ]
+    dates = pd.to_datetime(frame["flight_date"], errors="coerce")
+    days = np.where(dates.isna(), _NULL, dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").view("int64"))
+    # Parte fija: 4 x int64 little-endian por fila (32 bytes), armada de una vez
+    fixed = np.column_stack([*ids, days]).astype("<i8").tobytes()
+    equipment = frame["equipment"].where(frame["equipment"].notna(), "").astype(str).str.encode("utf-8")
+
+    blake2b = hashlib.blake2b
+    digests = b"".join(
+        blake2b(fixed[32 * i:32 * i + 32] + tail, digest_size=FINGERPRINT_DIGEST_SIZE).digest()
+        for i, tail in enumerate(equipment.tolist())
+    )
+    return np.frombuffer(digests, dtype="<i8").astype(np.int64)
+
+
+def copy_with_sha256(src: IO[bytes], dst: IO[bytes]) -> str:
+    """
+    Copia `src` en `dst` y devuelve el SHA-256 (hex) de lo copiado.
+
+    Args:
+        src (IO[bytes]): Origen (por ejemplo, `UploadFile.file`).
+        dst (IO[bytes]): Destino abierto en modo binario.
+
+    Returns:
+        str: Digest hexadecimal.
+    """
+    digest = hashlib.sha256()
+    while True:
+        block = src.read(_COPY_BUFFER)
+        if not block:
+            return digest.hexdigest()
+        digest.update(block)
+        dst.write(block)
+
@@ -0,0 +1,96 @@
+"""
+Chequeo en memoria de las claves foráneas de `routes` antes del INSERT.
+
+Los ids existentes de aerolíneas y aeropuertos se cargan una vez por ingesta en
+un `IdSet` (bitmap de NumPy indexado por id) y cada chunk se filtra con una
+consulta vectorizada. Las filas huérfanas se reportan como errores con
+`reason="orphan_fk"` en lugar de hacer fallar el commit del chunk entero.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.ingest.routes_vectorized import frame_to_raw_records
+
+ORPHAN_REASON = "orphan_fk"
+# Por encima de este id máximo se usa un array ordenado en lugar del bitmap (1 byte por id)
+MAX_BITMAP_ID = 64 * 1024 * 1024
+
+# Columna de `routes` → IdSet contra el que se chequea
+ROUTE_FKS = {
+    "airline_id": "airlines",
+    "origin_airport_id": "airports",
+    "destination_airport_id": "airports",
+}
+
+
+class IdSet:
+    """Conjunto de ids enteros con pertenencia vectorizada."""
+
+    def __init__(self, ids):
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        self._size = len(ids)
+        self._bits = None
+        self._sorted = ids
+        if self._size and ids[0] >= 0 and ids[-1] < MAX_BITMAP_ID:
+            self._bits = np.zeros(int(ids[-1]) + 1, dtype=bool)
+            self._bits[ids] = True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def contains(self, values) -> np.ndarray:
+        """
+        Args:
+            values: Array/Series de enteros.
+
+        Returns:
+            np.ndarray: Máscara booleana, True donde el id existe.
+        """
+        v = np.asarray(values, dtype=np.int64)
+        if self._bits is None:
+            pos = np.searchsorted(self._sorted, v).clip(max=max(self._size - 1, 0))
+            return (self._sorted[pos] == v) if self._size else np.zeros(len(v), dtype=bool)
+        out = np.zeros(len(v), dtype=bool)
+        ok = (v >= 0) & (v < len(self._bits))
+        out[ok] = self._bits[v[ok]]
+        return out
+
+
+def filter_orphans(
+    frame: pd.DataFrame,
+    ids: Dict[str, IdSet],
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Separa las rutas cuyas claves foráneas no existen.
+
+    Args:
+        frame (pd.DataFrame): Rutas validadas (como las devuelve `validate_routes_frame`).
+        ids (Dict[str, IdSet]): {"airlines": IdSet, "airports": IdSet}.
+
+    Returns:
+        Tuple[pd.DataFrame, List[Dict[str, Any]]]: rutas con todas sus FKs presentes y
+            un error por fila huérfana ("row", "reason", "errors", "rec"; "rec" es la fila
+            completa con los alias del CSV, ver `frame_to_raw_records`).
+    """
+    if frame.empty:
+        return frame, []
+    missing = {col: ~ids[kind].contains(frame[col].to_numpy()) for col, kind in ROUTE_FKS.items()}
+    bad = np.logical_or.reduce(list(missing.values()))
+    if not bad.any():
+        return frame, []
+
+    errors: List[Dict[str, Any]] = []
+    positions = np.flatnonzero(bad)
+    # "rec" con la fila completa en el formato del CSV, como en "validation_error"
+    records = frame_to_raw_records(frame.iloc[positions])
+    for pos, rec in zip(positions, records):
+        row = frame.index[pos]
+        errs = []
+        for col, mask in missing.items():
+            if mask[pos]:
+                value = str(frame[col].iat[pos])
+                errs.append({"type": "foreign_key", "loc": (col,), "msg": f"No existe {ROUTE_FKS[col]}.id={value}", "input": value})
+        errors.append({"row": int(row), "reason": ORPHAN_REASON, "errors": errs, "rec": rec})
+    return frame[~bad], errors
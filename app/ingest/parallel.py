@@ -0,0 +1,122 @@
+"""
+Parseo de CSVs de rutas en varios procesos.
+
+El archivo se parte en rangos de bytes alineados a fin de línea; cada proceso lee
+su rango (con el encabezado adelante), lo parsea y lo valida. Los resultados se
+devuelven en el orden original y con los números de fila globales.
+
+Limitación: asume que no hay saltos de línea dentro de campos entre comillas
+(los archivos de rutas no los tienen). Solo aplica a archivos sin comprimir en disco.
+"""
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from app.ingest.routes_csv import ByteCursor, sniff_sep, validate_routes_records
+from app.ingest.routes_vectorized import validate_routes_frame
+
+DEFAULT_BLOCK_BYTES = 32 * 1024 * 1024
+
+
+def split_byte_ranges(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Devuelve el encabezado y los rangos `[inicio, fin)` de datos, cortados en fin de línea.
+
+    Args:
+        path (str): Ruta del CSV.
+        block_bytes (int): Tamaño aproximado de cada rango.
+
+    Returns:
+        Tuple[bytes, List[Tuple[int, int]]]: línea de encabezado (con su `\\n`) y rangos.
+    """
+    size = os.path.getsize(path)
+    ranges: List[Tuple[int, int]] = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + block_bytes, size))
+            if f.tell() < size:
+                f.readline()  # avanzar hasta el próximo inicio de línea
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _parse_range(path: str, header: bytes, sep: str, start: int, end: int, validator: str):
+    # Corre en el proceso hijo: importa el validador pedido y procesa solo su rango
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + data), sep=sep, dtype=str, na_filter=False)
+    if validator == "records":
+        items, errors = validate_routes_records(df, 0)
+    else:
+        items, errors = validate_routes_frame(df, 0)
+    return items, errors, len(df)
+
+
+def iter_routes_parallel(
+    path: str,
+    *,
+    workers: int,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    validator: str = "frame",
+    cursor: ByteCursor | None = None,
+) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+    """
+    Parsea y valida `path` en `workers` procesos, devolviendo un bloque por rango en orden.
+
+    Se mantienen como máximo `2 * workers` rangos en vuelo, así la memoria queda
+    acotada aunque el consumidor (los INSERTs) sea más lento que el parseo.
+
+    Args:
+        path (str): Ruta del CSV sin comprimir.
+        workers (int): Cantidad de procesos.
+        block_bytes (int): Tamaño aproximado de cada rango.
+        validator (str): "frame" (`validate_routes_frame`, devuelve DataFrames) o
+            "records" (`validate_routes_records`, devuelve listas de `RouteIn`).
+        cursor (ByteCursor, optional): Recibe el byte donde termina cada rango entregado
+            (para el checkpoint de la ingesta).
+
+    Yields:
+        Tuple[Any, List[Dict[str, Any]]]: filas válidas del rango y sus errores, con
+            "row" (y el índice del DataFrame) como número de fila global.
+    """
+    header, ranges = split_byte_ranges(path, block_bytes)
+    with open(path, "rb") as f:
+        sep = sniff_sep(f)
+
+    # spawn: el proceso padre tiene threads (pool de jobs) y fork no es seguro
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending: Deque[Tuple[Future, int]] = deque()
+        todo = iter(ranges)
+        offset = 0
+
+        def fill():
+            while len(pending) < 2 * workers:
+                nxt = next(todo, None)
+                if nxt is None:
+                    return
+                pending.append((pool.submit(_parse_range, path, header, sep, nxt[0], nxt[1], validator), nxt[1]))
+
+        fill()
+        while pending:
+            future, end = pending.popleft()
+            items, errors, n = future.result()
+            fill()
+            if cursor is not None:
+                cursor.offset = end
+            for e in errors:
+                e["row"] += offset
+            if isinstance(items, pd.DataFrame):
+                items.index = items.index + offset
+            offset += n
+            yield items, errors
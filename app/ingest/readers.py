@@ -0,0 +1,154 @@
+"""
+Lectura de archivos de ingesta en formatos columnares (Parquet y Arrow IPC).
+
+El formato se detecta por los primeros bytes (`PAR1`, `ARROW1` o el marcador de
+continuación de un stream IPC) y, si no hay firma, por el content type del upload.
+Los archivos columnares se leen por lotes (row groups / record batches) y cada
+lote se pasa a strings con las mismas convenciones que el CSV (vacío = `""`,
+booleanos como `"Y"`/`""`), así entra a la misma validación que un CSV.
+
+`pyarrow` es opcional: solo hace falta para subir Parquet/Arrow.
+"""
+import io
+from typing import IO, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.ingest.compression import peek
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende del entorno
+    pa = None
+
+CSV, PARQUET, ARROW_FILE, ARROW_STREAM = "csv", "parquet", "arrow", "arrow_stream"
+
+# Firmas al inicio del archivo
+_MAGIC = (
+    (b"PAR1", PARQUET),
+    (b"ARROW1", ARROW_FILE),
+    (b"\xff\xff\xff\xff", ARROW_STREAM),
+)
+# Content types que mandan los clientes para estos formatos
+CONTENT_TYPES = {
+    "application/vnd.apache.parquet": PARQUET,
+    "application/x-parquet": PARQUET,
+    "application/parquet": PARQUET,
+    "application/vnd.apache.arrow.file": ARROW_FILE,
+    "application/vnd.apache.arrow.stream": ARROW_STREAM,
+}
+
+
+def detect_format(file: IO[bytes], content_type: Optional[str] = None) -> str:
+    """
+    Detecta el formato del archivo sin consumirlo (`peek`).
+
+    Args:
+        file (IO[bytes]): Archivo abierto en modo binario.
+        content_type (str, optional): Content type declarado en el upload.
+
+    Returns:
+        str: `CSV`, `PARQUET`, `ARROW_FILE` o `ARROW_STREAM`.
+    """
+    head = peek(file, 8)
+    if isinstance(head, bytes):
+        for magic, fmt in _MAGIC:
+            if head.startswith(magic):
+                return fmt
+    if content_type:
+        return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower(), CSV)
+    return CSV
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Para ingerir archivos Parquet/Arrow hace falta instalar `pyarrow`")
+
+
+def _record_batches(file: IO[bytes], fmt: str, batch_rows: int) -> Iterator["pa.RecordBatch"]:
+    _require_pyarrow()
+    if fmt == PARQUET:
+        # Lee de a row groups; nunca materializa el archivo entero
+        yield from pq.ParquetFile(file).iter_batches(batch_size=batch_rows)
+        return
+    if fmt == ARROW_FILE:
+        reader = pa_ipc.open_file(file)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    elif fmt == ARROW_STREAM:
+        batches = iter(pa_ipc.open_stream(file))
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    for batch in batches:
+        for start in range(0, batch.num_rows, batch_rows):
+            yield batch.slice(start, batch_rows)
+
+
+def _as_text(col: pd.Series) -> pd.Series:
+    """Pasa una columna a string con las convenciones del CSV crudo."""
+    missing = col.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(col):
+        out = np.where(col.fillna(False).to_numpy(dtype=bool), "Y", "")
+    elif pd.api.types.is_integer_dtype(col):
+        out = col.astype("Int64").astype(str).to_numpy(dtype=object)
+    elif pd.api.types.is_float_dtype(col):
+        values = col.to_numpy(dtype="float64", na_value=np.nan)
+        integral = np.isfinite(values) & (np.floor(values) == values) & (np.abs(values) < 2**53)
+        out = np.array([str(int(v)) if i else str(v) for v, i in zip(values.tolist(), integral)], dtype=object)
+    elif pd.api.types.is_datetime64_any_dtype(col):
+        midnight = (col.dt.normalize() == col).to_numpy()
+        out = np.where(midnight, col.dt.strftime("%Y-%m-%d"), col.dt.strftime("%Y-%m-%d %H:%M:%S"))
+    else:
+        out = np.array(["" if m else str(v) for v, m in zip(col.tolist(), missing)], dtype=object)
+    out = np.asarray(out, dtype=object)
+    out[missing] = ""
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
+
+
+def iter_columnar_frames(file: IO[bytes], fmt: str, batch_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo Parquet/Arrow por lotes y devuelve DataFrames todo string.
+
+    Args:
+        file (IO[bytes]): Archivo abierto en modo binario.
+        fmt (str): `PARQUET`, `ARROW_FILE` o `ARROW_STREAM` (ver `detect_format`).
+        batch_rows (int): Filas máximas por lote.
+
+    Yields:
+        pd.DataFrame: Lote con las columnas del archivo, valores como string y `""` para nulos.
+    """
+    for batch in _record_batches(file, fmt, batch_rows):
+        df = batch.to_pandas()
+        yield pd.DataFrame({c: _as_text(df[c]) for c in df.columns}, index=pd.RangeIndex(len(df)))
+
+
+def read_columnar(file: IO[bytes], fmt: str, batch_rows: int = 50_000) -> pd.DataFrame:
+    """Lee un archivo Parquet/Arrow completo (por lotes) en un único DataFrame todo string."""
+    frames = list(iter_columnar_frames(file, fmt, batch_rows))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_dimension_csv(file: IO[bytes]) -> pd.DataFrame:
+    """
+    Lee un CSV de dimensiones (aeropuertos, aerolíneas) completo.
+
+    Se copia a memoria antes de parsear: el upload puede ser un stream
+    descomprimido (no posicionable) y, si falla el motor de C, se reintenta con el
+    de Python desde el principio de la copia. Son archivos chicos.
+
+    Args:
+        file (IO[bytes]): Archivo o stream descomprimido.
+
+    Returns:
+        pd.DataFrame: Contenido del CSV.
+    """
+    data = io.BytesIO(file.read())
+    try:
+        return pd.read_csv(data, sep=",", encoding="utf-8")
+    except Exception:
+        data.seek(0)
+        return pd.read_csv(data, sep=",", engine="python")
@@ -1,25 +1,231 @@
+import io
+import itertools
+import os
 import pandas as pd
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator
 from pydantic import ValidationError
+from app.ingest.compression import peek
+from app.ingest.error_log import ErrorLog
+from app.ingest.readers import CSV, detect_format, iter_columnar_frames
+from app.ingest.routes_vectorized import validate_routes_frame
+from app.ingest.timings import StageTimer
 from app.schemas.routes import RouteIn
 
+DEFAULT_CHUNK_SIZE = 50_000
+# Bytes que se miran para encontrar la línea de encabezado
+HEADER_PEEK_BYTES = 64 * 1024
 
-def parse_routes_csv(file) -> Tuple[List[RouteIn], List[Dict[str, Any]]]:
+
+def sniff_sep(file) -> str:
+    """
+    Detecta el separador mirando solo la línea de encabezado (`|` o `,`).
+
+    Se mira el comienzo del archivo sin consumirlo (`peek`, también sirve para
+    streams descomprimidos), así queda listo para que pandas lo lea en chunks.
+    """
+    head = peek(file, HEADER_PEEK_BYTES)
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="ignore")
+    return "|" if "|" in head.split("\n", 1)[0] else ","
+
+
+class ByteCursor:
+    """
+    Posición en bytes donde termina el último chunk leído de un CSV.
+
+    Solo se conoce para CSV sin comprimir en disco; en los demás casos `offset`
+    queda en None y para reanudar hay que saltear filas.
+    """
+
+    def __init__(self):
+        self.offset: int | None = None
+
+
+def _iter_csv_lines(
+    file, chunk_size: int, start_row: int, start_byte: int | None, cursor: ByteCursor
+) -> Iterator[pd.DataFrame]:
+    # Chunks de `chunk_size` líneas leídas a mano, para saber en qué byte termina cada uno.
+    # Como `app.ingest.parallel`, asume que no hay saltos de línea dentro de campos.
+    sep = sniff_sep(file)
+    header = file.readline()
+    if start_byte is not None:
+        file.seek(start_byte)
+    elif start_row:
+        # Checkpoint sin byte (de antes de la migración): se saltean las líneas ya procesadas
+        for _ in itertools.islice(file, start_row):
+            pass
+    while True:
+        lines = list(itertools.islice(file, chunk_size))
+        if not lines:
+            return
+        cursor.offset = file.tell()
+        yield pd.read_csv(io.BytesIO(header + b"".join(lines)), sep=sep, dtype=str, na_filter=False)
+
+
+def _iter_raw_chunks(
+    file,
+    chunk_size: int,
+    content_type: str | None = None,
+    start_row: int = 0,
+    start_byte: int | None = None,
+    cursor: ByteCursor | None = None,
+) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    Lee el archivo crudo (todo string, vacíos como `""`) y devuelve `(chunk, fila_inicial)`.
+
+    CSV con `pd.read_csv` por chunks; Parquet/Arrow por lotes con `iter_columnar_frames`.
+    Con `start_row` se saltean las primeras filas de datos (al reanudar una ingesta);
+    en CSV se descartan sin parsearlas.
+
+    Con `cursor` y un CSV sin comprimir en disco, se registra en `cursor.offset` el
+    byte donde termina cada chunk; al reanudar con `start_byte` (ese offset) se va
+    directo ahí con `seek` en lugar de volver a leer las filas anteriores. Sin
+    `start_byte`, las `start_row` líneas se descartan sin parsearlas.
+    """
+    fmt = detect_format(file, content_type)
+    if fmt != CSV:
+        reader = iter_columnar_frames(file, fmt, chunk_size)
+        offset = 0
+    elif cursor is not None and file_path(file) is not None:
+        reader = _iter_csv_lines(file, chunk_size, start_row, start_byte if start_row else None, cursor)
+        offset = start_row
+    else:
+        reader = pd.read_csv(
+            file,
+            sep=sniff_sep(file),
+            dtype=str,
+            na_filter=False,
+            chunksize=chunk_size,
+            # la línea 0 es el encabezado
+            skiprows=(lambda i: 0 < i <= start_row) if start_row else None,
+        )
+        offset = start_row
+    for df in reader:
+        if offset < start_row:
+            # Formatos columnares: descartar los lotes (o la parte) ya procesados
+            skip = min(start_row - offset, len(df))
+            offset += skip
+            df = df.iloc[skip:].reset_index(drop=True)
+            if df.empty:
+                continue
+        yield df, offset
+        offset += len(df)
+
+
+def validate_routes_records(df: pd.DataFrame, row_offset: int = 0) -> Tuple[List[RouteIn], List[Dict[str, Any]]]:
+    """
+    Valida fila por fila con `RouteIn` (camino de referencia de `validate_routes_frame`).
+
+    Args:
+        df (pd.DataFrame): Filas crudas con los alias del CSV.
+        row_offset (int): Número de fila global de la primera fila de `df`.
+
+    Returns:
+        Tuple[List[RouteIn], List[Dict[str, Any]]]: rutas válidas y errores.
+    """
+    items: List[RouteIn] = []
+    errors: List[Dict[str, Any]] = []
+
+    for idx, rec in enumerate(df.to_dict(orient="records"), start=row_offset):
+        try:
+            items.append(RouteIn.model_validate(rec))
+        except ValidationError as ve:
+            safe_rec = {k: ("" if pd.isna(v) else str(v)) for k, v in rec.items()}
+            errors.append(
+                {
+                    "row": idx,
+                    "reason": "validation_error",
+                    "errors": ve.errors(),
+                    "rec": safe_rec,
+                }
+            )
+    return items, errors
+
+
+def iter_routes_csv(
+    file,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    content_type: str | None = None,
+    start_row: int = 0,
+    timer: StageTimer | None = None,
+    start_byte: int | None = None,
+    cursor: ByteCursor | None = None,
+) -> Iterator[Tuple[pd.DataFrame, List[Dict[str, Any]]]]:
+    """
+    Lee un CSV de rutas en chunks de `chunk_size` filas y valida cada chunk.
+
+    También acepta Parquet y Arrow IPC (detectados por la firma del archivo o por
+    `content_type`): se leen por row groups / record batches de hasta `chunk_size` filas.
+
+    A diferencia de `parse_routes_csv`, nunca se materializa el archivo completo:
+    en memoria vive solo el chunk actual, así el consumo queda acotado sin
+    importar el tamaño del archivo.
+
+    Todas las columnas se leen como string y sin detección de NaN de pandas
+    (los vacíos llegan como `""`). La validación es por columnas con
+    `validate_routes_frame`, con las mismas reglas que `RouteIn`.
+
+    Args:
+        file (IO): Objeto de archivo abierto y posicionable (por ejemplo, `UploadFile.file`).
+        chunk_size (int): Cantidad de filas por chunk.
+        content_type (str, optional): Content type del upload (para detectar el formato).
+        start_row (int): Primera fila de datos a procesar (0-based); las anteriores se saltean.
+        timer (StageTimer, optional): Acumula los tiempos de "read" y "validate".
+        start_byte (int, optional): Byte donde empieza la fila `start_row` (de un `cursor`
+            anterior); solo se usa con `cursor` y un CSV sin comprimir en disco.
+        cursor (ByteCursor, optional): Recibe el byte donde termina cada chunk entregado.
+
+    Yields:
+        Tuple[pd.DataFrame, List[Dict[str, Any]]]: rutas válidas del chunk (columnas
+            de `routes`, índice = fila global) y errores del chunk. El campo "row" de
+            cada error es el número de fila global (0-based) en el archivo.
+    """
+    timer = timer or StageTimer()
+    for df, offset in timer.timed("read", _iter_raw_chunks(file, chunk_size, content_type, start_row, start_byte, cursor)):
+        with timer.stage("validate"):
+            chunk = validate_routes_frame(df, offset)
+        yield chunk
+
+
+def file_path(file) -> str | None:
+    """Ruta en disco del archivo, si la tiene (los uploads spooleados sí, los BytesIO no)."""
+    name = getattr(file, "name", None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+
+def parse_routes_csv(
+    file,
+    *,
+    workers: int = 1,
+    error_log: ErrorLog | None = None,
+) -> Tuple[List[RouteIn], List[Dict[str, Any]]]:
     """
     Parsea un archivo CSV de rutas y devuelve objetos validados junto con los errores.
 
-    El archivo puede venir con separador `|` o `,`. Si falla la lectura con `|`, 
-    se reintenta con coma como separador. Cada fila se valida contra el esquema 
-    Pydantic `RouteIn`.
+    El archivo puede venir con separador `|` o `,` (se detecta a partir del encabezado).
+    Cada fila se valida contra el esquema Pydantic `RouteIn`.
+
+    Para archivos grandes conviene usar `iter_routes_csv`, que procesa por chunks
+    y valida por columnas.
+
+    También acepta Parquet y Arrow IPC (ver `app.ingest.readers`).
+
+    Con `workers > 1` y un CSV en disco, el archivo se parte en rangos de bytes
+    que se parsean y validan en paralelo en un pool de procesos
+    (ver `app.ingest.parallel`); el resultado es el mismo y en el mismo orden.
 
     Args:
         file (IO): Objeto de archivo abierto (por ejemplo, `UploadFile.file`).
+        workers (int): Procesos a usar. Con 1 (default) se parsea en el proceso actual.
+        error_log (ErrorLog, optional): Si se pasa, los errores se registran ahí (NDJSON
+            en disco + contadores) en lugar de acumularse en memoria, y la lista de
+            errores devuelta queda vacía.
 
     Returns:
         Tuple[List[RouteIn], List[Dict[str, Any]]]:
             - Lista de instancias `RouteIn` validadas correctamente.
             - Lista de errores, donde cada error es un diccionario con:
-                * "row": índice de la fila en el DataFrame.
+                * "row": índice de la fila en el archivo (0-based, sin contar el encabezado).
                 * "reason": motivo (ej. `"validation_error"`).
                 * "errors": detalles de validación provistos por Pydantic.
                 * "rec": representación segura de la fila original (sin NaN, todo string).
@@ -32,26 +238,19 @@ def parse_routes_csv(file) -> Tuple[List[RouteIn], List[Dict[str, Any]]]:
             "rec": {"airline_id": "1", "capacity": "abc", ...}
         }
     """
-    try:
-        df = pd.read_csv(file, sep="|", engine="python", dtype=str)
-    except Exception:
-        file.seek(0)
-        df = pd.read_csv(file, engine="python", dtype=str)
-
     items: List[RouteIn] = []
     errors: List[Dict[str, Any]] = []
+    path = file_path(file)
+    if workers > 1 and path is not None and detect_format(file) == CSV:
+        from app.ingest.parallel import iter_routes_parallel
 
-    for idx, rec in enumerate(df.to_dict(orient="records")):
-        try:
-            items.append(RouteIn.model_validate(rec))
-        except ValidationError as ve:
-            safe_rec = {k: ("" if pd.isna(v) else str(v)) for k, v in rec.items()}
-            errors.append(
-                {
-                    "row": idx,
-                    "reason": "validation_error",
-                    "errors": ve.errors(),
-                    "rec": safe_rec,
-                }
-            )
+        chunks = iter_routes_parallel(path, workers=workers, validator="records")
+    else:
+        chunks = (validate_routes_records(df, offset) for df, offset in _iter_raw_chunks(file, DEFAULT_CHUNK_SIZE))
+    for chunk_items, chunk_errors in chunks:
+        items.extend(chunk_items)
+        if error_log is not None:
+            error_log.write(chunk_errors)
+        else:
+            errors.extend(chunk_errors)
     return items, errors
@@ -0,0 +1,253 @@
+"""
+Validación vectorizada (por columnas) de rutas.
+
+Aplica las mismas reglas que `RouteIn` (NULL_TOKENS, decimales con coma, "Y" como
+booleano, precios sin negativos y con 2 decimales, parseo de fechas) pero sobre
+columnas completas de pandas/NumPy en lugar de fila por fila.
+
+Los valores con formas poco comunes (exponentes, separadores `_`, dígitos no ASCII)
+no entran en el camino rápido y se resuelven con las mismas funciones que usa
+`RouteIn`, así el resultado es idéntico al de la validación con Pydantic.
+Única diferencia: los enteros que no entran en int64 se tratan como inválidos
+(con Pydantic pasaban la validación y fallaba el INSERT de todo el lote).
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.ingest.dates import parse_dates
+from app.schemas.routes import NULL_TOKENS, RouteIn, _norm_decimal, _norm_float
+
+# Columnas (nombre en `routes`) que produce el validador, en orden
+ROUTE_COLUMNS = [
+    "airline_id",
+    "origin_airport_id",
+    "destination_airport_id",
+    "operated_carrier",
+    "stops",
+    "equipment",
+    "tickets_sold",
+    "capacity",
+    "price_ticket",
+    "total_kilometers",
+    "flight_date",
+]
+
+# Enteros obligatorios (si faltan o no parsean, la fila es inválida)
+_REQUIRED_INTS = ["airline_id", "origin_airport_id", "destination_airport_id"]
+_OPTIONAL_INTS = ["tickets_sold", "capacity"]
+
+_ASCII_INT_RE = r"[+-]?[0-9]{1,18}"
+_PY_INT_RE = r"[+-]?\d+(?:_\d+)*"
+_ASCII_FLOAT_RE = r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+_ASCII_PRICE_RE = r"\+?(?:[0-9]{1,13}\.?[0-9]*|\.[0-9]+)"
+
+
+def _alias(field: str) -> str:
+    return RouteIn.model_fields[field].alias or field
+
+
+def _raw(df: pd.DataFrame, field: str) -> Optional[pd.Series]:
+    """Columna cruda del campo (por alias o por nombre), o None si no viene."""
+    for name in (_alias(field), field):
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _per_value(col: Optional[pd.Series], rule: Callable[[pd.Series], pd.Series], index: pd.Index) -> pd.Series:
+    """
+    Aplica `rule` una sola vez por valor distinto de la columna y expande el resultado.
+
+    `rule` recibe los valores distintos ya como `str(v).strip()` (None/NaN se tratan
+    como vacío). IDs, fechas, flags y precios se repiten mucho, así que el trabajo
+    por string queda proporcional a la cardinalidad y no a la cantidad de filas.
+    """
+    if col is None:
+        col = pd.Series("", index=index, dtype=object)
+    codes, uniques = pd.factorize(col.fillna("").astype(str).to_numpy())
+    res = rule(pd.Series(uniques, dtype=object).str.strip())
+    return pd.Series(res.array.take(codes), index=index)
+
+
+def _ints(s: pd.Series) -> pd.Series:
+    """Misma regla que `RouteIn._int_or_none`, devuelve `Int64` con <NA> para None."""
+    out = pd.Series(pd.NA, index=s.index, dtype="Int64")
+    fast = s.str.fullmatch(_ASCII_INT_RE)
+    if fast.any():
+        out[fast] = s[fast].astype("int64")
+    # dígitos no ASCII o con "_": los acepta `int()` pero no el camino rápido
+    slow = ~fast & s.str.fullmatch(_PY_INT_RE)
+    if slow.any():
+        # fuera de rango int64 queda como None (tampoco entraría en la columna INTEGER)
+        vals = [int(v) for v in s[slow]]
+        out[slow] = [v if -(2**63) <= v < 2**63 else pd.NA for v in vals]
+    return out
+
+
+def _floats(s: pd.Series) -> pd.Series:
+    """Misma regla que `_norm_float(v, allow_negative=False)`, con NaN para None."""
+    t = s.str.replace(",", ".", regex=False)
+    out = pd.Series(np.nan, index=s.index, dtype="float64")
+    fast = t.str.fullmatch(_ASCII_FLOAT_RE)
+    if fast.any():
+        out[fast] = t[fast].astype("float64")
+    slow = ~fast & (t != "") & ~t.isin(NULL_TOKENS)
+    if slow.any():
+        vals = [_norm_float(v, allow_negative=False) for v in t[slow]]
+        out[slow] = [np.nan if v is None else v for v in vals]
+    out[out < 0] = np.nan
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def _prices(s: pd.Series) -> pd.Series:
+    """
+    Misma regla que `_norm_decimal(v, allow_negative=False, quant="0.01")`.
+
+    El redondeo a centavos se hace sobre los dígitos del string (ROUND_HALF_EVEN,
+    como `Decimal.quantize`) para no arrastrar errores de coma flotante.
+    """
+    t = s.str.replace(",", ".", regex=False)
+    out = pd.Series(np.nan, index=s.index, dtype="float64")
+    fast = t.str.fullmatch(_ASCII_PRICE_RE)
+    if fast.any():
+        parts = t[fast].str.lstrip("+").str.partition(".")
+        whole = parts[0].replace("", "0").astype("int64")
+        frac = parts[2].str.ljust(3, "0")
+        cents = whole * 100 + frac.str[:2].astype("int64")
+        third = frac.str[2].astype("int64")
+        rest_nonzero = frac.str[3:].str.contains("[1-9]", regex=True)
+        up = (third > 5) | ((third == 5) & (rest_nonzero | (cents % 2 == 1)))
+        out[fast] = (cents + up.astype("int64")) / 100
+    slow = ~fast & (t != "") & ~t.isin(NULL_TOKENS)
+    if slow.any():
+        vals = []
+        for v in t[slow]:
+            try:
+                d = _norm_decimal(v, allow_negative=False, quant="0.01")
+            except ArithmeticError:
+                d = None
+            vals.append(float(d) if d is not None else np.nan)
+        out[slow] = vals
+    return out
+
+
+def _dates(s: pd.Series) -> pd.Series:
+    """Misma regla que `RouteIn._date_parse`, con NaT para None (formato detectado una vez por chunk)."""
+    uniq = pd.unique(s[s != ""])
+    if len(uniq) == 0:
+        return pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    lookup = pd.Series(parse_dates(uniq).to_numpy(), index=uniq)
+    return pd.Series(s.map(lookup).to_numpy(dtype="datetime64[ns]"), index=s.index)
+
+
+def validate_routes_frame(
+    df: pd.DataFrame,
+    row_offset: int = 0,
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valida un DataFrame de rutas crudo (columnas con los alias del CSV) por columnas.
+
+    Args:
+        df (pd.DataFrame): Filas crudas, idealmente todo string (como las lee `iter_routes_csv`).
+        row_offset (int): Número de fila global de la primera fila de `df`.
+
+    Returns:
+        Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+            - DataFrame con las filas válidas y las columnas de `ROUTE_COLUMNS`
+              (enteros, bool, float con NaN, fechas con NaT). El índice es el número
+              de fila global en el archivo.
+            - Lista de errores con la misma forma que `parse_routes_csv`
+              ("row", "reason", "errors", "rec").
+    """
+    n = len(df)
+    index = pd.RangeIndex(row_offset, row_offset + n)
+
+    def col(field: str, rule: Callable[[pd.Series], pd.Series]) -> pd.Series:
+        return _per_value(_raw(df, field), rule, index)
+
+    out = pd.DataFrame(index=index)
+    field_errors: Dict[str, pd.Series] = {}
+
+    for field in _REQUIRED_INTS + ["stops"]:
+        if _raw(df, field) is None:
+            if field == "stops":
+                out[field] = pd.Series(0, index=index, dtype="Int64")
+                continue
+            field_errors[field] = pd.Series(True, index=index)
+            out[field] = pd.Series(pd.NA, index=index, dtype="Int64")
+            continue
+        out[field] = col(field, _ints)
+        field_errors[field] = out[field].isna()
+
+    out["operated_carrier"] = col("operated_carrier", lambda s: s.isin(["Y", "y"]))
+    out["equipment"] = col("equipment", lambda s: s.str.upper().where(s != "", None))
+    for field in _OPTIONAL_INTS:
+        out[field] = col(field, _ints)
+    out["price_ticket"] = col("price_ticket", _prices)
+    out["total_kilometers"] = col("total_kilometers", _floats)
+    out["flight_date"] = col("flight_date", _dates)
+
+    out = out[ROUTE_COLUMNS]
+    bad = pd.Series(False, index=index)
+    for mask in field_errors.values():
+        bad |= mask
+
+    errors: List[Dict[str, Any]] = []
+    if bad.any():
+        raw_bad = df.iloc[np.flatnonzero(bad.to_numpy())]
+        for row, rec in zip(index[bad.to_numpy()], raw_bad.to_dict(orient="records")):
+            errs = []
+            for field, mask in field_errors.items():
+                if not mask.at[row]:
+                    continue
+                if _raw(df, field) is None:
+                    errs.append({"type": "missing", "loc": (_alias(field),), "msg": "Field required", "input": rec})
+                else:
+                    errs.append({"type": "int_type", "loc": (_alias(field),), "msg": "Input should be a valid integer", "input": None})
+            errors.append(
+                {
+                    "row": int(row),
+                    "reason": "validation_error",
+                    "errors": errs,
+                    "rec": {k: ("" if pd.isna(v) else str(v)) for k, v in rec.items()},
+                }
+            )
+
+    valid = out[~bad].astype({field: "int64" for field in _REQUIRED_INTS + ["stops"]})
+    return valid, errors
+
+
+def _py_values(col: pd.Series) -> List[Any]:
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return [None if pd.isna(v) else v.date() for v in col]
+    return col.astype(object).where(col.notna(), None).tolist()
+
+
+def frame_to_raw_records(frame: pd.DataFrame) -> List[Dict[str, str]]:
+    """
+    Convierte filas validadas de vuelta al formato del CSV: alias → string, `""` para
+    los vacíos. Es la misma forma que el "rec" de los errores "validation_error", así
+    una fila rechazada más adelante (por ejemplo, "orphan_fk") se puede volver a cargar.
+    """
+    columns = [c for c in ROUTE_COLUMNS if c in frame.columns]
+    values = []
+    for c in columns:
+        if c == "operated_carrier":
+            values.append(["Y" if v else "" for v in frame[c].tolist()])
+        else:
+            values.append(["" if v is None else str(v) for v in _py_values(frame[c])])
+    aliases = [_alias(c) for c in columns]
+    return [dict(zip(aliases, row)) for row in zip(*values)]
+
+
+def frame_to_rows(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convierte un DataFrame validado en diccionarios listos para `INSERT`
+    (tipos nativos de Python y None en lugar de NaN/NaT/<NA>).
+    """
+    columns = list(frame.columns)
+    values = [_py_values(frame[c]) for c in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
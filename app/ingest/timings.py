@@ -0,0 +1,46 @@
+"""
+Tiempos por etapa de una ingesta (lectura, validación, inserción, ...).
+
+Los parsers y servicios reciben un `StageTimer` opcional y acumulan ahí los
+segundos de cada etapa; el resumen de la ingesta los devuelve en `timings`.
+Lo usa también el benchmark (`benchmarks/run.py`).
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Acumula segundos por etapa (las etapas pueden repetirse, por ejemplo una vez por chunk)."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Recorre `items` sumando a `name` el tiempo de cada `next` (lectura perezosa por chunks)."""
+        it = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start)
+                return
+            self.add(name, time.perf_counter() - start)
+            yield item
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v, 4) for k, v in self.seconds.items()}
@@ -2,3 +2,7 @@ from .airline import Airline
 from .airport import Airport
 from .route import Route
 from .audit_log import AuditLog
+from .ingest_file import IngestFile
+from .ingest_checkpoint import IngestCheckpoint
+from .route_daily_agg import RouteDailyAgg
+from .route_pair import RoutePair
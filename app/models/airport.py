@@ -39,7 +39,8 @@ class Airport(Base):
 
         
         CheckConstraint(
-            "(utc_offset IS NULL) OR (utc_offset BETWEEN -12 AND 14 AND mod(((utc_offset * 60)::int), 15) = 0)",
+            # CAST/% en lugar de ::int/mod() para que también funcione en SQLite
+            "(utc_offset IS NULL) OR (utc_offset BETWEEN -12 AND 14 AND (CAST(utc_offset * 60 AS INTEGER) % 15) = 0)",
             name="ck_airport_utc_quarter_steps",
         ),
 
@@ -0,0 +1,28 @@
+# from __future__ import annotations
+from typing import Any, Dict
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Integer, String, DateTime, JSON, func
+
+from app.db.session import Base
+
+class IngestCheckpoint(Base):
+    """
+    Avance de un job de ingesta de rutas: se actualiza en la misma transacción
+    que cada chunk insertado, así se puede reanudar desde el último commit.
+    """
+    __tablename__ = "ingest_checkpoints"
+    job_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    path: Mapped[str] = mapped_column(String(500))  # archivo spooleado
+    filename: Mapped[str | None] = mapped_column(String(255))
+    sha256: Mapped[str | None] = mapped_column(String(64))
+    options: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    # Filas del archivo ya procesadas (= número de la próxima fila a leer)
+    rows_done: Mapped[int] = mapped_column(Integer, default=0)
+    # Byte del archivo donde empieza la fila `rows_done` (solo CSV sin comprimir; si no, NULL)
+    byte_offset: Mapped[int | None] = mapped_column(BigInteger)
+    # Contadores acumulados: inserted, duplicates, chunks, skipped_by_reason
+    stats: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    updated_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
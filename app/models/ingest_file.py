@@ -0,0 +1,19 @@
+# from __future__ import annotations
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, String, DateTime, UniqueConstraint, func
+
+from app.db.session import Base
+
+class IngestFile(Base):
+    """Archivo ya ingerido con éxito (por tipo y SHA-256 del contenido)."""
+    __tablename__ = "ingest_files"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    sha256: Mapped[str] = mapped_column(String(64))
+    filename: Mapped[str | None] = mapped_column(String(255))
+    rows_inserted: Mapped[int | None] = mapped_column(Integer)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("kind", "sha256", name="uq_ingest_files_kind_sha256"),
+    )
@@ -1,9 +1,12 @@
 # from __future__ import annotations
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, Float, Date, ForeignKey, Index, Boolean, Text
+from sqlalchemy import BigInteger, Computed, Integer, Float, Date, ForeignKey, Index, Boolean, Text
 
 from app.db.session import Base
 
+# Expresión de la columna generada `routes.occupancy` (la misma en Postgres y SQLite)
+OCCUPANCY_SQL = "CASE WHEN capacity > 0 THEN CAST(tickets_sold AS FLOAT) / capacity END"
+
 class Route(Base):
     __tablename__ = "routes"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -18,6 +21,10 @@ class Route(Base):
     tickets_sold: Mapped[int | None] = mapped_column(Integer)
     price_ticket: Mapped[float | None] = mapped_column(Float)
     total_kilometers: Mapped[float | None] = mapped_column(Float)
+    # Huella de (aerolínea, origen, destino, fecha, equipamiento) para descartar re-envíos
+    fingerprint: Mapped[int | None] = mapped_column(BigInteger)
+    # tickets_sold / capacity, calculada por la base al escribir (NULL si falta alguno o capacity <= 0)
+    occupancy: Mapped[float | None] = mapped_column(Float, Computed(OCCUPANCY_SQL, persisted=True))
     
     
     airline = relationship("Airline")
@@ -27,4 +34,7 @@ class Route(Base):
     __table_args__ = (
         Index("ix_routes_od", "origin_airport_id", "destination_airport_id"),
         Index("ix_routes_airline_od", "airline_id", "origin_airport_id", "destination_airport_id"),
+        Index("ux_routes_fingerprint", "fingerprint", unique=True),
+        # Filtros por umbral de ocupación: range scan que ya trae las claves del join
+        Index("ix_routes_occupancy_od", "occupancy", "origin_airport_id", "destination_airport_id"),
     )
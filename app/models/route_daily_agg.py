@@ -0,0 +1,51 @@
+# from __future__ import annotations
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Boolean, Date, Float, Index, Integer, func, literal_column
+
+from app.db.session import Base
+
+
+# Fecha que ocupa el lugar de NULL en la clave única (ninguna ruta tiene esa fecha)
+NO_DATE = literal_column("'0001-01-01'")
+
+
+class RouteDailyAgg(Base):
+    """
+    Rutas agregadas por día: una fila por (aerolínea, origen, destino, fecha, operado).
+
+    La mantiene la ingesta de rutas (`RouteDailyAggRepo.refresh`) y la leen los
+    endpoints de analítica en lugar de recorrer `routes`. La fecha puede ser NULL
+    (rutas sin fecha), por eso la clave no es la PK: es un índice único sobre
+    `COALESCE(flight_date, NO_DATE)` (dos NULL no chocan en un índice común).
+    """
+    __tablename__ = "route_daily_agg"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    airline_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    origin_airport_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    destination_airport_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    flight_date: Mapped["Date"] = mapped_column(Date)
+    operated_carrier: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    flights: Mapped[int] = mapped_column(Integer, default=0)
+    # SUM(tickets_sold) y SUM(capacity) de las rutas (los NULL no suman)
+    tickets: Mapped[int] = mapped_column(BigInteger, default=0)
+    capacity: Mapped[int] = mapped_column(BigInteger, default=0)
+    # SUM(tickets_sold * price_ticket)
+    revenue: Mapped[float] = mapped_column(Float, default=0.0)
+    # Mayor ocupación (tickets_sold / capacity) de un vuelo del grupo; NULL si ninguno la tiene
+    max_occupancy: Mapped[float | None] = mapped_column(Float)
+
+    __table_args__ = (
+        Index(
+            "uq_route_daily_agg_key",
+            "airline_id", "origin_airport_id", "destination_airport_id",
+            func.coalesce(literal_column("flight_date"), NO_DATE), "operated_carrier",
+            unique=True,
+        ),
+        Index("ix_route_daily_agg_date", "flight_date"),
+        Index("ix_route_daily_agg_od", "origin_airport_id", "destination_airport_id"),
+        # Días con ocupación >= umbral (rachas): range scan con la ruta y la fecha en el índice
+        Index(
+            "ix_route_daily_agg_max_occ",
+            "max_occupancy", "airline_id", "origin_airport_id", "destination_airport_id", "flight_date",
+        ),
+    )
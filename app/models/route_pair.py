@@ -0,0 +1,29 @@
+# from __future__ import annotations
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, Float, ForeignKey, Index, Integer
+
+from app.db.session import Base
+
+class RoutePair(Base):
+    """
+    Atributos derivados de cada par (origen, destino) que aparece en `routes`.
+
+    Se calculan una vez por par a partir de los dos aeropuertos: la ingesta de
+    rutas agrega los pares nuevos y el upsert de aeropuertos recalcula los pares
+    de los aeropuertos que cambiaron (`RoutePairsRepo`).
+    """
+    __tablename__ = "route_pairs"
+    origin_airport_id: Mapped[int] = mapped_column(Integer, ForeignKey("airports.id"), primary_key=True)
+    destination_airport_id: Mapped[int] = mapped_column(Integer, ForeignKey("airports.id"), primary_key=True)
+    # Mismo país en origen y destino
+    is_domestic: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # |altitud origen - altitud destino| en metros; NULL si falta alguna altitud
+    altitude_diff_m: Mapped[float | None] = mapped_column(Float)
+    # Distancia ortodrómica (haversine) en km
+    distance_km: Mapped[float | None] = mapped_column(Float)
+
+    __table_args__ = (
+        # Pares domésticos por diferencia de altitud
+        Index("ix_route_pairs_domestic_alt", "is_domestic", "altitude_diff_m"),
+        Index("ix_route_pairs_destination", "destination_airport_id"),
+    )
@@ -1,9 +1,14 @@
 # from __future__ import annotations
+from typing import Dict, List
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import select, or_, text
+from sqlalchemy.dialects import postgresql, sqlite
 from app.models import Airline
 
+# Filas por sentencia INSERT (8 columnas → ~8k parámetros)
+LOAD_BATCH_SIZE = 1000
+
 class AirlinesRepo:
     @staticmethod
     def get(db: Session, id_: int):
@@ -18,6 +23,19 @@ class AirlinesRepo:
             Airline | None: Instancia si existe, de lo contrario None.
         """
         return db.get(Airline, id_)
+
+    @staticmethod
+    def all_ids(db: Session) -> List[int]:
+        """
+        Devuelve todos los ids de aerolíneas (para chequear FKs de rutas en memoria).
+
+        Args:
+            db (Session): Sesión de base de datos.
+
+        Returns:
+            List[int]: Ids existentes.
+        """
+        return list(db.scalars(select(Airline.id)))
     
 # Aca las deje aparte pero podrian ir adentro de la clase del repo como metodos estaticos
 def get_by_codes(db: Session, *, iata: str | None, icao: str | None) -> Airline | None:
@@ -56,7 +74,8 @@ def get_or_create(db: Session, *, iata: str | None, icao: str | None, defaults:
         defaults (dict | None): Datos adicionales para crear la aerolínea (name, country, etc.).
 
     Returns:
-        Airline | None: La aerolínea existente o recién creada; None si no hay códigos válidos.
+        Airline | None: La aerolínea existente o recién creada (o la que ganó el
+        conflicto de unicidad).
     """
     al = get_by_codes(db, iata=iata, icao=icao)
     if al:
@@ -72,8 +91,128 @@ def get_or_create(db: Session, *, iata: str | None, icao: str | None, defaults:
     try:
         db.commit()          
         db.refresh(al)
-        return al,None
+        return al
     except IntegrityError:
         db.rollback()
-        return None, get_by_codes(db, iata=iata, icao=icao)
+        return get_by_codes(db, iata=iata, icao=icao)
+
+
+def _fetch_existing(db: Session, rows: List[dict]) -> List[tuple]:
+    """Trae `(id, iata, icao)` de las aerolíneas que matchean por id o código, en lotes."""
+    found: List[tuple] = []
+    for start in range(0, len(rows), LOAD_BATCH_SIZE):
+        batch = rows[start : start + LOAD_BATCH_SIZE]
+        ids = [r["id"] for r in batch if r.get("id") is not None]
+        iatas = [r["iata"] for r in batch if r.get("iata")]
+        icaos = [r["icao"] for r in batch if r.get("icao")]
+        stmt = select(Airline.id, Airline.iata, Airline.icao).where(
+            or_(Airline.id.in_(ids), Airline.iata.in_(iatas), Airline.icao.in_(icaos))
+        )
+        found.extend(tuple(r) for r in db.execute(stmt))
+    return found
+
+
+def _sync_id_sequence(db: Session) -> None:
+    """Deja la secuencia de `airlines.id` en el máximo id cargado (solo Postgres)."""
+    db.execute(text(
+        "SELECT setval(pg_get_serial_sequence('airlines', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        "FROM airlines"
+    ))
+
+
+def bulk_load(db: Session, rows: List[dict]) -> Dict[str, int]:
+    """
+    Carga aerolíneas en lote y devuelve conteos exactos.
+
+    Estrategia:
+      1) Trae en una consulta (por lote) las aerolíneas existentes que matcheen por
+         `id`, IATA o ICAO.
+      2) Clasifica cada fila del archivo:
+           - "existing": matchea con exactamente una aerolínea existente.
+           - "conflicting": sus códigos/id apuntan a aerolíneas distintas, o repite
+             un código/id de una fila anterior del mismo archivo ("primero gana").
+           - nueva: se inserta.
+      3) Inserta las nuevas con `INSERT ... ON CONFLICT DO NOTHING` (cubre `id`,
+         `uq_airline_iata` y `uq_airline_icao`); lo que no entra por una carrera
+         con otra carga se cuenta como "conflicting".
+      4) En Postgres, después de insertar las filas con `id` explícito, lleva la
+         secuencia de `airlines.id` a `MAX(id)`: si no, las filas sin id (y las que
+         crea `get_or_create`) chocarían con esos ids.
+      5) Un solo commit al final.
+
+    Args:
+        db (Session): Sesión de base de datos.
+        rows (List[dict]): Aerolíneas validadas (`AirlineIn.model_dump()`).
+
+    Returns:
+        Dict[str, int]: {"inserted": N, "existing": M, "conflicting": K}
+    """
+    data: List[dict] = []
+    for row in rows:
+        d = dict(row)
+        for code in ("iata", "icao"):
+            d[code] = d[code].upper() if d.get(code) else None
+        if d.get("active") is None:
+            d["active"] = True  # mismo default que el modelo
+        data.append(d)
+
+    by_id: Dict[int, int] = {}
+    by_iata: Dict[str, int] = {}
+    by_icao: Dict[str, int] = {}
+    for id_, iata, icao in _fetch_existing(db, data):
+        by_id[id_] = id_
+        if iata:
+            by_iata[iata] = id_
+        if icao:
+            by_icao[icao] = id_
+
+    existing = conflicting = 0
+    seen_ids, seen_iata, seen_icao = set(), set(), set()
+    to_insert: List[dict] = []
+    for d in data:
+        matched = {
+            m
+            for m in (by_id.get(d.get("id")), by_iata.get(d["iata"]), by_icao.get(d["icao"]))
+            if m is not None
+        }
+        if len(matched) == 1:
+            existing += 1
+            continue
+        if matched:
+            conflicting += 1
+            continue
+        if (
+            (d.get("id") is not None and d["id"] in seen_ids)
+            or (d["iata"] and d["iata"] in seen_iata)
+            or (d["icao"] and d["icao"] in seen_icao)
+        ):
+            conflicting += 1
+            continue
+        if d.get("id") is not None:
+            seen_ids.add(d["id"])
+        if d["iata"]:
+            seen_iata.add(d["iata"])
+        if d["icao"]:
+            seen_icao.add(d["icao"])
+        to_insert.append(d)
+
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    # Un INSERT multi-fila necesita las mismas columnas: sin `id` va aparte (autoincremental)
+    with_id = [d for d in to_insert if d.get("id") is not None]
+    without_id = [{k: v for k, v in d.items() if k != "id"} for d in to_insert if d.get("id") is None]
+
+    inserted = 0
+    for group in (with_id, without_id):
+        for start in range(0, len(group), LOAD_BATCH_SIZE):
+            batch = group[start : start + LOAD_BATCH_SIZE]
+            result = db.execute(insert(Airline).values(batch).on_conflict_do_nothing())
+            inserted += result.rowcount
+            conflicting += len(batch) - result.rowcount
+        if group is with_id and with_id and dialect == "postgresql":
+            _sync_id_sequence(db)
+
+    db.commit()
+    return {"inserted": inserted, "existing": existing, "conflicting": conflicting}
 
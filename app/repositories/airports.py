@@ -1,9 +1,14 @@
 # from __future__ import annotations
+from typing import Dict, List
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from app.models import Airport
 
+# Filas por sentencia INSERT ... ON CONFLICT (12 columnas → ~12k parámetros)
+UPSERT_BATCH_SIZE = 1000
+
 
 class AirportsRepo:
     @staticmethod
@@ -20,6 +25,19 @@ class AirportsRepo:
         """
         return db.get(Airport, id_)
 
+    @staticmethod
+    def all_ids(db: Session) -> List[int]:
+        """
+        Devuelve todos los ids de aeropuertos (para chequear FKs de rutas en memoria).
+
+        Args:
+            db (Session): Sesión de base de datos.
+
+        Returns:
+            List[int]: Ids existentes.
+        """
+        return list(db.scalars(select(Airport.id)))
+
     @staticmethod
     def get_or_create(
         db: Session,
@@ -83,6 +101,60 @@ class AirportsRepo:
         db.refresh(ap)
         return ap
 
+    @staticmethod
+    def bulk_upsert(db: Session, rows: List[dict]) -> Dict[str, int]:
+        """
+        Inserta o actualiza aeropuertos en lote por `id` ("último gana").
+
+        En lugar de un SELECT + INSERT + commit por aeropuerto:
+          1) Deduplica el archivo por `id` quedándose con la última fila.
+          2) Por cada lote de `UPSERT_BATCH_SIZE` filas, consulta qué ids ya existen
+             (para informar insertados vs actualizados) y ejecuta un único
+             `INSERT ... ON CONFLICT (id) DO UPDATE` con todas las columnas.
+          3) Hace un solo commit al final.
+
+        Args:
+            db (Session): Sesión de base de datos.
+            rows (List[dict]): Aeropuertos validados (`AirportIn.model_dump()`).
+
+        Returns:
+            Dict[str, int]: {"inserted": N, "updated": M, "skipped": K}, donde
+                `skipped` son filas sin `id`.
+        """
+        by_id: Dict[int, dict] = {}
+        skipped = 0
+        for row in rows:
+            if row.get("id") is None:
+                skipped += 1
+                continue
+            data = dict(row)
+            for code in ("iata", "icao"):
+                if data.get(code):
+                    data[code] = data[code].upper()
+            by_id[data["id"]] = data
+
+        dialect = db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        inserted = updated = 0
+        batch_rows = list(by_id.values())
+        for start in range(0, len(batch_rows), UPSERT_BATCH_SIZE):
+            batch = batch_rows[start : start + UPSERT_BATCH_SIZE]
+            ids = [r["id"] for r in batch]
+            existing = set(db.execute(select(Airport.id).where(Airport.id.in_(ids))).scalars())
+
+            stmt = insert(Airport).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Airport.id],
+                set_={c: stmt.excluded[c] for c in batch[0] if c != "id"},
+            )
+            db.execute(stmt)
+            updated += len(existing)
+            inserted += len(batch) - len(existing)
+
+        db.commit()
+        return {"inserted": inserted, "updated": updated, "skipped": skipped}
+
 
 # Lo puedo mandar al utils porque se reutiliza muchas veces
 def get_by_codes(
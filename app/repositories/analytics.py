@@ -1,18 +1,32 @@
 # from __future__ import annotations
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from app.schemas.analytics import AirlineOccupancyOut, TopRouteOut
-from sqlalchemy.orm import Session, aliased
-from sqlalchemy import select, func, case, cast, Float, text, and_, or_
-from sqlalchemy.sql import exists
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, cast, literal, Date, Float, Integer, and_, or_
 from datetime import date
-from app.models import Route, Airport, Airline
+from app.models import Route, RouteDailyAgg, RoutePair, Airline
+from app.repositories.dimensions import dimension_cache
+
+
+class StreakRow(NamedTuple):
+    airline: Optional[str]
+    origin: Optional[str]
+    destination: Optional[str]
+    streak_start: date
+    streak_end: date
+    days: int
+
+
+def _none_last(value):
+    # Orden de texto con NULLS LAST, como en SQL
+    return (value is None, value or "")
 
 
 def average_occupancy_by_airline(db: Session, start=None, end=None):
     """
     Calcula el promedio simple de ocupación por aerolínea.
 
-    Usa `Route.occupancy` directamente (si ya está precalculado en el modelo).
+    Usa la columna generada `Route.occupancy` (las rutas sin ocupación no cuentan).
     Para promedio ponderado por capacidad usá `find_airline_occupancy_orm`.
 
     Args:
@@ -42,10 +56,14 @@ def domestic_altitude_percentage(db: Session, min_occupancy: float = 0.85):
 
     Reglas:
       - Doméstico: `ao.country == ad.country` (y no nulos).
-      - Alta ocupación: tickets_sold/capacity >= `min_occupancy`.
+      - Alta ocupación: `routes.occupancy` (tickets_sold/capacity) >= `min_occupancy`.
       - Altitud: se usa `altitude_ft` convertido a metros (ft * 0.3048).
       - Retorna `(total, over_1000, porcentaje)`.
 
+    La base solo cuenta vuelos por par origen/destino en `routes`; si el par es
+    doméstico y su diferencia de altitud salen de `route_pairs` (calculados una vez
+    por par).
+
     Args:
         db (Session): Sesión de base de datos.
         min_occupancy (float): Umbral de ocupación (0..1). Por defecto 0.85.
@@ -56,151 +74,132 @@ def domestic_altitude_percentage(db: Session, min_occupancy: float = 0.85):
             - cuántos superan 1000m de diferencia de altitud,
             - porcentaje correspondiente (0..100).
     """
-    ao = aliased(Airport)  # origen
-    ad = aliased(Airport)  # destino
+    # Vuelos con alta ocupación por par origen/destino: range scan sobre `ix_routes_occupancy_od`
+    # (el índice ya trae el par), sin joins
     R = Route
-
-    # Ocupación efectiva: tickets_sold / capacity (si ambos existen y capacity > 0)
-    occ_effective = case(
-        (
-            (R.tickets_sold.is_not(None)) &
-            (R.capacity.is_not(None)) &
-            (R.capacity > 0),
-            cast(R.tickets_sold, Float) / cast(R.capacity, Float)
-        ),
-        else_=None
-    )
-
-    # Diferencia de altitud en METROS (altitude_ft * 0.3048)
-    altitude_diff_m = func.abs((ao.altitude_ft - ad.altitude_ft) * 0.3048)
-
-    q = (
-        select(
-            func.count().label("total"),
-            func.sum(
-                case((altitude_diff_m > 1000, 1), else_=0)
-            ).label("over_1000")
-        )
-        .select_from(R)
-        .join(ao, ao.id == R.origin_airport_id)
-        .join(ad, ad.id == R.destination_airport_id)
-        .where(
-            # Domésticos
-            ao.country.is_not(None),
-            ad.country.is_not(None),
-            ao.country == ad.country,
-            # Altitudes presentes (evitar NULL en la resta)
-            ao.altitude_ft.is_not(None),
-            ad.altitude_ft.is_not(None),
-            # Alta ocupación
-            occ_effective.is_not(None),
-            occ_effective >= min_occupancy,
+    counts = db.execute(
+        select(R.origin_airport_id, R.destination_airport_id, func.count())
+        .where(R.occupancy >= min_occupancy)
+        .group_by(R.origin_airport_id, R.destination_airport_id)
+    ).all()
+    # Pares domésticos con las dos altitudes presentes, ya calculados en `route_pairs`
+    P = RoutePair
+    altitude_diff = dict(
+        ((o, d), diff)
+        for o, d, diff in db.execute(
+            select(P.origin_airport_id, P.destination_airport_id, P.altitude_diff_m)
+            .where(P.is_domestic.is_(True), P.altitude_diff_m.is_not(None))
         )
     )
 
-    row = db.execute(q).first()
-    if row is None:
-        total, over = 0, 0
-    else:
-        total, over = int(row.total or 0), int(row.over_1000 or 0)
+    total, over = 0, 0
+    for origin_id, destination_id, flights in counts:
+        diff = altitude_diff.get((origin_id, destination_id))
+        if diff is None:
+            continue
+        total += flights
+        if diff > 1000:
+            over += flights
 
     pct = (over / total * 100.0) if total else 0.0
     return total, over, pct
 
 
+# Origen para numerar días en Postgres (fecha - fecha = entero)
+_EPOCH = date(1970, 1, 1)
+
+
+def _day_number(col, dialect: str):
+    """Número de día entero de una fecha, para restar fechas en cualquier motor."""
+    if dialect == "postgresql":
+        return col - literal(_EPOCH, Date)
+    # SQLite guarda las fechas como texto ISO: julianday() da el día juliano (x.5)
+    return cast(func.julianday(col), Integer)
+
+
 def consecutive_high_occupancy_routes(
     db: Session,
     min_occupancy: float = 0.85,
     start: date | None = None,
     end: date | None = None,
+    min_streak: int = 2,
 ):
     """
-    Identifica rutas con alta ocupación en días consecutivos.
+    Identifica rachas de días consecutivos con alta ocupación por ruta.
 
-    Considera la MISMA ruta `(airline_id, origin_airport_id, destination_airport_id)` con:
-      - día `D` con ocupación >= `min_occupancy`, y
-      - un vuelo idéntico el día `D+1` también con ocupación >= `min_occupancy`.
+    Un día cuenta para la ruta `(airline_id, origin_airport_id, destination_airport_id)`
+    si algún vuelo de ese día tuvo ocupación >= `min_occupancy` (`max_occupancy` de
+    `route_daily_agg`). Las rachas salen en una sola pasada ordenada (gaps-and-islands):
+    dentro de cada ruta, `número de día - ROW_NUMBER()` es constante mientras los
+    días sean consecutivos, y se agrupa por ese valor. Funciona igual en Postgres y
+    SQLite (no usa `INTERVAL`).
 
     Args:
         db (Session): Sesión de base de datos.
         min_occupancy (float): Umbral mínimo (0..1). Por defecto 0.85.
-        start (date | None): Fecha inicial para filtrar `R.flight_date`.
-        end (date | None): Fecha final para filtrar `R.flight_date`.
+        start (date | None): Solo considera días desde esta fecha (inclusive).
+        end (date | None): Solo considera días hasta esta fecha (inclusive).
+        min_streak (int): Mínimo de días consecutivos de la racha. Por defecto 2.
+
+    La consulta devuelve ids; los nombres de aerolínea y los IATA se completan desde
+    `dimension_cache` (las rachas de aerolíneas o aeropuertos que no existen se descartan).
 
     Returns:
-        list[Row]: Filas con
-            `(airline, origin_iata, destination_iata, first_date, second_date)`,
-        ordenadas por aerolínea, origen, destino y fecha.
+        list[StreakRow]: Filas con
+            `(airline, origin_iata, destination_iata, streak_start, streak_end, days)`,
+        ordenadas por aerolínea, origen, destino y fecha de inicio.
     """
-    R = Route
-    R2 = aliased(Route)
-    ao = aliased(Airport)   # origin
-    ad = aliased(Airport)   # destination
-
-    # ocupación efectiva R
-    occ = case(
-        (
-            (R.tickets_sold.is_not(None)) &
-            (R.capacity.is_not(None)) &
-            (R.capacity > 0),
-            cast(R.tickets_sold, Float) / cast(R.capacity, Float)
-        ),
-        else_=None
-    )
+    R = RouteDailyAgg
+    dialect = db.get_bind().dialect.name
+    route_key = [R.airline_id, R.origin_airport_id, R.destination_airport_id]
 
-    # ocupación efectiva R2
-    occ2 = case(
-        (
-            (R2.tickets_sold.is_not(None)) &
-            (R2.capacity.is_not(None)) &
-            (R2.capacity > 0),
-            cast(R2.tickets_sold, Float) / cast(R2.capacity, Float)
-        ),
-        else_=None
-    )
-
-    # EXISTS: hay un vuelo al día siguiente con la misma ruta y alta ocupación
-    exists_next_day = exists(
-        select(1)
-        .where(
-            and_(
-                R2.airline_id == R.airline_id,
-                R2.origin_airport_id == R.origin_airport_id,
-                R2.destination_airport_id == R.destination_airport_id,
-                R2.flight_date == R.flight_date + text("INTERVAL '1 day'"),
-                occ2.is_not(None),
-                occ2 >= min_occupancy,
-            )
-        )
+    # Días con alta ocupación (una fila por ruta y día, sin importar `operated_carrier`)
+    day_filters = [R.max_occupancy >= min_occupancy, R.flight_date.is_not(None)]
+    if start:
+        day_filters.append(R.flight_date >= start)
+    if end:
+        day_filters.append(R.flight_date <= end)
+    high_days = select(*route_key, R.flight_date).where(*day_filters).group_by(*route_key, R.flight_date).subquery("high_days")
+
+    # Días consecutivos comparten `grp`
+    hd = high_days.c
+    grp = _day_number(hd.flight_date, dialect) - func.row_number().over(
+        partition_by=[hd.airline_id, hd.origin_airport_id, hd.destination_airport_id],
+        order_by=hd.flight_date,
     )
+    islands = select(hd.airline_id, hd.origin_airport_id, hd.destination_airport_id, hd.flight_date, grp.label("grp")).subquery("islands")
 
-    q = (
+    il = islands.c
+    streaks = (
         select(
-            Airline.name.label("airline"),
-            ao.iata.label("origin"),
-            ad.iata.label("destination"),
-            R.flight_date.label("first_date"),
-            (R.flight_date + text("INTERVAL '1 day'")).label("second_date"),
-        )
-        .select_from(R)
-        .join(Airline, Airline.id == R.airline_id, isouter=False)
-        .join(ao, ao.id == R.origin_airport_id)
-        .join(ad, ad.id == R.destination_airport_id)
-        .where(
-            occ.is_not(None),
-            occ >= min_occupancy,
-            exists_next_day,
+            il.airline_id,
+            il.origin_airport_id,
+            il.destination_airport_id,
+            func.min(il.flight_date).label("streak_start"),
+            func.max(il.flight_date).label("streak_end"),
+            func.count().label("days"),
         )
+        .group_by(il.airline_id, il.origin_airport_id, il.destination_airport_id, il.grp)
+        .having(func.count() >= min_streak)
+        .subquery("streaks")
     )
 
-    if start:
-        q = q.where(R.flight_date >= start)
-    if end:
-        q = q.where(R.flight_date <= end)
-
-    q = q.order_by(Airline.name, ao.iata, ad.iata, R.flight_date)
-
-    return db.execute(q).all()
+    dims = dimension_cache.get(db)
+    keyed = []
+    for airline_id, origin_id, destination_id, streak_start, streak_end, days in db.execute(select(streaks)):
+        airline = dims.airlines.get(airline_id)
+        ao, ad = dims.airports.get(origin_id), dims.airports.get(destination_id)
+        if airline is None or ao is None or ad is None:
+            continue
+        row = StreakRow(airline.name, ao.iata, ad.iata, streak_start, streak_end, int(days))
+        # Aerolínea, origen y destino (NULLS LAST), inicio de la racha y desempate por ids
+        sort_key = (
+            _none_last(row.airline), _none_last(row.origin), _none_last(row.destination), streak_start,
+            airline_id, origin_id, destination_id,
+        )
+        keyed.append((sort_key, row))
+    keyed.sort(key=lambda kr: kr[0])
+    return [row for _, row in keyed]
 
 
 def find_top_routes_by_country_orm(
@@ -233,21 +232,20 @@ def find_top_routes_by_country_orm(
         List[TopRouteOut]: Lista de rutas con IDs de aeropuertos, nombres legibles
         (preferencia IATA→ICAO→name) y cantidad de vuelos.
     """
-    R = Route
-    AO = aliased(Airport)  # origin
-    AD = aliased(Airport)  # destination
-
-    # Nombres legibles (IATA → ICAO → name). Usamos MAX() para poder agrupar solo por IDs.
-    origin_name = func.max(func.coalesce(AO.iata, AO.icao, AO.name)).label("origin")
-    dest_name   = func.max(func.coalesce(AD.iata, AD.icao, AD.name)).label("destination")
-
-    # Filtro país según scope
+    # Agregado diario: `flights` ya cuenta los vuelos de cada ruta/día
+    R = RouteDailyAgg
+    dims = dimension_cache.get(db)
+
+    # Filtro país según scope, sobre los ids de aeropuerto del país (sin join contra `airports`)
+    country_ids = dims.airports_by_country.get(country)
+    if not country_ids:
+        return []
     if scope == "origin":
-        country_filter = (AO.country == country)
+        country_filter = R.origin_airport_id.in_(country_ids)
     elif scope == "destination":
-        country_filter = (AD.country == country)
+        country_filter = R.destination_airport_id.in_(country_ids)
     else:
-        country_filter = or_(AO.country == country, AD.country == country)
+        country_filter = or_(R.origin_airport_id.in_(country_ids), R.destination_airport_id.in_(country_ids))
 
     filters = [country_filter]
     if only_operated is True:
@@ -263,28 +261,28 @@ def find_top_routes_by_country_orm(
         select(
             R.origin_airport_id,
             R.destination_airport_id,
-            origin_name,
-            dest_name,
-            func.count().label("flights"),
+            func.sum(R.flights).label("flights"),
         )
-        .select_from(R)
-        .join(AO, AO.id == R.origin_airport_id)
-        .join(AD, AD.id == R.destination_airport_id)
         .where(and_(*filters))
         .group_by(R.origin_airport_id, R.destination_airport_id)
-        .order_by(func.count().desc())
+        # desempate por ids: el orden es el mismo en cualquier motor (y en el motor columnar)
+        .order_by(func.sum(R.flights).desc(), R.origin_airport_id, R.destination_airport_id)
         .limit(limit)
     )
 
     rows = db.execute(q).mappings().all()
 
-    # Mapear a Pydantic
+    # Mapear a Pydantic, con nombres legibles (IATA → ICAO → name) desde la caché de dimensiones
+    def label(airport_id):
+        airport = dims.airports.get(airport_id)
+        return airport.label if airport is not None else None
+
     return [
         TopRouteOut(
             origin_airport_id=r["origin_airport_id"],
             destination_airport_id=r["destination_airport_id"],
-            origin=r["origin"],
-            destination=r["destination"],
+            origin=label(r["origin_airport_id"]),
+            destination=label(r["destination_airport_id"]),
             flights=int(r["flights"]),
         )
         for r in rows
@@ -320,8 +318,8 @@ def find_airline_occupancy_orm(
         List[AirlineOccupancyOut]: Aerolínea con su cantidad de vuelos, tickets,
         capacidad total y ocupación (0..1).
     """
-    R = Route
-    A = Airline
+    # Agregado diario: tickets/capacity/flights ya vienen sumados por ruta y día
+    R = RouteDailyAgg
 
     filters = []
     if start is not None:
@@ -333,9 +331,9 @@ def find_airline_occupancy_orm(
     elif only_operated is False:
         filters.append(R.operated_carrier.is_(False))
 
-    sum_tickets   = func.coalesce(func.sum(R.tickets_sold), 0).label("tickets")
+    sum_tickets   = func.coalesce(func.sum(R.tickets), 0).label("tickets")
     sum_capacity  = func.coalesce(func.sum(R.capacity), 0).label("capacity")
-    flights_count = func.count().label("flights")
+    flights_count = func.sum(R.flights).label("flights")
 
     # occupancy = SUM(tickets) / NULLIF(SUM(capacity), 0)
     occupancy = cast(
@@ -343,36 +341,30 @@ def find_airline_occupancy_orm(
         Float
     ).label("occupancy")
 
-    base = (
-        select(
-            R.airline_id,
-            func.max(A.name).label("airline"),  # determinista por airline_id
-            flights_count,
-            sum_tickets,
-            sum_capacity,
-            occupancy,
-        )
-        .select_from(R)
-        .join(A, A.id == R.airline_id)
-    )
+    # Solo ids: el nombre de la aerolínea sale de la caché de dimensiones
+    base = select(R.airline_id, flights_count, sum_tickets, sum_capacity, occupancy)
     q = base.where(and_(*filters)) if filters else base
     q = q.group_by(R.airline_id)
 
     if min_flights > 1:
-        q = q.having(func.count() >= min_flights)
+        q = q.having(func.sum(R.flights) >= min_flights)
 
-    q = q.order_by(occupancy.desc().nulls_last(), flights_count.desc())
+    q = q.order_by(occupancy.desc().nulls_last(), flights_count.desc(), R.airline_id)
 
     rows = db.execute(q).mappings().all()
+    airlines = dimension_cache.get(db).airlines
 
     # Mapear a Pydantic (evitar None en occupancy si cap=0)
     out: List[AirlineOccupancyOut] = []
     for r in rows:
+        airline = airlines.get(r["airline_id"])
+        if airline is None:
+            continue
         occ = r["occupancy"] if r["occupancy"] is not None else 0.0
         out.append(
             AirlineOccupancyOut(
                 airline_id=r["airline_id"],
-                airline=r["airline"],
+                airline=airline.name,
                 flights=int(r["flights"]),
                 tickets=int(r["tickets"]),
                 capacity=int(r["capacity"]),
@@ -0,0 +1,63 @@
+# from __future__ import annotations
+from typing import Any, Dict, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import IngestCheckpoint
+
+
+class CheckpointsRepo:
+    @staticmethod
+    def get(db: Session, job_id: str) -> IngestCheckpoint | None:
+        """
+        Obtiene el checkpoint de un job.
+
+        Args:
+            db (Session): Sesión de base de datos.
+            job_id (str): Identificador del job de ingesta.
+
+        Returns:
+            IngestCheckpoint | None: El checkpoint si el job no terminó con éxito.
+        """
+        return db.get(IngestCheckpoint, job_id)
+
+    @staticmethod
+    def create(
+        db: Session,
+        job_id: str,
+        *,
+        kind: str,
+        path: str,
+        filename: str | None,
+        sha256: str | None,
+        options: Dict[str, Any],
+    ) -> IngestCheckpoint:
+        """Crea el checkpoint inicial (fila 0) de un job y hace commit."""
+        cp = IngestCheckpoint(
+            job_id=job_id, kind=kind, path=path, filename=filename, sha256=sha256,
+            options=options, rows_done=0, stats={},
+        )
+        db.add(cp)
+        db.commit()
+        return cp
+
+    @staticmethod
+    def advance(
+        db: Session, cp: IngestCheckpoint, rows_done: int, stats: Dict[str, Any], byte_offset: int | None = None
+    ) -> None:
+        """
+        Registra el avance. No hace commit: se commitea junto con el chunk insertado.
+        """
+        cp.rows_done = rows_done
+        cp.byte_offset = byte_offset
+        cp.stats = dict(stats)
+
+    @staticmethod
+    def all(db: Session) -> List[IngestCheckpoint]:
+        """Todos los checkpoints (jobs de rutas que no terminaron con éxito; son pocos)."""
+        return list(db.scalars(select(IngestCheckpoint)))
+
+    @staticmethod
+    def delete(db: Session, cp: IngestCheckpoint) -> None:
+        """Borra el checkpoint de un job terminado y hace commit."""
+        db.delete(cp)
+        db.commit()
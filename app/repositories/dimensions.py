@@ -0,0 +1,112 @@
+# from __future__ import annotations
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Airline, Airport
+
+
+class AirportDim(NamedTuple):
+    iata: Optional[str]
+    icao: Optional[str]
+    name: str
+    country: Optional[str]
+    altitude_ft: Optional[int]
+
+    @property
+    def label(self) -> str:
+        # Nombre legible: IATA → ICAO → name
+        return self.iata or self.icao or self.name
+
+
+class AirlineDim(NamedTuple):
+    name: Optional[str]
+    iata: Optional[str]
+    icao: Optional[str]
+
+
+@dataclass
+class Dimensions:
+    """Foto inmutable de las dimensiones, indexada por id."""
+    airports: Dict[int, AirportDim]
+    airlines: Dict[int, AirlineDim]
+    airports_by_country: Dict[str, List[int]] = field(default_factory=dict)
+
+
+def load_dimensions(db: Session) -> Dimensions:
+    """
+    Lee aeropuertos y aerolíneas completos.
+
+    Args:
+        db (Session): Sesión de base de datos.
+
+    Returns:
+        Dimensions: Aeropuertos y aerolíneas por id, y los ids de aeropuerto de cada país
+            (ordenados).
+    """
+    airports = {
+        r.id: AirportDim(r.iata, r.icao, r.name, r.country, r.altitude_ft)
+        for r in db.execute(
+            select(Airport.id, Airport.iata, Airport.icao, Airport.name, Airport.country, Airport.altitude_ft)
+            .order_by(Airport.id)
+        )
+    }
+    airlines = {
+        r.id: AirlineDim(r.name, r.iata, r.icao)
+        for r in db.execute(select(Airline.id, Airline.name, Airline.iata, Airline.icao).order_by(Airline.id))
+    }
+    by_country: Dict[str, List[int]] = {}
+    for airport_id, a in airports.items():
+        if a.country is not None:
+            by_country.setdefault(a.country, []).append(airport_id)
+    return Dimensions(airports=airports, airlines=airlines, airports_by_country=by_country)
+
+
+class DimensionCache:
+    """
+    Aeropuertos y aerolíneas en memoria, compartidos por todo el proceso.
+
+    Las consultas de analítica agregan solo por ids y toman de acá los nombres,
+    países y altitudes, en lugar de hacer join contra `airports`/`airlines` en cada
+    llamada. Se carga la primera vez que se pide y se vuelve a cargar después de
+    `invalidate()` (lo llama cada job de ingesta) o si la sesión apunta a otra base.
+    """
+
+    def __init__(self):
+        self._dims: Optional[Dimensions] = None
+        self._bind: Any = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, db: Session) -> Dimensions:
+        """
+        Devuelve las dimensiones vigentes, cargándolas si hace falta.
+
+        Args:
+            db (Session): Sesión con la que se cargan si no están en memoria.
+
+        Returns:
+            Dimensions: Foto actual (no se modifica; una recarga crea otra).
+        """
+        bind = db.get_bind()
+        dims = self._dims
+        if dims is not None and self._bind is bind:
+            return dims
+        with self._lock:
+            if self._dims is None or self._bind is not bind:
+                self._dims = load_dimensions(db)
+                self._bind = bind
+                self.loads += 1
+            return self._dims
+
+    def invalidate(self) -> None:
+        """Descarta la foto actual; la próxima consulta la vuelve a leer."""
+        with self._lock:
+            self._dims = None
+            self._bind = None
+
+
+dimension_cache = DimensionCache()
@@ -0,0 +1,38 @@
+# from __future__ import annotations
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import IngestFile
+
+
+class IngestFilesRepo:
+    @staticmethod
+    def get(db: Session, kind: str, sha256: str) -> IngestFile | None:
+        """
+        Busca un archivo ya ingerido por tipo y hash de contenido.
+
+        Args:
+            db (Session): Sesión de base de datos.
+            kind (str): Tipo de ingesta ("routes", "airports", "airlines").
+            sha256 (str): SHA-256 (hex) del archivo.
+
+        Returns:
+            IngestFile | None: El registro de la ingesta anterior, o None.
+        """
+        return db.scalar(select(IngestFile).where(IngestFile.kind == kind, IngestFile.sha256 == sha256))
+
+    @staticmethod
+    def record(db: Session, kind: str, sha256: str, *, filename: str | None, rows_inserted: int | None) -> None:
+        """
+        Registra un archivo ingerido con éxito y hace commit.
+
+        Si dos uploads iguales terminan a la vez, el segundo no hace nada
+        (`ON CONFLICT DO NOTHING` sobre (kind, sha256)).
+        """
+        insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        db.execute(
+            insert(IngestFile)
+            .values(kind=kind, sha256=sha256, filename=filename, rows_inserted=rows_inserted)
+            .on_conflict_do_nothing(index_elements=[IngestFile.kind, IngestFile.sha256])
+        )
+        db.commit()
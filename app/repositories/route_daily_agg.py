@@ -0,0 +1,122 @@
+# from __future__ import annotations
+from typing import List
+import pandas as pd
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Route, RouteDailyAgg
+from app.models.route_daily_agg import NO_DATE
+
+# Clave de agregación (mismas columnas en `routes` y `route_daily_agg`)
+AGG_KEY = ["airline_id", "origin_airport_id", "destination_airport_id", "flight_date", "operated_carrier"]
+AGG_METRICS = ["flights", "tickets", "capacity", "revenue", "max_occupancy"]
+# Claves por INSERT ... SELECT (5 columnas → 2.5k parámetros por sentencia)
+REFRESH_BATCH_SIZE = 500
+# Primer entero de `pg_advisory_xact_lock(ns, airline_id)` que serializa el refresh por aerolínea
+REFRESH_LOCK_NAMESPACE = 0x52444141
+
+
+def daily_aggregates():
+    """SELECT que agrega `routes` por `AGG_KEY` (las columnas salen en el orden de `route_daily_agg`)."""
+    R = Route
+    key = [getattr(R, c) for c in AGG_KEY]
+    return (
+        select(
+            *key,
+            func.count().label("flights"),
+            func.coalesce(func.sum(R.tickets_sold), 0).label("tickets"),
+            func.coalesce(func.sum(R.capacity), 0).label("capacity"),
+            func.coalesce(func.sum(R.tickets_sold * R.price_ticket), 0.0).label("revenue"),
+            func.max(R.occupancy).label("max_occupancy"),
+        )
+        .where(R.airline_id.is_not(None))
+        .group_by(*key)
+    )
+
+
+def _key_filter(model, keys: pd.DataFrame):
+    # (a, o, d, fecha, operado) IN (...); las claves sin fecha van aparte (NULL no matchea en IN)
+    cols = [getattr(model, c) for c in AGG_KEY]
+    clauses = []
+    dated = keys[keys["flight_date"].notna()]
+    if len(dated):
+        clauses.append(tuple_(*cols).in_(list(dated.itertuples(index=False, name=None))))
+    undated = keys[keys["flight_date"].isna()]
+    if len(undated):
+        rest = [c for c in AGG_KEY if c != "flight_date"]
+        clauses.append(
+            and_(
+                model.flight_date.is_(None),
+                tuple_(*(getattr(model, c) for c in rest)).in_(list(undated[rest].itertuples(index=False, name=None))),
+            )
+        )
+    return or_(*clauses)
+
+
+class RouteDailyAggRepo:
+    @staticmethod
+    def touched_keys(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Claves de agregación distintas de un chunk de rutas.
+
+        Args:
+            frame (pd.DataFrame): Rutas validadas (columnas de `routes`).
+
+        Returns:
+            pd.DataFrame: Columnas de `AGG_KEY` con tipos de Python (fechas como `date`).
+        """
+        keys = frame[AGG_KEY].drop_duplicates()
+        out = pd.DataFrame(
+            {
+                "airline_id": keys["airline_id"].astype("int64").to_numpy(),
+                "origin_airport_id": keys["origin_airport_id"].astype("int64").to_numpy(),
+                "destination_airport_id": keys["destination_airport_id"].astype("int64").to_numpy(),
+                "flight_date": pd.to_datetime(keys["flight_date"]).dt.date.to_numpy(dtype=object),
+                "operated_carrier": keys["operated_carrier"].astype(bool).to_numpy(),
+            }
+        )
+        out["flight_date"] = out["flight_date"].where(pd.notna(out["flight_date"]), None)
+        return out.astype(object)
+
+    @staticmethod
+    def refresh(db: Session, keys: pd.DataFrame) -> int:
+        """
+        Recalcula desde `routes` las filas agregadas de las claves tocadas. No hace commit.
+
+        Cada clave se recalcula con `INSERT ... SELECT` agrupando solo las rutas de
+        esas claves y `ON CONFLICT DO UPDATE` sobre la clave única, así el resultado
+        es el mismo aunque la ingesta haya descartado duplicados.
+
+        En Postgres, antes se toma un advisory lock por aerolínea (hasta el commit):
+        con dos jobs de rutas a la vez, el segundo espera y su SELECT ya ve las rutas
+        que commiteó el primero (en READ COMMITTED, si no, pisaría el agregado con
+        uno que no las incluye). Por eso conviene llamarlo al final del chunk, justo
+        antes del commit: mientras tiene los locks no espera a otras transacciones.
+
+        Args:
+            db (Session): Sesión de base de datos (la misma transacción que el INSERT de rutas).
+            keys (pd.DataFrame): Claves de `touched_keys`.
+
+        Returns:
+            int: Cantidad de claves recalculadas.
+        """
+        cols: List[str] = AGG_KEY + AGG_METRICS
+        if db.get_bind().dialect.name == "postgresql":
+            insert = postgresql.insert
+            # En orden, para que dos jobs no se bloqueen mutuamente
+            for airline_id in sorted(set(keys["airline_id"])):
+                db.execute(select(func.pg_advisory_xact_lock(REFRESH_LOCK_NAMESPACE, int(airline_id))))
+        else:
+            insert = sqlite.insert
+        A = RouteDailyAgg
+        # Mismas expresiones que el índice único `uq_route_daily_agg_key`
+        target = [
+            A.airline_id, A.origin_airport_id, A.destination_airport_id,
+            func.coalesce(A.flight_date, NO_DATE), A.operated_carrier,
+        ]
+        for start in range(0, len(keys), REFRESH_BATCH_SIZE):
+            batch = keys.iloc[start:start + REFRESH_BATCH_SIZE]
+            stmt = insert(A).from_select(cols, daily_aggregates().where(_key_filter(Route, batch)))
+            stmt = stmt.on_conflict_do_update(index_elements=target, set_={c: stmt.excluded[c] for c in AGG_METRICS})
+            db.execute(stmt)
+        return len(keys)
@@ -0,0 +1,154 @@
+# from __future__ import annotations
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import pandas as pd
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Airport, RoutePair
+
+Pair = Tuple[int, int]
+
+# Radio medio de la Tierra (km) para la distancia haversine
+EARTH_RADIUS_KM = 6371.0088
+FT_TO_M = 0.3048
+# Pares / aeropuertos por sentencia (2 parámetros por par)
+PAIRS_BATCH_SIZE = 1000
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia ortodrómica entre dos puntos (grados) en km."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def pair_attributes(origin: Airport, destination: Airport) -> Dict[str, Optional[float]]:
+    """
+    Atributos de un par (origen, destino) a partir de sus aeropuertos.
+
+    Args:
+        origin: Fila de aeropuerto con `country`, `altitude_ft`, `latitude` y `longitude`.
+        destination: Ídem para el destino.
+
+    Returns:
+        dict: {"is_domestic", "altitude_diff_m", "distance_km"} (las columnas de `RoutePair`).
+    """
+    altitude_diff_m = None
+    if origin.altitude_ft is not None and destination.altitude_ft is not None:
+        altitude_diff_m = abs((origin.altitude_ft - destination.altitude_ft) * FT_TO_M)
+    distance_km = None
+    if None not in (origin.latitude, origin.longitude, destination.latitude, destination.longitude):
+        distance_km = haversine_km(
+            float(origin.latitude), float(origin.longitude), float(destination.latitude), float(destination.longitude)
+        )
+    return {
+        "is_domestic": origin.country is not None and origin.country == destination.country,
+        "altitude_diff_m": altitude_diff_m,
+        "distance_km": distance_km,
+    }
+
+
+def _airports(db: Session, ids: Set[int]) -> Dict[int, Airport]:
+    cols = (Airport.id, Airport.country, Airport.altitude_ft, Airport.latitude, Airport.longitude)
+    out: Dict[int, Airport] = {}
+    id_list = sorted(ids)
+    for start in range(0, len(id_list), PAIRS_BATCH_SIZE):
+        batch = id_list[start:start + PAIRS_BATCH_SIZE]
+        out.update({r.id: r for r in db.execute(select(*cols).where(Airport.id.in_(batch)))})
+    return out
+
+
+def _insert_pairs(db: Session, pairs: Iterable[Pair], *, update: bool = False) -> int:
+    # ON CONFLICT: otro job (de rutas o de aeropuertos) puede insertar el mismo par
+    # entre nuestro SELECT y este INSERT; con `update` se pisan sus atributos.
+    pairs = list(pairs)
+    airports = _airports(db, {a for p in pairs for a in p})
+    rows = [
+        {"origin_airport_id": o, "destination_airport_id": d, **pair_attributes(airports[o], airports[d])}
+        for o, d in pairs
+        if o in airports and d in airports
+    ]
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    keys = [RoutePair.origin_airport_id, RoutePair.destination_airport_id]
+    for start in range(0, len(rows), PAIRS_BATCH_SIZE):
+        stmt = insert(RoutePair).values(rows[start:start + PAIRS_BATCH_SIZE])
+        if update:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=keys,
+                set_={c: stmt.excluded[c] for c in ("is_domestic", "altitude_diff_m", "distance_km")},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+        db.execute(stmt)
+    return len(rows)
+
+
+class RoutePairsRepo:
+    @staticmethod
+    def touched_pairs(frame: pd.DataFrame) -> List[Pair]:
+        """
+        Pares (origen, destino) distintos de un chunk de rutas.
+
+        Args:
+            frame (pd.DataFrame): Rutas validadas (columnas de `routes`).
+
+        Returns:
+            List[Pair]: Pares como enteros de Python.
+        """
+        pairs = frame[["origin_airport_id", "destination_airport_id"]].drop_duplicates()
+        return [(int(o), int(d)) for o, d in pairs.itertuples(index=False, name=None)]
+
+    @staticmethod
+    def add_missing(db: Session, pairs: List[Pair]) -> int:
+        """
+        Agrega a `route_pairs` los pares que todavía no están. No hace commit.
+
+        Si otro job agrega el mismo par al mismo tiempo, el INSERT lo ignora
+        (`ON CONFLICT DO NOTHING`) en lugar de fallar por la clave primaria.
+
+        Args:
+            db (Session): Sesión de base de datos (la misma transacción que el INSERT de rutas).
+            pairs (List[Pair]): Pares de `touched_pairs`.
+
+        Returns:
+            int: Cantidad de pares nuevos.
+        """
+        missing: List[Pair] = []
+        for start in range(0, len(pairs), PAIRS_BATCH_SIZE):
+            batch = pairs[start:start + PAIRS_BATCH_SIZE]
+            existing = set(
+                db.execute(
+                    select(RoutePair.origin_airport_id, RoutePair.destination_airport_id).where(
+                        tuple_(RoutePair.origin_airport_id, RoutePair.destination_airport_id).in_(batch)
+                    )
+                ).tuples()
+            )
+            missing.extend(p for p in batch if p not in existing)
+        return _insert_pairs(db, missing)
+
+    @staticmethod
+    def refresh_airports(db: Session, airport_ids: Iterable[int]) -> int:
+        """
+        Recalcula los pares en los que participa alguno de los aeropuertos. No hace commit.
+
+        Los pares existen desde que se cargó la primera ruta que los usa (`add_missing`,
+        o el backfill de la migración); acá se vuelven a calcular con los datos actuales
+        de los aeropuertos y se pisan con `INSERT ... ON CONFLICT DO UPDATE`.
+
+        Args:
+            db (Session): Sesión de base de datos.
+            airport_ids (Iterable[int]): Aeropuertos insertados o actualizados.
+
+        Returns:
+            int: Cantidad de pares recalculados.
+        """
+        ids = sorted(set(airport_ids))
+        P = RoutePair
+        pairs: Set[Pair] = set()
+        for start in range(0, len(ids), PAIRS_BATCH_SIZE):
+            batch = ids[start:start + PAIRS_BATCH_SIZE]
+            touches = or_(P.origin_airport_id.in_(batch), P.destination_airport_id.in_(batch))
+            pairs.update(db.execute(select(P.origin_airport_id, P.destination_airport_id).where(touches)).tuples())
+        return _insert_pairs(db, sorted(pairs), update=True)
@@ -1,14 +1,101 @@
 # from __future__ import annotations
+import io
 from typing import List
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Session
+from app.ingest.routes_vectorized import frame_to_rows
 from app.models import Route
 
+# Tabla temporal (por conexión) para cargas vía staging; se vacía en cada commit
+STAGING_TABLE = "routes_staging"
+# Filas por INSERT multi-fila fuera de Postgres (13 columnas → ~13k parámetros)
+INSERT_BATCH_SIZE = 1000
+
+
 class RoutesRepo:
     @staticmethod
     def bulk_insert(db: Session, rows: List[Route]) -> None:
         db.bulk_save_objects(rows)
         db.commit()
 
+    @staticmethod
+    def load_frame(db: Session, frame: pd.DataFrame, *, staging: bool = False, commit: bool = True) -> int:
+        """
+        Carga un DataFrame de rutas validadas en `routes` y (por defecto) hace commit.
+
+        - PostgreSQL: `COPY routes (...) FROM STDIN` con psycopg2 (`copy_expert`).
+          Con `staging=True` el COPY va a una tabla temporal y después se hace
+          `INSERT INTO routes SELECT ... FROM routes_staging` en el servidor.
+        - Otros motores (SQLite en tests): `INSERT` multi-fila vía executemany.
+
+        Si el DataFrame trae la columna `fingerprint`, las rutas repetidas (dentro
+        del chunk o ya cargadas antes) se descartan: se deduplica el chunk y el
+        INSERT lleva `ON CONFLICT (fingerprint) DO NOTHING` (en Postgres siempre
+        pasa por staging, `COPY` no admite `ON CONFLICT`).
+
+        Args:
+            db (Session): Sesión de base de datos.
+            frame (pd.DataFrame): Filas con columnas de `routes` (como las devuelve
+                `validate_routes_frame`).
+            staging (bool): Si es True, pasa por la tabla temporal de staging (solo Postgres).
+            commit (bool): Si es False, no hace commit (para commitear junto con otros cambios,
+                ej. el checkpoint del job).
+
+        Returns:
+            int: Cantidad de filas insertadas.
+        """
+        if frame.empty:
+            return 0
+        dedupe = "fingerprint" in frame.columns
+        if dedupe:
+            frame = frame.drop_duplicates("fingerprint")
+        if db.get_bind().dialect.name == "postgresql":
+            inserted = _copy_frame(db, frame, staging=staging or dedupe, dedupe=dedupe)
+        elif dedupe:
+            stmt = sqlite.insert(Route).on_conflict_do_nothing(index_elements=[Route.fingerprint])
+            rows = frame_to_rows(frame)
+            inserted = 0
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                inserted += db.execute(stmt.values(rows[start : start + INSERT_BATCH_SIZE])).rowcount
+        else:
+            db.execute(insert(Route), frame_to_rows(frame))
+            inserted = len(frame)
+        if commit:
+            db.commit()
+        return inserted
+
+
+def frame_to_copy_csv(frame: pd.DataFrame) -> io.StringIO:
+    """
+    Serializa el DataFrame en el formato CSV que espera `COPY ... WITH (FORMAT csv)`:
+    NULL como campo vacío sin comillas, fechas ISO y booleanos `True`/`False`.
+    """
+    buf = io.StringIO()
+    frame.to_csv(buf, header=False, index=False, na_rep="", date_format="%Y-%m-%d")
+    buf.seek(0)
+    return buf
+
+
+def _copy_frame(db: Session, frame: pd.DataFrame, *, staging: bool, dedupe: bool = False) -> int:
+    columns = ", ".join(frame.columns)
+    buf = frame_to_copy_csv(frame)
+    # Conexión DBAPI (psycopg2) dentro de la transacción de la sesión
+    raw = db.connection().connection
+    with raw.cursor() as cur:
+        if not staging:
+            cur.copy_expert(f"COPY routes ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+            return cur.rowcount
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            "(LIKE routes INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cur.copy_expert(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+        on_conflict = " ON CONFLICT (fingerprint) DO NOTHING" if dedupe else ""
+        cur.execute(f"INSERT INTO routes ({columns}) SELECT {columns} FROM {STAGING_TABLE}{on_conflict}")
+        return cur.rowcount
+
 
 
 def add_route(db: Session, data: dict) -> Route:
@@ -1,7 +1,9 @@
 from typing import Optional, Any, Dict
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+import math
 import re
 
 # zoneinfo está en stdlib (py>=3.9)
@@ -17,6 +19,10 @@ NULL_TOKENS = {
     "", "N", "NA", "N/A", "NONE", "NULL", "\\N", "-", "--",
     "NAN", "NAN()", "NULL()", "?", "UNKNOWN"
 }
+# Los archivos repiten pocos cientos de zonas y DifUTC: se resuelven una vez por proceso
+UTC_CACHE_SIZE = 4096
+# Clave del contexto de validación: las coordenadas float ya vienen reparadas (`fix_coords`)
+COORDS_FIXED = "coords_fixed"
 
 
 class AirportIn(BaseModel):
@@ -91,57 +97,14 @@ class AirportIn(BaseModel):
     @classmethod
     def _fix_coords(cls, v, info):
         """
-        Repara coordenadas con puntos de miles/decimales corridos.
-        - Si parsea y es plausible: devuelve.
-        - Si parsea y es implausible: corre el decimal a la izquierda hasta entrar en rango.
-        - Si no parsea: reconstruye desde dígitos (A: últimos 6 decimales; B: long con 3 enteros).
-        """
-        if v is None or str(v).strip() == "":
-            return None
+        Repara coordenadas con puntos de miles/decimales corridos (ver `fix_coord`).
 
-        s = str(v).strip().replace(",", ".")
-        limit = 90 if info.field_name == "latitude" else 180
-
-        def plausible(x: float) -> bool:
-            return -limit <= x <= limit
-
-        def reparse_from_digits(raw: str) -> Optional[float]:
-            sign = -1 if raw.startswith("-") else 1
-            digits = "".join(ch for ch in raw if ch.isdigit())
-            if not digits:
-                return None
-            # Candidato A: últimos 6 como fracción (común en datasets)
-            if len(digits) > 6:
-                cand_a = sign * float(f"{digits[:-6]}.{digits[-6:]}")
-            else:
-                cand_a = sign * float(digits)
-            # Candidato B (solo longitudes): 3 dígitos enteros + resto fracción
-            cand_b = None
-            if info.field_name == "longitude" and len(digits) >= 4:
-                cand_b = sign * float(f"{digits[:3]}.{digits[3:] or '0'}")
-            # Elegir el más plausible (si A < 10 y B >= 10 y plausible, preferir B)
-            if cand_b is not None and plausible(cand_b) and (abs(cand_a) < 10 <= abs(cand_b)):
-                return cand_b
-            return cand_a if plausible(cand_a) else (cand_b if (cand_b is not None and plausible(cand_b)) else None)
-
-        # 1) Intento directo
-        try:
-            x = float(s)
-            if plausible(x):
-                return x
-            # 2) Si no es plausible, correr el decimal hacia la izquierda
-            y = x
-            while abs(y) > limit and abs(y) >= 1:
-                y /= 10.0
-            if plausible(y):
-                return y
-            # 3) Fallback: reparsear desde dígitos
-            alt = reparse_from_digits(s)
-            return alt if alt is not None else x
-        except Exception:
-            # 4) No parseó: usar estrategia por dígitos
-            alt = reparse_from_digits(s)
-            return alt
+        Con `context={COORDS_FIXED: True}` los floats se toman tal cual: ya los reparó
+        `fix_coords` para toda la columna. Lo que quedó crudo se repara (o se rechaza) acá.
+        """
+        if isinstance(v, float) and info.context and info.context.get(COORDS_FIXED):
+            return v
+        return fix_coord(v, info.field_name)
 
     @field_validator("latitude")
     @classmethod
@@ -227,8 +190,7 @@ class AirportIn(BaseModel):
         Normaliza DifUTC a float en múltiplos de 15'.
         No consulta otros campos; si no se puede parsear, retorna None y el model_validator intentará tz.
         """
-        d = cls._parse_utc_any(v)
-        return float(d) if d is not None else None
+        return resolve_utc_raw(v)
 
     @model_validator(mode="before")
     @classmethod
@@ -240,25 +202,17 @@ class AirportIn(BaseModel):
         tz  = data.get("TimezoneOlson") or data.get("timezone_olson")
 
         # ¿ya hay algo parseable?
-        parsed = cls._parse_utc_any(dif)
+        parsed = resolve_utc_raw(dif)
         if parsed is not None:
-            data["DifUTC"] = float(parsed)
+            data["DifUTC"] = parsed
             return data
 
         # Fallback desde TZ
-        if tz and ZoneInfo is not None:
-            try:
-                # Fecha fija para evitar líos de DST
-                dt = datetime(2025, 1, 1, 12, 0, 0, tzinfo=ZoneInfo(tz))
-                delta = dt.utcoffset()
-                if delta is not None:
-                    hours = Decimal(delta / timedelta(hours=1))
-                    hours = cls._snap_quarter(hours)
-                    if cls._is_valid_quarter(hours):
-                        data["DifUTC"] = float(hours)
-                        return data
-            except Exception:
-                pass
+        if tz and isinstance(tz, str):
+            hours = resolve_tz_offset(tz)
+            if hours is not None:
+                data["DifUTC"] = hours
+                return data
 
         data["DifUTC"] = None
         return data
@@ -274,4 +228,122 @@ class AirportIn(BaseModel):
             return int(float(s.replace(",", ".")))
         except Exception:
             return None
-        
\ No newline at end of file
+
+
+def fix_coord(v: Any, field_name: str) -> Optional[float]:
+    """
+    Repara coordenadas con puntos de miles/decimales corridos.
+    - Si parsea y es plausible: devuelve.
+    - Si parsea y es implausible: corre el decimal a la izquierda hasta entrar en rango.
+    - Si no parsea: reconstruye desde dígitos (A: últimos 6 decimales; B: long con 3 enteros).
+
+    Args:
+        v (Any): Valor crudo de Latitud/Longitud.
+        field_name (str): "latitude" o "longitude" (define el rango plausible).
+
+    Returns:
+        Optional[float]: Coordenada reparada (puede seguir fuera de rango), o None.
+    """
+    if v is None or str(v).strip() == "":
+        return None
+
+    s = str(v).strip().replace(",", ".")
+    limit = 90 if field_name == "latitude" else 180
+
+    def plausible(x: float) -> bool:
+        return -limit <= x <= limit
+
+    # 1) Intento directo
+    try:
+        x = float(s)
+        if plausible(x):
+            return x
+        # 2) Si no es plausible, correr el decimal hacia la izquierda
+        y = x
+        while abs(y) > limit and abs(y) >= 1 and math.isfinite(y):  # inf no termina nunca
+            y /= 10.0
+        if plausible(y):
+            return y
+        # 3) Fallback: reparsear desde dígitos
+        alt = coord_from_digits(s, field_name)
+        return alt if alt is not None else x
+    except Exception:
+        # 4) No parseó: usar estrategia por dígitos
+        alt = coord_from_digits(s, field_name)
+        return alt
+
+
+def coord_from_digits(raw: str, field_name: str) -> Optional[float]:
+    """
+    Reconstruye una coordenada a partir de sus dígitos.
+
+    Candidato A: los últimos 6 dígitos como fracción (común en datasets).
+    Candidato B (solo longitudes): 3 dígitos enteros + resto fracción.
+    """
+    limit = 90 if field_name == "latitude" else 180
+
+    def plausible(x: float) -> bool:
+        return -limit <= x <= limit
+
+    sign = -1 if raw.startswith("-") else 1
+    digits = "".join(ch for ch in raw if ch.isdigit())
+    if not digits:
+        return None
+    if len(digits) > 6:
+        cand_a = sign * float(f"{digits[:-6]}.{digits[-6:]}")
+    else:
+        cand_a = sign * float(digits)
+    cand_b = None
+    if field_name == "longitude" and len(digits) >= 4:
+        cand_b = sign * float(f"{digits[:3]}.{digits[3:] or '0'}")
+    # Elegir el más plausible (si A < 10 y B >= 10 y plausible, preferir B)
+    if cand_b is not None and plausible(cand_b) and (abs(cand_a) < 10 <= abs(cand_b)):
+        return cand_b
+    return cand_a if plausible(cand_a) else (cand_b if (cand_b is not None and plausible(cand_b)) else None)
+
+
+@lru_cache(maxsize=UTC_CACHE_SIZE)
+def _utc_from_text(s: str) -> Optional[float]:
+    d = AirportIn._parse_utc_any(s)
+    return float(d) if d is not None else None
+
+
+def resolve_utc_raw(raw: Any) -> Optional[float]:
+    """
+    DifUTC crudo → horas en múltiplos de 0.25 (ver `AirportIn._parse_utc_any`), memoizado.
+
+    `_parse_utc_any` solo mira `str(raw)`, así que se cachea por ese texto.
+    """
+    if raw is None:
+        return None
+    return _utc_from_text(str(raw))
+
+
+@lru_cache(maxsize=UTC_CACHE_SIZE)
+def resolve_tz_offset(tz: str) -> Optional[float]:
+    """
+    Zona IANA → offset UTC en horas (snapeado a 15'), memoizado por zona.
+
+    Se usa una fecha fija (1/1/2025 12:00) para evitar líos de DST. Devuelve None
+    si la zona no existe o el offset no es un cuarto de hora válido.
+    """
+    if ZoneInfo is None:
+        return None
+    try:
+        dt = datetime(2025, 1, 1, 12, 0, 0, tzinfo=ZoneInfo(tz))
+        delta = dt.utcoffset()
+    except Exception:
+        return None
+    if delta is None:
+        return None
+    hours = AirportIn._snap_quarter(Decimal(delta / timedelta(hours=1)))
+    return float(hours) if AirportIn._is_valid_quarter(hours) else None
+
+
+def utc_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Aciertos/fallos de los caches de DifUTC y zonas horarias (acumulados en el proceso)."""
+    out = {}
+    for name, fn in (("utc_raw", _utc_from_text), ("timezone", resolve_tz_offset)):
+        info = fn.cache_info()
+        out[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return out
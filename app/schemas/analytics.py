@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from datetime import date
 from typing import Optional
 class AverageOccupancyItem(BaseModel):
@@ -11,11 +11,25 @@ class DomesticAltitudePercentage(BaseModel):
     percentage: float
     
 class ConsecutiveHighOccRoute(BaseModel):
-    first_date: date
-    second_date: date
+    # Primer y último día de la racha (`days` días consecutivos)
+    streak_start: date
+    streak_end: date
+    days: int = 2
     airline: str | None
     destination: str | None = None
     origin: str | None = None
+
+    # Nombres anteriores (cuando la racha era siempre de 2 días); se siguen enviando
+    # para no romper clientes existentes
+    @computed_field(description="Alias de `streak_start` (obsoleto).", json_schema_extra={"deprecated": True})
+    @property
+    def first_date(self) -> date:
+        return self.streak_start
+
+    @computed_field(description="Alias de `streak_end` (obsoleto).", json_schema_extra={"deprecated": True})
+    @property
+    def second_date(self) -> date:
+        return self.streak_end
     
 class TopRouteOut(BaseModel):
     origin_airport_id: int
@@ -3,6 +3,7 @@ from typing import Optional
 from decimal import Decimal, InvalidOperation
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import math
+from app.ingest.dates import parse_date
 
 # Tokens que tratamos como nulos
 NULL_TOKENS = {"", "nan", "NaN", "null", "none", "NULL", "None", "inf", "+inf", "-inf", "Infinity", "-Infinity"}
@@ -119,11 +120,8 @@ class RouteIn(BaseModel):
     @field_validator("flight_date", mode="before")
     @classmethod
     def _date_parse(cls, v):
-        if v is None or str(v).strip() == "":
-            return None
-        import pandas as pd
-        dt = pd.to_datetime(v, errors="coerce", dayfirst=False)
-        return dt.date() if not pd.isna(dt) else None
+        # formatos conocidos con strptime + caché por string; el resto, pandas
+        return parse_date(v)
 
 
 class RouteOut(RouteIn):
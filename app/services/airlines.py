@@ -1,4 +1,5 @@
 # from __future__ import annotations
+from typing import Dict, List
 from sqlalchemy.orm import Session
 from app.repositories import airlines as repo
 
@@ -8,3 +9,5 @@ def ensure_airline(db: Session, *, iata: str | None, icao: str | None, defaults:
 def get_airline_by_codes(db: Session, *, iata: str | None, icao: str | None):
     return repo.get_by_codes(db, iata=iata, icao=icao)
 
+def load_airlines(db: Session, rows: List[dict]) -> Dict[str, int]:
+    return repo.bulk_load(db, rows)
@@ -1,6 +1,15 @@
 # from __future__ import annotations
+from typing import Dict, List
 from sqlalchemy.orm import Session
 from app.repositories.airports import AirportsRepo as repo
+from app.repositories.route_pairs import RoutePairsRepo
 
 def ensure_airport(db: Session, *, iata: str | None, icao: str | None, defaults: dict | None = None):
     return repo.get_or_create(db, iata=iata, icao=icao, defaults=defaults or {})
+
+def upsert_airports(db: Session, rows: List[dict]) -> Dict[str, int]:
+    out = repo.bulk_upsert(db, rows)
+    # País, altitud o coordenadas pueden haber cambiado: recalcular los pares de rutas que los usan
+    RoutePairsRepo.refresh_airports(db, (r["id"] for r in rows if r.get("id") is not None))
+    db.commit()
+    return out
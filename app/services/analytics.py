@@ -1,14 +1,23 @@
 # from __future__ import annotations
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Optional
+from app.core.config import settings
 from app.repositories import analytics as repo
+from app.services.columnar import engine as columnar_engine
+
+
+def _backend():
+    # Mismas funciones (nombres, firmas y resultados) en el repositorio SQL y en el motor columnar
+    return columnar_engine if settings.ANALYTICS_ENGINE == "columnar" else repo
+
 
 def average_occupancy(db: Session, start: date | None, end: date | None):
     rows = repo.average_occupancy_by_airline(db, start=start, end=end)
     return [{ "airline": r[0], "avg_occupancy": float(r[1]) if r[1] is not None else None } for r in rows]
 
 def domestic_altitude_percentage(db: Session, min_occupancy: float):
-    total, over, pct = repo.domestic_altitude_percentage(db, min_occupancy=min_occupancy)
+    total, over, pct = _backend().domestic_altitude_percentage(db, min_occupancy=min_occupancy)
     return {
         "total_high_occupancy_domestic": total,
         "over_1000m_altitude_diff": over,
@@ -20,20 +29,50 @@ def top_routes_by_country(db: Session, country: str, start: date | None, end: da
     return [{ "origin": r[0], "destination": r[1], "flights": int(r[2]) } for r in rows]
 
 
+def airline_occupancy(
+    db: Session,
+    start: date | None = None,
+    end: date | None = None,
+    only_operated: Optional[bool] = None,
+    min_flights: int = 1,
+):
+    return _backend().find_airline_occupancy_orm(
+        db, start=start, end=end, only_operated=only_operated, min_flights=min_flights
+    )
+
+
+def top_routes(
+    db: Session,
+    country: str,
+    start: date | None = None,
+    end: date | None = None,
+    scope: str = "either",
+    limit: int = 5,
+    only_operated: Optional[bool] = None,
+):
+    return _backend().find_top_routes_by_country_orm(
+        db, country=country, start=start, end=end, scope=scope, limit=limit, only_operated=only_operated
+    )
+
+
 def consecutive_high_occupancy_routes(
     db: Session,
     min_occupancy: float = 0.85,
     start: date | None = None,
     end: date | None = None,
+    min_streak: int = 2,
 ):
-    rows = repo.consecutive_high_occupancy_routes(db, min_occupancy=min_occupancy, start=start, end=end)
+    rows = _backend().consecutive_high_occupancy_routes(
+        db, min_occupancy=min_occupancy, start=start, end=end, min_streak=min_streak
+    )
     return [
         {
             "airline": r[0],
             "origin": r[1],
             "destination": r[2],
-            "first_date": r[3],
-            "second_date": r[4],
+            "streak_start": r[3],
+            "streak_end": r[4],
+            "days": int(r[5]),
         }
         for r in rows
     ]
\ No newline at end of file
@@ -0,0 +1,136 @@
+# from __future__ import annotations
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.ingest.airlines_csv import parse_airlines_csv
+from app.ingest.airport_csv import parse_airports_csv
+from app.ingest.bundle import list_members, open_member
+from app.ingest.error_log import ErrorLog
+from app.ingest.routes_csv import iter_routes_csv
+from app.ingest.timings import StageTimer
+from app.services.airlines import load_airlines
+from app.services.airports import upsert_airports
+from app.services.routes import ingest_routes_service
+
+# Chunks de rutas ya parseados que pueden esperar en memoria a que terminen las dimensiones
+BUNDLE_QUEUE_CHUNKS = 4
+_DONE = object()
+
+Chunk = Tuple[pd.DataFrame, List[Dict[str, Any]]]
+
+
+class _RoutesProducer(threading.Thread):
+    """
+    Parsea y valida el archivo de rutas en un thread aparte y deja los chunks en
+    una cola acotada (si el loader va atrás, el parser espera).
+    """
+
+    def __init__(self, path: str, name: str, chunk_size: int):
+        super().__init__(name="bundle-routes-parser", daemon=True)
+        self.path = path
+        self.member = name
+        self.chunk_size = chunk_size
+        self.timer = StageTimer()
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=BUNDLE_QUEUE_CHUNKS)
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        try:
+            with open_member(self.path, self.member) as fh:
+                for chunk in iter_routes_csv(fh, chunk_size=self.chunk_size, timer=self.timer):
+                    if not self._put(chunk):
+                        return
+        except Exception as exc:  # se re-lanza del lado del loader
+            self._put(exc)
+            return
+        self._put(_DONE)
+
+    def _put(self, item: Any) -> bool:
+        while not self._halt.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def chunks(self) -> Iterator[Chunk]:
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def stop(self) -> None:
+        self._halt.set()
+
+
+def ingest_bundle_service(
+    db: Session,
+    path: str,
+    *,
+    chunk_size: int | None = None,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    error_log: Optional[ErrorLog] = None,
+) -> Dict[str, Any]:
+    """
+    Carga un bundle (zip/tar) con aeropuertos, aerolíneas y rutas en una sola ingesta.
+
+    Las dimensiones se cargan primero (aeropuertos y después aerolíneas, como en
+    los endpoints individuales) y las rutas al final, así el chequeo de FKs ve
+    las dimensiones del mismo bundle. Mientras se insertan las dimensiones, un
+    thread ya va leyendo y validando las rutas: los chunks validados esperan en
+    una cola acotada (`BUNDLE_QUEUE_CHUNKS`) y se insertan apenas terminan las
+    dimensiones.
+
+    Cualquiera de los tres archivos puede faltar (por ejemplo, un bundle solo con
+    rutas contra dimensiones ya cargadas).
+
+    Args:
+        db (Session): Sesión de base de datos.
+        path (str): Bundle en disco (ver `app.ingest.bundle`).
+        chunk_size (int | None): Filas por chunk de rutas. Por defecto `settings.INGEST_CHUNK_SIZE`.
+        progress (Callable | None): Avance de la carga de rutas (ver `ingest_routes_service`).
+        error_log (ErrorLog | None): Dónde registrar las rutas rechazadas.
+
+    Returns:
+        dict: {"files": {tipo: resumen de ese archivo (con su nombre en "member")}, "timings": ...}.
+            Los resúmenes son los mismos que devuelven las ingestas individuales.
+    """
+    members = list_members(path)
+    files: Dict[str, Dict[str, Any]] = {}
+    timer = StageTimer()
+
+    producer = None
+    if "routes" in members:
+        producer = _RoutesProducer(path, members["routes"], chunk_size or settings.INGEST_CHUNK_SIZE)
+        producer.start()
+    try:
+        if "airports" in members:
+            with open_member(path, members["airports"]) as fh, timer.stage("airports"):
+                rows = parse_airports_csv(fh)
+                files["airports"] = {"member": members["airports"], "rows": len(rows), **upsert_airports(db, rows)}
+        if "airlines" in members:
+            with open_member(path, members["airlines"]) as fh, timer.stage("airlines"):
+                rows = parse_airlines_csv(fh)
+                files["airlines"] = {"member": members["airlines"], "rows": len(rows), **load_airlines(db, rows)}
+        if producer is not None:
+            with timer.stage("routes"):
+                out = ingest_routes_service(
+                    db, None, frames=producer.chunks(), progress=progress, error_log=error_log
+                )
+            # lectura/validación corrieron en el thread del parser
+            out["timings"] = {**producer.timer.as_dict(), **out["timings"]}
+            files["routes"] = {"member": members["routes"], **out}
+    finally:
+        if producer is not None:
+            producer.stop()
+            producer.join()
+    return {"files": files, "timings": timer.as_dict()}
@@ -0,0 +1,107 @@
+# from __future__ import annotations
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def _normalize(value: Any) -> Hashable:
+    # Fechas como ISO y enums por valor: `2024-01-01` y `date(2024, 1, 1)` son la misma clave
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, float):
+        return round(value, 9)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+class ResultCache:
+    """
+    Caché LRU en proceso para resultados de analítica.
+
+    La clave es (endpoint, parámetros normalizados, versión de datos). La versión
+    se incrementa con `bump_version()` después de cada ingesta exitosa: los
+    resultados anteriores dejan de ser válidos y se descartan.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (endpoint, tuple(sorted((k, _normalize(v)) for k, v in params.items())))
+
+    def get_or_compute(self, endpoint: str, params: Dict[str, Any], compute: Callable[[], T]) -> T:
+        """
+        Devuelve el resultado cacheado o lo calcula con `compute()` y lo guarda.
+
+        Args:
+            endpoint (str): Nombre del endpoint (parte de la clave).
+            params (Dict[str, Any]): Parámetros de la consulta (se normalizan para la clave).
+            compute (Callable): Calcula el resultado si no está en caché.
+
+        Returns:
+            El resultado (el mismo objeto para todos los aciertos de la misma clave).
+        """
+        if self.max_entries <= 0:
+            return compute()
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            version = self.version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+
+        with self._lock:
+            # Si hubo una ingesta mientras se calculaba, el resultado puede ser viejo: no se guarda
+            if version == self.version:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def bump_version(self) -> int:
+        """Marca que cambiaron los datos (ingesta exitosa) y descarta todo lo cacheado."""
+        with self._lock:
+            self.version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            return self.version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "data_version": self.version,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+analytics_cache = ResultCache(settings.ANALYTICS_CACHE_SIZE)
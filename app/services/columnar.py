@@ -0,0 +1,422 @@
+# from __future__ import annotations
+"""
+Motor de analítica en memoria sobre arrays de NumPy.
+
+Carga `routes` en columnas (ids int32, fecha como días desde `DAY_EPOCH` en
+int16, o int32 si alguna fecha no entra, tickets/capacidad int32, operado bool) más arrays de las dimensiones
+(aeropuertos y aerolíneas, indexados por posición) y responde las cuatro
+consultas de analítica con group-bys vectorizados (`bincount`, `unique`,
+`lexsort`), con los mismos resultados y el mismo orden que las versiones SQL de
+`app.repositories.analytics`.
+
+Se activa con `ANALYTICS_ENGINE=columnar`. Se refresca solo cuando cambia la
+versión de datos de `analytics_cache` (cada ingesta): las rutas nuevas se leen
+de forma incremental (`id` mayor al último cargado, por lotes que se pasan a
+arrays antes de leer el siguiente) y las dimensiones se vuelven a leer completas
+(salen de `dimension_cache`).
+"""
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Route
+from app.repositories.analytics import StreakRow
+from app.repositories.dimensions import dimension_cache
+from app.schemas.analytics import AirlineOccupancyOut, TopRouteOut
+from app.services.cache import analytics_cache
+
+DAY_EPOCH = date(2000, 1, 1)
+NULL_INT = np.iinfo(np.int32).min
+LOAD_BATCH_ROWS = 1_000_000
+ALTITUDE_FT_TO_M = 0.3048
+
+@dataclass
+class _Dims:
+    """Dimensiones ordenadas por id; las rutas las referencian por posición (-1 = no existe)."""
+    airport_ids: np.ndarray
+    airport_country: np.ndarray   # código de país (int32, -1 = NULL)
+    airport_altitude: np.ndarray  # float64, NaN = NULL
+    airport_iata: np.ndarray      # object
+    airport_label: np.ndarray     # object: COALESCE(iata, icao, name)
+    countries: Dict[str, int]
+    airline_ids: np.ndarray
+    airline_name: np.ndarray      # object
+
+
+@dataclass
+class _Snapshot:
+    last_id: int
+    recheck: Tuple[int, int]      # (id, filas con id > ese id y <= last_id) del último lote cargado
+    airline_id: np.ndarray        # int32, NULL_INT = NULL
+    origin_id: np.ndarray
+    destination_id: np.ndarray
+    day: np.ndarray               # int16/int32 días desde DAY_EPOCH, mínimo del tipo = NULL
+    tickets: np.ndarray           # int32, NULL_INT = NULL
+    capacity: np.ndarray
+    operated: np.ndarray          # bool
+    dims: _Dims
+    airline_pos: np.ndarray       # int32 posición en dims.airline_ids (-1 si no existe)
+    origin_pos: np.ndarray
+    destination_pos: np.ndarray
+
+    @property
+    def null_day(self) -> int:
+        return int(np.iinfo(self.day.dtype).min)
+
+    def occupancy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ocupación float64, máscara de válidas); misma regla que `routes.occupancy`."""
+        valid = (self.tickets != NULL_INT) & (self.capacity != NULL_INT) & (self.capacity > 0)
+        occ = np.zeros(len(self.tickets), dtype=np.float64)
+        np.divide(self.tickets, self.capacity, out=occ, where=valid)
+        return occ, valid
+
+
+_ROUTE_COLUMNS = [
+    Route.id, Route.airline_id, Route.origin_airport_id, Route.destination_airport_id,
+    Route.flight_date, Route.tickets_sold, Route.capacity, Route.operated_carrier,
+]
+
+
+_COLUMNS = ["airline_id", "origin_id", "destination_id", "day", "tickets", "capacity", "operated"]
+
+
+def _int_column(s: pd.Series) -> np.ndarray:
+    return pd.to_numeric(s, errors="coerce").fillna(NULL_INT).to_numpy(dtype=np.int64).astype(np.int32)
+
+
+def _narrow_days(days: np.ndarray, null: np.ndarray) -> np.ndarray:
+    """int16 si todas las fechas entran (±89 años de `DAY_EPOCH`), si no int32; NULL = mínimo del tipo."""
+    valid = days[~null]
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if len(valid) == 0 or (valid.min() > info.min and valid.max() <= info.max):
+            return np.where(null, info.min, days).astype(dtype)
+    raise ValueError("Fecha fuera de rango para el motor columnar")
+
+
+def _day_column(s: pd.Series) -> np.ndarray:
+    # datetime64[D] cubre cualquier `date` (pandas en ns solo llega de 1677 a 2262)
+    dates = np.array(s.tolist(), dtype="datetime64[D]")
+    null = np.isnat(dates)
+    days = dates.view("int64") - (DAY_EPOCH - date(1970, 1, 1)).days
+    return _narrow_days(days, null)
+
+
+def _concat_days(parts: List[np.ndarray]) -> np.ndarray:
+    # Si algún lote necesitó int32, se ensanchan también los int16 (NULL = mínimo del tipo)
+    if not parts:
+        return np.empty(0, dtype=np.int16)
+    dtype = np.result_type(*parts)
+    null = np.iinfo(dtype).min
+    return np.concatenate([
+        d if d.dtype == dtype else np.where(d == np.iinfo(d.dtype).min, null, d).astype(dtype) for d in parts
+    ])
+
+
+def _concat_column(name: str, parts: List[np.ndarray]) -> np.ndarray:
+    if name == "day":
+        return _concat_days(parts)
+    if not parts:
+        return np.empty(0, dtype=bool if name == "operated" else np.int32)
+    return np.concatenate(parts)
+
+
+def _positions(ids: np.ndarray, sorted_ids: np.ndarray) -> np.ndarray:
+    """Posición de cada id en `sorted_ids`, o -1 si no está."""
+    if len(sorted_ids) == 0:
+        return np.full(len(ids), -1, dtype=np.int32)
+    pos = np.searchsorted(sorted_ids, ids)
+    pos = np.minimum(pos, len(sorted_ids) - 1)
+    return np.where(sorted_ids[pos] == ids, pos, -1).astype(np.int32)
+
+
+def _load_dims(db: Session) -> _Dims:
+    # Mismas dimensiones que usan las consultas SQL (`dimension_cache`), pasadas a arrays
+    dims = dimension_cache.get(db)
+    countries: Dict[str, int] = {}
+    airports = list(dims.airports.values())
+    airlines = list(dims.airlines.values())
+    return _Dims(
+        airport_ids=np.fromiter(dims.airports.keys(), dtype=np.int64, count=len(airports)),
+        airport_country=np.array(
+            [-1 if a.country is None else countries.setdefault(a.country, len(countries)) for a in airports],
+            dtype=np.int32,
+        ),
+        airport_altitude=np.array(
+            [np.nan if a.altitude_ft is None else a.altitude_ft for a in airports], dtype=np.float64
+        ),
+        airport_iata=np.array([a.iata for a in airports], dtype=object),
+        airport_label=np.array([a.label for a in airports], dtype=object),
+        countries=countries,
+        airline_ids=np.fromiter(dims.airlines.keys(), dtype=np.int64, count=len(airlines)),
+        airline_name=np.array([a.name for a in airlines], dtype=object),
+    )
+
+
+def _route_arrays(rows: List) -> Dict[str, np.ndarray]:
+    # Un lote de filas → arrays angostos; los objetos de Python del lote se liberan enseguida
+    frame = pd.DataFrame(rows, columns=[c.key for c in _ROUTE_COLUMNS])
+    return {
+        "airline_id": _int_column(frame["airline_id"]),
+        "origin_id": _int_column(frame["origin_airport_id"]),
+        "destination_id": _int_column(frame["destination_airport_id"]),
+        "day": _day_column(frame["flight_date"]),
+        "tickets": _int_column(frame["tickets_sold"]),
+        "capacity": _int_column(frame["capacity"]),
+        "operated": frame["operated_carrier"].astype(bool).to_numpy(),
+    }
+
+
+def _load_routes(db: Session, after_id: int) -> Tuple[int, Dict[str, List[np.ndarray]], Tuple[int, int]]:
+    """
+    Lee de a `LOAD_BATCH_ROWS` las rutas con id > `after_id`.
+
+    Cada lote se pasa a arrays de NumPy antes de leer el siguiente, así en memoria
+    hay a lo sumo un lote como objetos de Python.
+
+    Returns:
+        Tuple: último id leído, arrays por columna (uno por lote, sin concatenar) y
+            `(id anterior al último lote, filas del último lote)` para `_Snapshot.recheck`.
+    """
+    parts: Dict[str, List[np.ndarray]] = {}
+    last_id = after_id
+    recheck = (after_id, 0)
+    while True:
+        rows = db.execute(
+            select(*_ROUTE_COLUMNS).where(Route.id > last_id).order_by(Route.id).limit(LOAD_BATCH_ROWS)
+        ).all()
+        if not rows:
+            break
+        recheck = (last_id, len(rows))
+        last_id = int(rows[-1].id)
+        for k, v in _route_arrays(rows).items():
+            parts.setdefault(k, []).append(v)
+        if len(rows) < LOAD_BATCH_ROWS:
+            break
+    return last_id, parts, recheck
+
+
+class ColumnarEngine:
+    """Rutas y dimensiones en arrays de NumPy; ver el docstring del módulo."""
+
+    def __init__(self):
+        # (versión de datos, arrays): se leen y se reemplazan juntos
+        self._state: Optional[Tuple[int, _Snapshot]] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ carga
+    def snapshot(self, db: Session) -> _Snapshot:
+        """Devuelve los arrays vigentes, refrescándolos si hubo una ingesta desde la última carga."""
+        version = analytics_cache.version
+        state = self._state
+        if state is not None and state[0] == version:
+            return state[1]
+        with self._lock:
+            state = self._state
+            if state is None or state[0] != version:
+                state = (version, self._refresh(db, state[1] if state is not None else None))
+                self._state = state
+            return state[1]
+
+    def _refresh(self, db: Session, prev: Optional[_Snapshot]) -> _Snapshot:
+        dims = _load_dims(db)
+        last_id, new, recheck = _load_routes(db, prev.last_id if prev is not None else 0)
+        if prev is not None:
+            # Un INSERT con id menor que commiteó tarde no entra por `id > last_id`. Se cuentan
+            # solo las rutas del último lote cargado antes (rango de la PK, no toda la tabla):
+            # si no coincide, se recarga todo
+            after, rows = prev.recheck
+            late = select(func.count()).select_from(Route).where(Route.id > after, Route.id <= prev.last_id)
+            if db.scalar(late) != rows:
+                return self._refresh(db, None)
+            if not new:
+                recheck = prev.recheck
+            new = {k: [getattr(prev, k), *new.get(k, [])] for k in _COLUMNS}
+        cols = {k: _concat_column(k, new.get(k, [])) for k in _COLUMNS}
+        return _Snapshot(
+            last_id=last_id,
+            recheck=recheck,
+            dims=dims,
+            airline_pos=_positions(cols["airline_id"], dims.airline_ids),
+            origin_pos=_positions(cols["origin_id"], dims.airport_ids),
+            destination_pos=_positions(cols["destination_id"], dims.airport_ids),
+            **cols,
+        )
+
+    # ------------------------------------------------------------ filtros
+    @staticmethod
+    def _date_mask(snap: _Snapshot, start: Optional[date], end: Optional[date]) -> np.ndarray:
+        mask = np.ones(len(snap.day), dtype=bool)
+        if start is not None:
+            mask &= (snap.day != snap.null_day) & (snap.day >= (start - DAY_EPOCH).days)
+        if end is not None:
+            mask &= (snap.day != snap.null_day) & (snap.day <= (end - DAY_EPOCH).days)
+        return mask
+
+    @staticmethod
+    def _operated_mask(snap: _Snapshot, only_operated: Optional[bool]) -> np.ndarray | bool:
+        if only_operated is None:
+            return True
+        return snap.operated if only_operated else ~snap.operated
+
+    # ---------------------------------------------------------- consultas
+    def find_airline_occupancy_orm(
+        self,
+        db: Session,
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        only_operated: Optional[bool] = None,
+        min_flights: int = 1,
+    ) -> List[AirlineOccupancyOut]:
+        """Igual que `repositories.analytics.find_airline_occupancy_orm`."""
+        snap = self.snapshot(db)
+        mask = (snap.airline_pos >= 0) & self._date_mask(snap, start, end) & self._operated_mask(snap, only_operated)
+        pos = snap.airline_pos[mask]
+        n = len(snap.dims.airline_ids)
+        flights = np.bincount(pos, minlength=n)
+        tickets = np.bincount(pos, weights=np.where(snap.tickets[mask] == NULL_INT, 0, snap.tickets[mask]), minlength=n)
+        capacity = np.bincount(pos, weights=np.where(snap.capacity[mask] == NULL_INT, 0, snap.capacity[mask]), minlength=n)
+
+        keep = np.flatnonzero(flights >= max(min_flights, 1))
+        occ = np.full(len(keep), np.nan)
+        np.divide(tickets[keep], capacity[keep], out=occ, where=capacity[keep] != 0)
+        # occupancy DESC NULLS LAST, flights DESC, airline_id
+        order = np.lexsort((snap.dims.airline_ids[keep], -flights[keep], -np.nan_to_num(occ), np.isnan(occ)))
+        return [
+            AirlineOccupancyOut(
+                airline_id=int(snap.dims.airline_ids[keep[i]]),
+                airline=snap.dims.airline_name[keep[i]],
+                flights=int(flights[keep[i]]),
+                tickets=int(tickets[keep[i]]),
+                capacity=int(capacity[keep[i]]),
+                occupancy=0.0 if np.isnan(occ[i]) else float(occ[i]),
+            )
+            for i in order
+        ]
+
+    def domestic_altitude_percentage(self, db: Session, min_occupancy: float = 0.85) -> Tuple[int, int, float]:
+        """Igual que `repositories.analytics.domestic_altitude_percentage`."""
+        snap = self.snapshot(db)
+        dims = snap.dims
+        occ, valid = snap.occupancy()
+        mask = valid & (snap.origin_pos >= 0) & (snap.destination_pos >= 0)
+        mask[mask] = occ[mask] >= min_occupancy
+        o, d = snap.origin_pos[mask], snap.destination_pos[mask]
+        co, cd = dims.airport_country[o], dims.airport_country[d]
+        ao, ad = dims.airport_altitude[o], dims.airport_altitude[d]
+        domestic = (co >= 0) & (co == cd) & ~np.isnan(ao) & ~np.isnan(ad)
+        total = int(domestic.sum())
+        over = int((np.abs((ao[domestic] - ad[domestic]) * ALTITUDE_FT_TO_M) > 1000).sum())
+        pct = (over / total * 100.0) if total else 0.0
+        return total, over, pct
+
+    def find_top_routes_by_country_orm(
+        self,
+        db: Session,
+        *,
+        country: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        scope: str = "either",
+        limit: int = 5,
+        only_operated: Optional[bool] = None,
+    ) -> List[TopRouteOut]:
+        """Igual que `repositories.analytics.find_top_routes_by_country_orm`."""
+        snap = self.snapshot(db)
+        dims = snap.dims
+        code = dims.countries.get(country)
+        if code is None:
+            return []
+        # Las rutas sin aerolínea no entran en `route_daily_agg`
+        mask = (snap.airline_id != NULL_INT) & (snap.origin_pos >= 0) & (snap.destination_pos >= 0)
+        mask &= self._date_mask(snap, start, end) & self._operated_mask(snap, only_operated)
+        in_origin = dims.airport_country[snap.origin_pos] == code
+        in_dest = dims.airport_country[snap.destination_pos] == code
+        if scope == "origin":
+            mask &= in_origin
+        elif scope == "destination":
+            mask &= in_dest
+        else:
+            mask &= in_origin | in_dest
+
+        n = np.int64(len(dims.airport_ids))
+        keys, counts = np.unique(snap.origin_pos[mask].astype(np.int64) * n + snap.destination_pos[mask], return_counts=True)
+        o, d = keys // n, keys % n
+        # flights DESC, origin_airport_id, destination_airport_id (posición = orden por id)
+        order = np.lexsort((d, o, -counts))[:limit]
+        return [
+            TopRouteOut(
+                origin_airport_id=int(dims.airport_ids[o[i]]),
+                destination_airport_id=int(dims.airport_ids[d[i]]),
+                origin=dims.airport_label[o[i]],
+                destination=dims.airport_label[d[i]],
+                flights=int(counts[i]),
+            )
+            for i in order
+        ]
+
+    def consecutive_high_occupancy_routes(
+        self,
+        db: Session,
+        min_occupancy: float = 0.85,
+        start: date | None = None,
+        end: date | None = None,
+        min_streak: int = 2,
+    ) -> List[StreakRow]:
+        """Igual que `repositories.analytics.consecutive_high_occupancy_routes`."""
+        snap = self.snapshot(db)
+        dims = snap.dims
+        occ, valid = snap.occupancy()
+        mask = valid & (snap.airline_pos >= 0) & (snap.origin_pos >= 0) & (snap.destination_pos >= 0)
+        mask &= (snap.day != snap.null_day) & self._date_mask(snap, start, end)
+        mask[mask] = occ[mask] >= min_occupancy
+
+        a, o, d = snap.airline_pos[mask], snap.origin_pos[mask], snap.destination_pos[mask]
+        day = snap.day[mask].astype(np.int32)
+        order = np.lexsort((day, d, o, a))
+        a, o, d, day = a[order], o[order], d[order], day[order]
+        # Días distintos por ruta
+        distinct = np.ones(len(day), dtype=bool)
+        distinct[1:] = (a[1:] != a[:-1]) | (o[1:] != o[:-1]) | (d[1:] != d[:-1]) | (day[1:] != day[:-1])
+        a, o, d, day = a[distinct], o[distinct], d[distinct], day[distinct]
+        if len(day) == 0:
+            return []
+
+        # Una racha empieza donde cambia la ruta o el día no es el siguiente del anterior
+        starts = np.ones(len(day), dtype=bool)
+        starts[1:] = (a[1:] != a[:-1]) | (o[1:] != o[:-1]) | (d[1:] != d[:-1]) | (day[1:] != day[:-1] + 1)
+        first = np.flatnonzero(starts)
+        last = np.append(first[1:], len(day)) - 1
+        length = last - first + 1
+        keep = length >= min_streak
+        first, last, length = first[keep], last[keep], length[keep]
+
+        def none_last(v):
+            return (v is None, v or "")
+
+        # Mismo orden que la consulta SQL: nombres con NULLS LAST, inicio de la racha y desempate por ids
+        keyed = []
+        for f, l, n in zip(first, last, length):
+            row = StreakRow(
+                dims.airline_name[a[f]],
+                dims.airport_iata[o[f]],
+                dims.airport_iata[d[f]],
+                DAY_EPOCH + timedelta(days=int(day[f])),
+                DAY_EPOCH + timedelta(days=int(day[l])),
+                int(n),
+            )
+            ids = (int(dims.airline_ids[a[f]]), int(dims.airport_ids[o[f]]), int(dims.airport_ids[d[f]]))
+            keyed.append(((none_last(row.airline), none_last(row.origin), none_last(row.destination), row.streak_start, ids), row))
+        keyed.sort(key=lambda kr: kr[0])
+        rows = [row for _, row in keyed]
+        return rows
+
+
+engine = ColumnarEngine()
@@ -0,0 +1,370 @@
+# from __future__ import annotations
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.ingest.airlines_csv import parse_airlines_csv
+from app.ingest.airport_csv import parse_airports_csv
+from app.ingest.compression import detect_compression, open_decompressed
+from app.ingest.error_log import ErrorLog
+from app.ingest.fingerprints import copy_with_sha256
+from app.ingest.timings import StageTimer
+from app.repositories.checkpoints import CheckpointsRepo
+from app.repositories.dimensions import dimension_cache
+from app.repositories.ingest_files import IngestFilesRepo
+from app.schemas.airports import utc_cache_stats
+from app.services.airlines import load_airlines
+from app.services.airports import upsert_airports
+from app.services.bundle import ingest_bundle_service
+from app.services.cache import analytics_cache
+from app.services.routes import SKIPPED_PREVIEW_SIZE, ingest_routes_service
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+# Tipos en los que re-enviar un archivo ya cargado no hace nada. Solo rutas: aeropuertos y
+# aerolíneas son "último gana", así que volver a subir un archivo viejo tiene que reaplicarlo
+DEDUP_KINDS = ("routes",)
+# Cada cuánto se buscan spools/checkpoints vencidos (ver `JobManager.purge_expired`)
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class IngestJob:
+    """Estado de un job de ingesta (vive en memoria del proceso)."""
+
+    def __init__(self, kind: str, path: str, filename: str | None, options: Dict[str, Any], sha256: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.path = path
+        self.filename = filename
+        self.sha256 = sha256
+        self.options = options
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.rows_processed = 0
+        self.rows_rejected = 0
+        self.result: Dict[str, Any] | None = None
+        self.error: str | None = None
+        # NDJSON con las filas rechazadas (solo rutas)
+        self.error_log_path: str | None = None
+        # Rutas: hay checkpoint en la base, si falla se puede reanudar (el spool se conserva)
+        self.resumable = False
+        self.resumed_from_row: int | None = None
+
+    def progress(self, stats: Dict[str, int]) -> None:
+        self.rows_processed = stats.get("rows", self.rows_processed)
+        self.rows_rejected = stats.get("skipped", self.rows_rejected)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "rows_processed": self.rows_processed,
+            "rows_rejected": self.rows_rejected,
+            "rows_per_sec": round(self.rows_processed / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+            "has_error_log": self.error_log_path is not None,
+            "resumable": self.status == FAILED and self.resumable,
+            "resumed_from_row": self.resumed_from_row,
+            "result": self.result,
+        }
+
+
+def _run_routes(db: Session, fileobj, job: IngestJob) -> Dict[str, Any]:
+    cp = CheckpointsRepo.get(db, job.id) or CheckpointsRepo.create(
+        db, job.id, kind=job.kind, path=job.path, filename=job.filename, sha256=job.sha256, options=job.options
+    )
+    job.resumable = True
+    job.error_log_path = os.path.join(settings.INGEST_ERROR_DIR, f"{job.id}.ndjson")
+    with ErrorLog(job.error_log_path, preview_size=SKIPPED_PREVIEW_SIZE, append=cp.rows_done > 0) as errors:
+        out = ingest_routes_service(
+            db,
+            fileobj,
+            chunk_size=job.options.get("chunk_size"),
+            progress=job.progress,
+            content_type=job.options.get("content_type"),
+            error_log=errors,
+            checkpoint=cp,
+        )
+    CheckpointsRepo.delete(db, cp)
+    return out
+
+
+def _run_airports(db: Session, fileobj, job: IngestJob) -> Dict[str, Any]:
+    before = utc_cache_stats()
+    timer = StageTimer()
+    rows = parse_airports_csv(fileobj, content_type=job.options.get("content_type"), timer=timer)
+    job.progress({"rows": len(rows)})
+    with timer.stage("insert"):
+        out = upsert_airports(db, rows)
+    out["timings"] = timer.as_dict()
+    out["inserted_or_existing"] = out["inserted"] + out["updated"]
+    # aciertos/fallos de los caches de DifUTC/zona durante este archivo
+    out["utc_cache"] = {
+        name: {k: v - before[name][k] for k, v in stats.items() if k != "size"}
+        for name, stats in utc_cache_stats().items()
+    }
+    return out
+
+
+def _run_airlines(db: Session, fileobj, job: IngestJob) -> Dict[str, Any]:
+    timer = StageTimer()
+    rows = parse_airlines_csv(fileobj, content_type=job.options.get("content_type"), timer=timer)
+    job.progress({"rows": len(rows)})
+    with timer.stage("insert"):
+        out = load_airlines(db, rows)
+    out["timings"] = timer.as_dict()
+    out["inserted_or_existing"] = out["inserted"] + out["existing"]
+    return out
+
+
+def _run_bundle(db: Session, fileobj, job: IngestJob) -> Dict[str, Any]:
+    # El bundle se abre por ruta: cada miembro se lee con su propio handle
+    job.error_log_path = os.path.join(settings.INGEST_ERROR_DIR, f"{job.id}.ndjson")
+    with ErrorLog(job.error_log_path, preview_size=SKIPPED_PREVIEW_SIZE) as errors:
+        out = ingest_bundle_service(
+            db, job.path, chunk_size=job.options.get("chunk_size"), progress=job.progress, error_log=errors
+        )
+    out["inserted"] = sum(f.get("inserted", 0) for f in out["files"].values())
+    return out
+
+
+RUNNERS: Dict[str, Callable[[Session, Any, IngestJob], Dict[str, Any]]] = {
+    "routes": _run_routes,
+    "airports": _run_airports,
+    "airlines": _run_airlines,
+    "bundle": _run_bundle,
+}
+
+
+class JobManager:
+    """
+    Cola de ingesta en proceso: un `ThreadPoolExecutor` que procesa los archivos
+    spooleados a disco, sin broker externo. Cada job usa su propia sesión de DB.
+    """
+
+    def __init__(self, workers: int, session_factory: Callable[[], Session] = SessionLocal):
+        self._workers = workers
+        self._session_factory = session_factory
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: Dict[str, IngestJob] = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="ingest")
+            return self._executor
+
+    def submit(
+        self, kind: str, path: str, *, filename: str | None = None, sha256: str | None = None, **options
+    ) -> IngestJob:
+        job = IngestJob(kind, path, filename, options, sha256)
+        with self._lock:
+            self._jobs[job.id] = job
+            purge = time.time() - self._last_purge >= PURGE_INTERVAL_SECONDS
+            if purge:
+                self._last_purge = time.time()
+        if purge:
+            # El primer job después de arrancar (y después uno por hora) limpia lo vencido
+            self._pool().submit(self.purge_expired)
+        self._pool().submit(self._run, job)
+        return job
+
+    def purge_expired(self, max_age_hours: float | None = None) -> Dict[str, int]:
+        """
+        Borra lo que dejaron los jobs fallidos que nadie reanudó a tiempo.
+
+        Un checkpoint sin avance hace más de `max_age_hours` se borra junto con su
+        archivo spooleado (ese job ya no se puede reanudar). También se borran los
+        archivos sueltos del spool con esa antigüedad (por ejemplo, de un job que
+        se cortó por un reinicio) y los NDJSON de filas rechazadas de
+        `INGEST_ERROR_DIR` que no se tocan hace ese tiempo. Nunca se toca lo de un
+        job en cola o en curso, ni el log de un checkpoint vigente.
+
+        Los jobs terminados hace más de ese tiempo (con su `result`) se sacan de
+        memoria: `get` deja de encontrarlos.
+
+        Args:
+            max_age_hours (float | None): Antigüedad mínima. Por defecto
+                `settings.INGEST_RETENTION_HOURS`.
+
+        Returns:
+            Dict[str, int]: {"jobs": J, "checkpoints": N, "spool_files": M, "error_logs": K} borrados.
+        """
+        hours = settings.INGEST_RETENTION_HOURS if max_age_hours is None else max_age_hours
+        cutoff = time.time() - hours * 3600
+        with self._lock:
+            finished = [
+                j.id for j in self._jobs.values()
+                if j.status in (SUCCEEDED, FAILED) and j.finished_at is not None and j.finished_at < cutoff
+            ]
+            for job_id in finished:
+                del self._jobs[job_id]
+            active = [j for j in self._jobs.values() if j.status in (QUEUED, RUNNING)]
+        active_ids = {j.id for j in active}
+        keep = {os.path.abspath(j.path) for j in active}
+        keep_logs = set(active_ids)
+        removed = {"jobs": len(finished), "checkpoints": 0, "spool_files": 0, "error_logs": 0}
+
+        db = self._session_factory()
+        try:
+            for cp in CheckpointsRepo.all(db):
+                updated = cp.updated_at
+                if updated is not None and updated.tzinfo is None:
+                    updated = updated.replace(tzinfo=timezone.utc)  # SQLite no guarda la zona
+                if cp.job_id in active_ids or (updated is not None and updated.timestamp() >= cutoff):
+                    keep.add(os.path.abspath(cp.path))
+                    keep_logs.add(cp.job_id)
+                    continue
+                _remove_file(cp.path)
+                CheckpointsRepo.delete(db, cp)
+                removed["checkpoints"] += 1
+        finally:
+            db.close()
+
+        if os.path.isdir(settings.INGEST_SPOOL_DIR):
+            for entry in os.scandir(settings.INGEST_SPOOL_DIR):
+                if entry.is_file() and os.path.abspath(entry.path) not in keep and entry.stat().st_mtime < cutoff:
+                    _remove_file(entry.path)
+                    removed["spool_files"] += 1
+        if os.path.isdir(settings.INGEST_ERROR_DIR):
+            for entry in os.scandir(settings.INGEST_ERROR_DIR):
+                job_id, ext = os.path.splitext(entry.name)
+                if ext == ".ndjson" and job_id not in keep_logs and entry.stat().st_mtime < cutoff:
+                    _remove_file(entry.path)
+                    removed["error_logs"] += 1
+        if any(removed.values()):
+            logger.info("Limpieza de ingesta: %s", removed)
+        return removed
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    def resume(self, job_id: str) -> Optional[IngestJob]:
+        """
+        Vuelve a encolar un job de rutas que no terminó, desde su último checkpoint.
+
+        Funciona también después de reiniciar el proceso: el checkpoint y el archivo
+        spooleado sobreviven. El job conserva su id.
+
+        Returns:
+            IngestJob | None: El job reencolado, o None si no hay checkpoint para ese id.
+
+        Raises:
+            ValueError: Si el job sigue en curso o el archivo spooleado ya no existe.
+        """
+        current = self._jobs.get(job_id)
+        if current is not None and current.status in (QUEUED, RUNNING):
+            raise ValueError("El job sigue en curso")
+        db = self._session_factory()
+        try:
+            cp = CheckpointsRepo.get(db, job_id)
+            if cp is None:
+                return None
+            if not os.path.exists(cp.path):
+                raise ValueError("El archivo spooleado ya no existe: hay que volver a subirlo")
+            job = IngestJob(cp.kind, cp.path, cp.filename, dict(cp.options or {}), cp.sha256)
+            job.id = cp.job_id
+            job.resumed_from_row = cp.rows_done
+        finally:
+            db.close()
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool().submit(self._run, job)
+        return job
+
+    def _run(self, job: IngestJob) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        db = self._session_factory()
+        touched = False
+        try:
+            dedup = job.sha256 is not None and job.kind in DEDUP_KINDS
+            previous = IngestFilesRepo.get(db, job.kind, job.sha256) if dedup else None
+            if previous is not None:
+                # Mismo contenido ya ingerido con éxito: no se vuelve a procesar
+                job.result = {
+                    "duplicate_file": True,
+                    "previous_filename": previous.filename,
+                    "previous_rows_inserted": previous.rows_inserted,
+                    "inserted": 0,
+                }
+            else:
+                with open(job.path, "rb") as fileobj:
+                    # .gz/.zst: se descomprime a medida que el parser lee (nunca entero a disco)
+                    compression = detect_compression(
+                        fileobj, filename=job.filename, content_encoding=job.options.get("content_encoding")
+                    )
+                    if compression:
+                        fileobj = open_decompressed(fileobj, compression)
+                    touched = True
+                    job.result = RUNNERS[job.kind](db, fileobj, job)
+                if dedup:
+                    IngestFilesRepo.record(
+                        db, job.kind, job.sha256, filename=job.filename, rows_inserted=job.result.get("inserted")
+                    )
+            status = SUCCEEDED
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Falló el job de ingesta %s (%s)", job.id, job.kind)
+            status = FAILED
+            job.error = f"{type(exc).__name__}: {exc}"
+        db.close()
+        if touched:
+            # Cambiaron los datos (aunque haya fallado, pueden haber quedado chunks commiteados):
+            # los resultados de analítica cacheados ya no valen, y las dimensiones se vuelven a leer
+            dimension_cache.invalidate()
+            analytics_cache.bump_version()
+        # Si falló con checkpoint, el spool queda para poder reanudar (hasta `purge_expired`)
+        if not (status == FAILED and job.resumable):
+            _remove_file(job.path)
+        # El estado final se publica recién con el spool ya limpio
+        job.finished_at = time.time()
+        job.status = status
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def spool_upload(fileobj, *, suffix: str = "") -> Tuple[str, str]:
+    """
+    Copia el upload a un archivo en `settings.INGEST_SPOOL_DIR`.
+
+    Es I/O bloqueante: desde un endpoint `async` hay que llamarla en el threadpool.
+
+    Returns:
+        Tuple[str, str]: ruta del archivo y SHA-256 (hex) del contenido.
+    """
+    os.makedirs(settings.INGEST_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(settings.INGEST_SPOOL_DIR, f"{uuid.uuid4().hex}{suffix}")
+    with open(path, "wb") as out:
+        sha256 = copy_with_sha256(fileobj, out)
+    return path, sha256
+
+
+jobs = JobManager(settings.INGEST_WORKERS)
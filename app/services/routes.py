@@ -1,46 +1,173 @@
 # app/services/routes_service.py
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
 from sqlalchemy.orm import Session
 
-from app.ingest.routes_csv import parse_routes_csv
+from app.core.config import settings
+from app.ingest.error_log import ErrorLog
+from app.ingest.fingerprints import route_fingerprints
+from app.ingest.fk_check import IdSet, filter_orphans
+from app.ingest.parallel import iter_routes_parallel
+from app.ingest.readers import CSV, detect_format
+from app.ingest.routes_csv import ByteCursor, file_path, iter_routes_csv
+from app.ingest.timings import StageTimer
+from app.models import IngestCheckpoint
+from app.repositories.airlines import AirlinesRepo
+from app.repositories.airports import AirportsRepo
+from app.repositories.checkpoints import CheckpointsRepo
+from app.repositories.route_daily_agg import RouteDailyAggRepo
+from app.repositories.route_pairs import RoutePairsRepo
 from app.repositories.routes import RoutesRepo
-from app.models import Route
 
+# Cantidad máxima de errores que se devuelven en el resumen
+SKIPPED_PREVIEW_SIZE = 10
 
-def ingest_routes_service(db: Session, fileobj) -> Dict:
+
+def ingest_routes_service(
+    db: Session,
+    fileobj,
+    *,
+    chunk_size: int | None = None,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    workers: int | None = None,
+    content_type: str | None = None,
+    error_log: Optional[ErrorLog] = None,
+    checkpoint: Optional[IngestCheckpoint] = None,
+    frames: Optional[Iterable[Tuple[pd.DataFrame, List[Dict[str, Any]]]]] = None,
+) -> Dict:
     """
-    Procesa un archivo CSV de rutas y realiza la inserción en la base de datos.
+    Procesa un archivo CSV de rutas por chunks y los inserta en la base de datos.
+
+    El flujo es, para cada chunk de `chunk_size` filas:
+      1. Leer y validar el chunk con `iter_routes_csv` (validación por columnas,
+         devuelve un DataFrame con las rutas válidas + errores).
+      2. Descartar las rutas cuyas aerolíneas/aeropuertos no existen (`filter_orphans`,
+         contra los ids cargados una sola vez al inicio) con motivo "orphan_fk".
+      3. Calcular la huella de cada ruta (`route_fingerprints`); las repetidas,
+         dentro del archivo o ya cargadas antes, se descartan en el INSERT.
+      4. Cargar las rutas válidas con `RoutesRepo.load_frame` (COPY en Postgres,
+         INSERT multi-fila en SQLite).
+      5. Recalcular `route_daily_agg` para las claves (aerolínea, origen, destino,
+         fecha, operado) del chunk y hacer commit.
+
+    El archivo puede ser CSV, Parquet o Arrow IPC (se detecta por la firma o por
+    `content_type`); los formatos columnares se leen por lotes de `chunk_size` filas.
+
+    Con `workers > 1` y un CSV en disco (los uploads spooleados de los jobs),
+    el paso 1 se hace en paralelo con `iter_routes_parallel`: cada proceso valida
+    un rango de bytes de `settings.INGEST_PARSE_BLOCK_BYTES` y los chunks llegan
+    en el orden del archivo. En ese modo `chunk_size` no se usa.
+
+    Con `checkpoint`, el avance (filas procesadas y contadores) se guarda en la
+    misma transacción que cada chunk, y si el checkpoint ya tiene avance se
+    reanuda desde ahí: los contadores del resumen incluyen los del intento
+    anterior. En un CSV sin comprimir el checkpoint guarda también el byte donde
+    termina el chunk y se retoma con `seek`; en los demás casos se saltean las
+    filas ya procesadas.
+
+    Con `frames` se saltea el paso 1: los chunks ya validados llegan de afuera
+    (por ejemplo, de un thread que parsea mientras se cargan las dimensiones,
+    ver `ingest_bundle_service`) y `fileobj` no se usa.
 
-    El flujo es:
-      1. Parsear el archivo usando `parse_routes_csv`, que devuelve una lista de objetos
-         `RouteIn` válidos y una lista de errores de parseo.
-      2. Convertir los objetos válidos a instancias del modelo SQLAlchemy `Route`.
-      3. Insertar las filas en la base de datos utilizando `RoutesRepo.bulk_insert`.
-      4. Devolver un resumen con las métricas de la operación.
+    Solo se mantiene en memoria el chunk actual, los contadores de errores por
+    motivo y los primeros errores para el preview, así el consumo de memoria no
+    depende del tamaño del archivo. El detalle de cada fila rechazada se escribe
+    en `error_log` (NDJSON en disco), si se pasa.
 
     Args:
         db (Session): Sesión de base de datos inyectada.
         fileobj (IO): Archivo CSV abierto en modo lectura (generalmente `UploadFile.file`).
+        chunk_size (int | None): Filas por chunk. Por defecto `settings.INGEST_CHUNK_SIZE`.
+        progress (Callable | None): Se llama después de cada chunk commiteado con
+            {"rows": filas leídas, "inserted": ..., "skipped": ...} acumulados.
+        workers (int | None): Procesos de parseo. Por defecto `settings.INGEST_PARSE_WORKERS`.
+        content_type (str | None): Content type del upload, si se conoce.
+        error_log (ErrorLog | None): Dónde registrar las filas rechazadas. Si no se
+            pasa, solo se cuentan (y se guarda el preview).
+        checkpoint (IngestCheckpoint | None): Checkpoint del job (ver `CheckpointsRepo`).
+        frames (Iterable | None): Chunks ya validados, como los de `iter_routes_csv`.
 
     Returns:
         dict: Resumen del proceso de ingesta:
             - "inserted": cantidad de rutas insertadas correctamente.
-            - "skipped": cantidad de filas descartadas por errores de parseo.
-            - "skipped_preview": vista previa de hasta 10 errores detectados, 
+            - "skipped": cantidad de filas descartadas (parseo + FKs inexistentes).
+            - "skipped_by_reason": descartadas por motivo, ej.
+              {"validation_error": 3, "orphan_fk": 1}.
+            - "duplicates": rutas válidas que no se insertaron por estar repetidas.
+            - "skipped_preview": vista previa de hasta 10 errores detectados,
               para ayudar a depuración.
+            - "chunks": cantidad de chunks procesados (uno por commit).
+            - "timings": segundos por etapa de esta ejecución ("read", "validate",
+              "fk_check", "insert", "aggregate"; con parseo en paralelo, "parse" en lugar de
+              "read" y "validate").
     """
-    items, parse_errors = parse_routes_csv(fileobj)
-    rows: List[Route] = []
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    workers = workers or settings.INGEST_PARSE_WORKERS
+    errors = error_log if error_log is not None else ErrorLog(preview_size=SKIPPED_PREVIEW_SIZE)
+    start_row = checkpoint.rows_done if checkpoint is not None else 0
+    prev = checkpoint.stats if checkpoint is not None and checkpoint.stats else {}
+    errors.restore(prev.get("skipped_by_reason", {}))
+    inserted = prev.get("inserted", 0)
+    duplicates = prev.get("duplicates", 0)
+    chunks = prev.get("chunks", 0)
+    rows_done = start_row
 
-    for it in items:
-        d = it.model_dump(by_alias=False, exclude_none=True)
-        rows.append(Route(**d))
+    timer = StageTimer()
+    path = file_path(fileobj)
+    # Con checkpoint se guarda además el byte de fin de cada chunk (CSV sin comprimir):
+    # al reanudar se hace `seek` ahí en lugar de volver a leer las filas ya procesadas
+    cursor = ByteCursor() if checkpoint is not None else None
+    if frames is not None:
+        # Tiempo esperando chunks del parser externo
+        frames = timer.timed("parse", frames)
+    elif workers > 1 and path is not None and start_row == 0 and detect_format(fileobj, content_type) == CSV:
+        # Lectura y validación corren juntas en los procesos hijos
+        frames = timer.timed("parse", iter_routes_parallel(
+            path, workers=workers, block_bytes=settings.INGEST_PARSE_BLOCK_BYTES, cursor=cursor
+        ))
+    else:
+        frames = iter_routes_csv(
+            fileobj, chunk_size=chunk_size, content_type=content_type, start_row=start_row, timer=timer,
+            start_byte=checkpoint.byte_offset if checkpoint is not None else None, cursor=cursor,
+        )
+    with timer.stage("fk_check"):
+        ids = {"airlines": IdSet(AirlinesRepo.all_ids(db)), "airports": IdSet(AirportsRepo.all_ids(db))}
 
-    if rows:
-        RoutesRepo.bulk_insert(db, rows)
+    for frame, parse_errors in frames:
+        rows_done += len(frame) + len(parse_errors)
+        with timer.stage("fk_check"):
+            frame, orphan_errors = filter_orphans(frame, ids)
+            frame = frame.assign(fingerprint=route_fingerprints(frame))
+        with timer.stage("insert"):
+            loaded = RoutesRepo.load_frame(db, frame, staging=settings.INGEST_COPY_STAGING, commit=False)
+        if loaded:
+            # Pares nuevos y agregados diarios: solo lo que tocó este chunk, en la misma transacción
+            # (el refresh al final: los locks que toma se liberan en el commit de abajo)
+            with timer.stage("aggregate"):
+                RoutePairsRepo.add_missing(db, RoutePairsRepo.touched_pairs(frame))
+                RouteDailyAggRepo.refresh(db, RouteDailyAggRepo.touched_keys(frame))
+        chunk_errors = sorted(parse_errors + orphan_errors, key=lambda e: e["row"])
+        inserted += loaded
+        duplicates += len(frame) - loaded
+        chunks += 1
+        if checkpoint is not None:
+            by_reason = dict(errors.by_reason)
+            for e in chunk_errors:
+                by_reason[e["reason"]] = by_reason.get(e["reason"], 0) + 1
+            stats = {"inserted": inserted, "duplicates": duplicates, "chunks": chunks, "skipped_by_reason": by_reason}
+            CheckpointsRepo.advance(db, checkpoint, rows_done, stats, byte_offset=cursor.offset if cursor is not None else None)
+        with timer.stage("insert"):
+            db.commit()
+        errors.write(chunk_errors)
+        if progress is not None:
+            progress({"rows": rows_done, "inserted": inserted, "skipped": errors.total})
 
     return {
-        "inserted": len(rows),
-        "skipped": len(parse_errors),
-        "skipped_preview": parse_errors[:10],  # para depurar por qué faltan IDs
+        "inserted": inserted,
+        "skipped": errors.total,
+        "skipped_by_reason": dict(errors.by_reason),
+        "duplicates": duplicates,
+        "skipped_preview": errors.preview,  # para depurar por qué faltan IDs
+        "chunks": chunks,
+        "timings": timer.as_dict(),
     }
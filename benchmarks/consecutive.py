@@ -0,0 +1,98 @@
+"""
+Benchmark de la consulta de días consecutivos con alta ocupación.
+
+Compara la versión anterior (un `EXISTS` correlacionado que, para cada vuelo con
+alta ocupación, vuelve a buscar en `routes` un vuelo de la misma ruta al día
+siguiente) con la actual (`consecutive_high_occupancy_routes`: gaps-and-islands
+con `ROW_NUMBER()` sobre `route_daily_agg`).
+
+Usa los datos que ya haya en la base (por ejemplo, después de `benchmarks.run`)
+y verifica que las dos devuelvan lo mismo: cada par (ruta, día D) de la versión
+anterior tiene que caer dentro de una racha, y una racha de N días equivale a
+N - 1 pares.
+
+Uso:
+    python -m benchmarks.consecutive --db sqlite:///bench.db --min-occupancy 0.85
+"""
+import argparse
+import time
+
+from sqlalchemy import Float, and_, case, cast, create_engine, func, literal, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import exists
+
+from app.models import Route
+from app.repositories.analytics import consecutive_high_occupancy_routes
+
+
+def _next_day(col, dialect: str):
+    if dialect == "postgresql":
+        return col + literal(1)  # date + integer = date
+    return func.date(col, "+1 day")
+
+
+def legacy_pairs(db: Session, min_occupancy: float) -> set:
+    """La consulta anterior, sobre `routes` (con la suma de un día portable a SQLite)."""
+    dialect = db.get_bind().dialect.name
+    R = Route
+    R2 = aliased(Route)
+
+    def occ(t):
+        return case(
+            ((t.tickets_sold.is_not(None)) & (t.capacity.is_not(None)) & (t.capacity > 0),
+             cast(t.tickets_sold, Float) / cast(t.capacity, Float)),
+            else_=None,
+        )
+
+    next_day = _next_day(R.flight_date, dialect)
+    exists_next_day = exists(
+        select(1).where(
+            and_(
+                R2.airline_id == R.airline_id,
+                R2.origin_airport_id == R.origin_airport_id,
+                R2.destination_airport_id == R.destination_airport_id,
+                R2.flight_date == next_day,
+                occ(R2) >= min_occupancy,
+            )
+        )
+    )
+    q = select(R.airline_id, R.origin_airport_id, R.destination_airport_id, R.flight_date).where(
+        occ(R) >= min_occupancy, exists_next_day
+    )
+    return {tuple(r) for r in db.execute(q).all()}
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara la consulta de días consecutivos anterior con la actual")
+    parser.add_argument("--db", default="sqlite:///bench.db", help="SQLAlchemy URL")
+    parser.add_argument("--min-occupancy", type=float, default=0.85)
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas por consulta (se informa la mejor)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.db)
+    with Session(engine) as db:
+        legacy, legacy_s = min(
+            (_timed(lambda: legacy_pairs(db, args.min_occupancy)) for _ in range(args.repeat)), key=lambda t: t[1]
+        )
+        streaks, streak_s = min(
+            (_timed(lambda: consecutive_high_occupancy_routes(db, args.min_occupancy)) for _ in range(args.repeat)),
+            key=lambda t: t[1],
+        )
+
+    pairs_from_streaks = sum(int(r.days) - 1 for r in streaks)
+    print(f"EXISTS sobre routes:          {legacy_s:9.3f}s  {len(legacy)} pares (ruta, día)")
+    print(f"gaps-and-islands (agregado):  {streak_s:9.3f}s  {len(streaks)} rachas = {pairs_from_streaks} pares")
+    if legacy_s and streak_s:
+        print(f"speedup: {legacy_s / streak_s:.1f}x")
+    if pairs_from_streaks != len(legacy):
+        raise SystemExit("Las consultas no coinciden")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Generador de datos sintéticos para el benchmark de ingesta.
+
+Escribe `airports.csv`, `airlines.csv` y `routes.csv` con el mismo formato que
+los archivos reales (encabezados en español, rutas separadas por `|`). La
+popularidad de las rutas sigue una ley de Zipf (pocas rutas concentran la
+mayoría de los vuelos) y una fracción configurable de valores viene "sucia" con
+los mismos casos que reparan `RouteIn` y `AirportIn`: precios con coma decimal,
+fechas en otros formatos, coordenadas sin punto decimal o con puntos de miles,
+DifUTC como H:MM o en minutos, códigos en minúscula, tokens nulos, etc. Parte
+de las rutas sucias no se puede reparar (ids no numéricos o inexistentes) y
+termina en `skipped_by_reason`.
+
+Las rutas se escriben por bloques, así se pueden generar 1e8 filas sin tenerlas
+en memoria.
+
+Uso:
+    python -m benchmarks.generate --routes 1e6 --out bench-data
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ROUTES_HEADER = [
+    "IDAerolinea", "AeropuertoOrigenID", "AeropuertoDestinoID", "OperadoCarrier", "Stops", "Equipamiento",
+    "TicketsVendidos", "Lugares", "PrecioTicket", "KilometrosTotales", "Fecha",
+]
+AIRPORTS_HEADER = [
+    "IDAirport", "NombreAeropuerto", "Ciudad", "Pais", "CodigoAeropuerto", "icao", "Latitud", "Longitud",
+    "Altitud", "DifUTC", "CodigoContinente", "TimezoneOlson",
+]
+AIRLINES_HEADER = ["IDAerolinea", "NombreAerolinea", "IATA", "ICAO", "Pais", "Callsign", "Activa", "Alias"]
+
+COUNTRIES = [
+    ("Argentina", "SA", "America/Argentina/Buenos_Aires", "-3"),
+    ("Brazil", "SA", "America/Sao_Paulo", "-3"),
+    ("Chile", "SA", "America/Santiago", "-4"),
+    ("United States", "NA", "America/New_York", "-5"),
+    ("Spain", "EU", "Europe/Madrid", "1"),
+    ("India", "AS", "Asia/Kolkata", "5.5"),
+    ("Nepal", "AS", "Asia/Kathmandu", "5.75"),
+    ("Australia", "OC", "Australia/Sydney", "10"),
+]
+EQUIPMENT = ["320", "321", "737", "738", "77W", "E90", "CR9", "AT7"]
+BLOCK_ROWS = 1_000_000
+LETTERS = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+
+def _codes(rng: np.random.Generator, n: int, length: int) -> np.ndarray:
+    return np.array(["".join(c) for c in rng.choice(LETTERS, size=(n, length))], dtype=object)
+
+
+def _dirty_mask(rng: np.random.Generator, n: int, share: float) -> np.ndarray:
+    return rng.random(n) < share
+
+
+def _coord_digits(x: float) -> str:
+    """Coordenada sin punto decimal (6 decimales corridos): -34.822222 → "-34822222"."""
+    return str(int(round(x * 1_000_000)))
+
+
+def _coord_thousands(x: float) -> str:
+    """Coordenada con puntos de miles: -34.822222 → "-34.822.222"."""
+    digits = _coord_digits(x)
+    sign, digits = ("-", digits[1:]) if digits.startswith("-") else ("", digits)
+    groups = []
+    while digits:
+        groups.insert(0, digits[-3:])
+        digits = digits[:-3]
+    return sign + ".".join(groups)
+
+
+def write_airports(path: str, n: int, dirty: float, rng: np.random.Generator) -> None:
+    country_idx = rng.integers(0, len(COUNTRIES), n)
+    lat = np.round(rng.uniform(-55, 70, n), 6)
+    lon = np.round(rng.uniform(-170, 170, n), 6)
+    iata = _codes(rng, n, 3)
+    icao = _codes(rng, n, 4)
+    dirty_rows = _dirty_mask(rng, n, dirty)
+    kinds = rng.integers(0, 6, n)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(AIRPORTS_HEADER)
+        for i in range(n):
+            country, continent, tz, utc = COUNTRIES[country_idx[i]]
+            row = [
+                i + 1, f"Airport {i + 1}, {country}", f"City {i % 997}", country, iata[i], icao[i],
+                repr(float(lat[i])), repr(float(lon[i])), int(rng.integers(0, 4000)), utc, continent, tz,
+            ]
+            if dirty_rows[i]:
+                k = kinds[i]
+                if k == 0:
+                    row[6] = _coord_digits(lat[i])
+                elif k == 1:
+                    row[6] = _coord_thousands(lat[i])
+                elif k == 2:
+                    row[9] = {"5.5": "5:30", "5.75": "5:45"}.get(utc, f"{utc}:00")
+                elif k == 3:
+                    row[9] = str(int(float(utc) * 60))  # minutos
+                elif k == 4:
+                    row[9] = "\\N"  # se completa desde TimezoneOlson
+                else:
+                    row[4], row[5] = iata[i].lower(), "N/A"
+            w.writerow(row)
+
+
+def write_airlines(path: str, n: int, dirty: float, rng: np.random.Generator) -> None:
+    iata = _codes(rng, n, 2)
+    icao = _codes(rng, n, 3)
+    dirty_rows = _dirty_mask(rng, n, dirty)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(AIRLINES_HEADER)
+        for i in range(n):
+            row = [i + 1, f"Airline {i + 1}", iata[i], icao[i], COUNTRIES[i % len(COUNTRIES)][0], f"CALL{i}", "Y", ""]
+            if dirty_rows[i]:
+                row[2], row[3], row[6], row[7] = iata[i].lower(), "\\N", "y", "\\N"
+            w.writerow(row)
+
+
+def _route_block(
+    rng: np.random.Generator,
+    n: int,
+    pairs: np.ndarray,
+    weights: np.ndarray,
+    n_airports: int,
+    dirty: float,
+) -> pd.DataFrame:
+    pick = pairs[rng.choice(len(pairs), size=n, p=weights)]
+    capacity = rng.choice(np.array([70, 120, 180, 220, 350]), size=n)
+    sold = (capacity * rng.uniform(0.3, 1.0, n)).astype(np.int64)
+    dates = np.datetime64("2024-01-01") + rng.integers(0, 366, n).astype("timedelta64[D]")
+    df = pd.DataFrame(
+        {
+            "IDAerolinea": pick[:, 0].astype(str),
+            "AeropuertoOrigenID": pick[:, 1].astype(str),
+            "AeropuertoDestinoID": pick[:, 2].astype(str),
+            "OperadoCarrier": np.where(rng.random(n) < 0.8, "Y", ""),
+            "Stops": rng.choice(np.array(["0", "0", "0", "1"]), size=n),
+            "Equipamiento": rng.choice(np.array(EQUIPMENT), size=n),
+            "TicketsVendidos": sold.astype(str),
+            "Lugares": capacity.astype(str),
+            "PrecioTicket": np.char.mod("%.2f", np.round(rng.uniform(20, 900, n), 2)),
+            "KilometrosTotales": rng.integers(150, 12000, n).astype(str),
+            "Fecha": np.datetime_as_string(dates, unit="D"),
+        }
+    ).astype(object)
+
+    dirty_rows = np.flatnonzero(_dirty_mask(rng, n, dirty))
+    kinds = rng.integers(0, 8, len(dirty_rows))
+    for kind, col, fn in (
+        (0, "PrecioTicket", lambda s: s.str.replace(".", ",", regex=False)),  # coma decimal
+        (1, "Fecha", lambda s: pd.to_datetime(s).dt.strftime("%m/%d/%Y")),
+        (2, "Fecha", lambda s: pd.to_datetime(s).dt.strftime("%Y/%m/%d")),
+        (3, "Equipamiento", lambda s: " " + s.str.lower() + " "),
+        (4, "Lugares", lambda s: pd.Series("nan", index=s.index)),
+        (5, "PrecioTicket", lambda s: pd.Series("inf", index=s.index)),
+        (6, "IDAerolinea", lambda s: pd.Series("x", index=s.index)),  # no se puede reparar
+        (7, "AeropuertoDestinoID", lambda s: pd.Series(str(n_airports + 1), index=s.index)),  # orphan_fk
+    ):
+        rows = dirty_rows[kinds == kind]
+        if len(rows):
+            df.loc[rows, col] = fn(df.loc[rows, col]).to_numpy()
+    return df
+
+
+def write_routes(
+    path: str,
+    n: int,
+    *,
+    n_airports: int,
+    n_airlines: int,
+    dirty: float,
+    skew: float,
+    rng: np.random.Generator,
+) -> None:
+    # Rutas distintas (aerolínea, origen, destino) y su popularidad (Zipf)
+    n_pairs = int(min(max(n // 20, 100), n_airports * 40))
+    origin = rng.integers(1, n_airports + 1, n_pairs)
+    dest = (origin + rng.integers(1, n_airports, n_pairs) - 1) % n_airports + 1  # distinto del origen
+    pairs = np.column_stack([rng.integers(1, n_airlines + 1, n_pairs), origin, dest])
+    weights = 1.0 / np.arange(1, n_pairs + 1) ** skew
+    weights /= weights.sum()
+
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        while written < n:
+            size = min(BLOCK_ROWS, n - written)
+            block = _route_block(rng, size, pairs, weights, n_airports, dirty)
+            block.to_csv(fh, sep="|", index=False, header=written == 0)
+            written += size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera archivos sintéticos para el benchmark de ingesta")
+    parser.add_argument("--out", default="bench-data", help="Carpeta de salida")
+    parser.add_argument("--routes", type=float, default=1e5, help="Cantidad de rutas (1e4 a 1e8)")
+    parser.add_argument("--airports", type=int, default=7_000)
+    parser.add_argument("--airlines", type=int, default=1_000)
+    parser.add_argument("--dirty", type=float, default=0.05, help="Fracción de filas con valores sucios")
+    parser.add_argument("--skew", type=float, default=1.1, help="Exponente de Zipf para la popularidad de rutas")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    started = time.perf_counter()
+    write_airports(os.path.join(args.out, "airports.csv"), args.airports, args.dirty, rng)
+    write_airlines(os.path.join(args.out, "airlines.csv"), args.airlines, args.dirty, rng)
+    write_routes(
+        os.path.join(args.out, "routes.csv"),
+        int(args.routes),
+        n_airports=args.airports,
+        n_airlines=args.airlines,
+        dirty=args.dirty,
+        skew=args.skew,
+        rng=rng,
+    )
+    print(f"Datos en {args.out} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
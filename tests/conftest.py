@@ -0,0 +1,50 @@
+import io
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.session import Base
+from app import models  # noqa: F401  registra las tablas
+
+
+@pytest.fixture
+def db():
+    # SQLite en memoria, una base nueva por test
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def dimensions(db):
+    """Aerolíneas 1..5 y aeropuertos 1 y 2, los ids que usa `routes_csv`."""
+    from app.models import Airline, Airport
+
+    db.add_all([Airline(id=i, name=f"Airline {i}") for i in range(1, 6)])
+    db.add_all([
+        Airport(id=i, name=f"Airport {i}", country="Argentina", latitude=-34.0, longitude=-58.0)
+        for i in (1, 2)
+    ])
+    db.commit()
+    return db
+
+
+ROUTES_HEADER = "IDAerolinea|AeropuertoOrigenID|AeropuertoDestinoID|OperadoCarrier|Stops|Equipamiento|TicketsVendidos|Lugares|PrecioTicket|KilometrosTotales|Fecha"
+
+
+@pytest.fixture
+def routes_csv():
+    """Arma un CSV de rutas con `n_ok` filas válidas seguidas de `n_bad` inválidas."""
+    def build(n_ok: int, n_bad: int = 0) -> io.BytesIO:
+        lines = [ROUTES_HEADER]
+        for i in range(n_ok):
+            lines.append(f"{i % 5 + 1}|1|2|Y|0|320|{100 + i}|180|123,456|1500|2024-01-{i % 28 + 1:02d}")
+        for _ in range(n_bad):
+            lines.append("x|1|2||0||||||2024-01-01")
+        return io.BytesIO(("\n".join(lines) + "\n").encode())
+    return build
@@ -0,0 +1,16 @@
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+from app.main import app
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", ["/ingest/routes", "/ingest/bundle"])
+async def test_chunk_size_is_capped(endpoint):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post(
+            endpoint,
+            params={"chunk_size": settings.INGEST_MAX_CHUNK_SIZE + 1},
+            files={"file": ("routes.csv", b"IDAerolinea\n1\n")},
+        )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["query", "chunk_size"]
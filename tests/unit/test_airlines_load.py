@@ -0,0 +1,29 @@
+from sqlalchemy import func, select
+from app.models import Airline
+from app.repositories.airlines import bulk_load
+
+
+def _airline(id_, iata=None, icao=None, name="x") -> dict:
+    return {"id": id_, "name": name, "iata": iata, "icao": icao, "country": None,
+            "callsign": None, "active": None, "aliases": None}
+
+
+def test_bulk_load_counts(db):
+    db.add_all([Airline(id=1, name="Aerolineas", iata="ARG", icao="AARG"), Airline(id=2, name="LATAM", iata="LAN", icao="LANN")])
+    db.commit()
+
+    out = bulk_load(
+        db,
+        [
+            _airline(1, "ARG", "AARG"),   # existente
+            _airline(10, "lan"),          # existente por IATA (se normaliza)
+            _airline(11, "ARG", "LANN"),  # apunta a dos aerolíneas distintas
+            _airline(12, "FLB", "FLBB"),  # nueva
+            _airline(13, "FLB"),          # repite IATA del archivo
+            _airline(None, None, "JSMM"), # nueva sin id
+        ],
+    )
+
+    assert out == {"inserted": 2, "existing": 2, "conflicting": 2}
+    assert db.scalar(select(func.count()).select_from(Airline)) == 4
+    assert db.scalar(select(Airline.active).where(Airline.icao == "JSMM")) is True
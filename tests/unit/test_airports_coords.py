@@ -0,0 +1,59 @@
+import io
+import math
+import pandas as pd
+import pytest
+from app.ingest.airport_csv import parse_airports_csv
+from app.ingest.coords import fix_coords
+from app.schemas.airports import fix_coord
+
+BROKEN = [
+    "-34.8222", "-34,8222", "-348222", "-34822200", "123.456.789", "1.234.567", "-58535", "-5853500",
+    "181", "-9999.5", "12345678901", "0", "+45.5", ".5", "90", "-180.0000001", "1e3", "1_000",
+    "inf", "nan", "", "  ", "abc", "12a34", "-", "4.5.6.7.8", "²", None,
+]
+
+
+def _same(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or math.isnan(b)
+    return a == b
+
+
+def test_fix_coords_matches_validator():
+    for field in ("latitude", "longitude"):
+        got = fix_coords(pd.Series(BROKEN, dtype=object), field)
+        for raw, value in zip(BROKEN, got):
+            try:
+                expected = fix_coord(raw, field)
+            except ValueError:
+                expected = None
+            assert _same(value, expected), (field, raw, value, expected)
+
+        numbers = pd.Series([-34.8, 3480.0, -999999.0, 1e300, float("nan")])
+        got = fix_coords(numbers, field)
+        assert all(_same(v, fix_coord(r, field)) for r, v in zip(numbers, got))
+
+
+def test_parse_airports_csv_repairs_coords():
+    csv = (
+        "IDAirport,NombreAeropuerto,Pais,Latitud,Longitud,DifUTC,TimezoneOlson\n"
+        "1,Ezeiza,Argentina,-348222,-58535,-3,America/Argentina/Buenos_Aires\n"
+    )
+    (row,) = parse_airports_csv(io.BytesIO(csv.encode()))
+    assert (row["latitude"], row["longitude"]) == (fix_coord("-348222", "latitude"), fix_coord("-58535", "longitude"))
+
+
+def test_repaired_coords_skip_the_row_validator(monkeypatch):
+    from app.schemas import airports
+
+    calls = []
+    real = airports.fix_coord
+    monkeypatch.setattr(airports, "fix_coord", lambda v, field: calls.append(v) or real(v, field))
+    csv = (
+        "IDAirport,NombreAeropuerto,Pais,Latitud,Longitud,DifUTC,TimezoneOlson\n"
+        "1,Ezeiza,Argentina,-348222,-58535,-3,America/Argentina/Buenos_Aires\n"
+        "2,Sin coords,Argentina,abc,-58.5,-3,America/Argentina/Buenos_Aires\n"
+    )
+    with pytest.raises(ValueError):
+        parse_airports_csv(io.BytesIO(csv.encode()))
+    assert calls == ["abc"]  # solo lo que `fix_coords` no pudo reparar
@@ -0,0 +1,26 @@
+from app.schemas.airports import AirportIn, resolve_tz_offset, resolve_utc_raw, utc_cache_stats
+
+
+def _row(dif, tz="America/Argentina/Buenos_Aires"):
+    return {
+        "IDAirport": "1", "NombreAeropuerto": "Ezeiza", "Pais": "Argentina",
+        "Latitud": "-34.8", "Longitud": "-58.5", "DifUTC": dif, "TimezoneOlson": tz,
+    }
+
+
+def test_utc_resolvers_match_decimal_parsing():
+    for raw in ["5.75", "-3.5", "12,75", "5:45", "+9:00", "160", "5.8", "99", "", "x", 5.5, float("nan")]:
+        d = AirportIn._parse_utc_any(raw)
+        assert resolve_utc_raw(raw) == (float(d) if d is not None else None)
+    assert resolve_tz_offset("Asia/Kathmandu") == 5.75
+    assert resolve_tz_offset("Nope/Nowhere") is None
+
+
+def test_airport_offsets_are_cached():
+    before = utc_cache_stats()
+    rows = [AirportIn.model_validate(_row(d)) for d in ["-3", "-3", "", "", "bad"]]
+
+    assert [r.utc_offset for r in rows] == [-3.0, -3.0, -3.0, -3.0, -3.0]
+    after = utc_cache_stats()
+    assert after["utc_raw"]["hits"] > before["utc_raw"]["hits"]
+    assert after["timezone"]["hits"] >= before["timezone"]["hits"] + 2
@@ -0,0 +1,63 @@
+from sqlalchemy import func, select
+from app.models import Airport
+from app.repositories.airports import AirportsRepo
+
+
+def _airport(id_: int, name: str, **kw) -> dict:
+    base = {
+        "id": id_, "name": name, "city": None, "country": "Argentina", "iata": None, "icao": None,
+        "latitude": -34.8, "longitude": -58.5, "altitude_ft": 20, "utc_offset": -3.0,
+        "continent_code": "S", "timezone_olson": "America/Buenos_Aires",
+    }
+    base.update(kw)
+    return base
+
+
+def test_bulk_upsert_last_one_wins(db):
+    out = AirportsRepo.bulk_upsert(db, [_airport(1, "Ezeiza"), _airport(2, "Aeroparque", iata="aep")])
+    assert out == {"inserted": 2, "updated": 0, "skipped": 0}
+
+    out = AirportsRepo.bulk_upsert(
+        db,
+        [_airport(2, "Jorge Newbery"), _airport(3, "Córdoba"), _airport(3, "Pajas Blancas"), _airport(None, "?")],
+    )
+    assert out == {"inserted": 1, "updated": 1, "skipped": 1}
+    assert db.scalar(select(func.count()).select_from(Airport)) == 3
+    assert db.get(Airport, 2).name == "Jorge Newbery"
+    assert db.get(Airport, 3).name == "Pajas Blancas"
+
+
+def test_upsert_refreshes_route_pairs(db, dimensions, routes_csv):
+    from app.models import RoutePair
+    from app.repositories.analytics import domestic_altitude_percentage
+    from app.services.airports import upsert_airports
+    from app.services.routes import ingest_routes_service
+
+    ingest_routes_service(db, routes_csv(3))  # 1 → 2, ocupación >= 0.55
+    pair = db.get(RoutePair, (1, 2))
+    assert (pair.is_domestic, pair.altitude_diff_m, pair.distance_km) == (True, None, 0.0)
+    assert domestic_altitude_percentage(db, 0.5) == (0, 0, 0.0)  # sin altitudes
+
+    # ~1330 km al sudoeste y 4980 ft (~1518 m) más alto
+    upsert_airports(db, [_airport(1, "Airport 1"), _airport(2, "Airport 2", latitude=-41.15, longitude=-71.16, altitude_ft=5000)])
+    pair = db.get(RoutePair, (1, 2))
+    assert pair.altitude_diff_m == abs((20 - 5000) * 0.3048)
+    assert 1300 < pair.distance_km < 1360
+    assert domestic_altitude_percentage(db, 0.5) == (3, 3, 100.0)
+
+    upsert_airports(db, [_airport(2, "Airport 2", country="Chile", altitude_ft=5000)])
+    assert db.get(RoutePair, (1, 2)).is_domestic is False
+    assert domestic_altitude_percentage(db, 0.5) == (0, 0, 0.0)
+
+
+def test_route_pairs_insert_tolerates_pairs_added_concurrently(db, dimensions):
+    from app.models import RoutePair
+    from app.repositories.route_pairs import RoutePairsRepo, _insert_pairs
+
+    # Otro job insertó el par entre el SELECT de `add_missing` y su INSERT
+    db.add(RoutePair(origin_airport_id=1, destination_airport_id=2, is_domestic=False))
+    db.flush()
+    assert _insert_pairs(db, [(1, 2), (2, 1)]) == 2
+    db.commit()
+    assert db.get(RoutePair, (1, 2)).is_domestic is False and db.get(RoutePair, (2, 1)).is_domestic is True
+    assert RoutePairsRepo.add_missing(db, [(1, 2), (2, 1)]) == 0
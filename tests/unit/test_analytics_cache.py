@@ -0,0 +1,36 @@
+from datetime import date
+from app.services.cache import ResultCache
+
+
+def test_result_cache_lru_and_normalized_keys():
+    cache = ResultCache(max_entries=2)
+    calls = []
+
+    def compute(tag):
+        return lambda: calls.append(tag) or tag
+
+    assert cache.get_or_compute("top", {"start": date(2024, 1, 1), "limit": 5}, compute("a")) == "a"
+    # mismos parámetros en otro orden/tipo: acierto
+    assert cache.get_or_compute("top", {"limit": 5, "start": date(2024, 1, 1)}, compute("x")) == "a"
+    cache.get_or_compute("occ", {}, compute("b"))
+    cache.get_or_compute("top", {"start": date(2024, 1, 1), "limit": 5}, compute("x"))  # "top" pasa a reciente
+    cache.get_or_compute("streaks", {}, compute("c"))  # desaloja "occ"
+    cache.get_or_compute("occ", {}, compute("b2"))
+
+    assert calls == ["a", "b", "c", "b2"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 4, 2, 2)
+
+
+def test_result_cache_invalidated_by_data_version():
+    cache = ResultCache(max_entries=10)
+    cache.get_or_compute("occ", {}, lambda: 1)
+
+    def compute_during_ingest():
+        cache.bump_version()  # termina una ingesta mientras se calcula
+        return 2
+
+    assert cache.get_or_compute("occ", {"x": 1}, compute_during_ingest) == 2
+    assert cache.stats()["size"] == 0  # lo viejo se descartó y el resultado en vuelo no se guardó
+    assert cache.get_or_compute("occ", {}, lambda: 3) == 3
+    assert cache.stats()["data_version"] == 1
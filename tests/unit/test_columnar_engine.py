@@ -0,0 +1,104 @@
+import io
+from datetime import date
+import numpy as np
+from app.models import Airport
+from app.repositories import analytics as repo
+from app.services.cache import analytics_cache
+from app.services.columnar import ColumnarEngine
+from app.services.routes import ingest_routes_service
+from conftest import ROUTES_HEADER
+
+
+def _csv(*rows: str) -> io.BytesIO:
+    return io.BytesIO(("\n".join([ROUTES_HEADER, *rows]) + "\n").encode())
+
+
+def _same_results(engine: ColumnarEngine, db) -> None:
+    for kwargs in ({}, {"start": date(2024, 1, 2)}, {"only_operated": True}, {"min_flights": 3}):
+        assert engine.find_airline_occupancy_orm(db, **kwargs) == repo.find_airline_occupancy_orm(db, **kwargs)
+    for scope in ("origin", "destination", "either"):
+        for kwargs in ({}, {"end": date(2024, 1, 2), "only_operated": False}, {"limit": 1}):
+            args = {"country": "Argentina", "scope": scope, **kwargs}
+            assert engine.find_top_routes_by_country_orm(db, **args) == repo.find_top_routes_by_country_orm(db, **args)
+    for occ in (0.0, 0.5, 0.85):
+        assert engine.domestic_altitude_percentage(db, occ) == repo.domestic_altitude_percentage(db, occ)
+        for kwargs in ({}, {"start": date(2024, 1, 2)}, {"min_streak": 3}):
+            expected = [tuple(r) for r in repo.consecutive_high_occupancy_routes(db, occ, **kwargs)]
+            assert [tuple(r) for r in engine.consecutive_high_occupancy_routes(db, occ, **kwargs)] == expected
+
+
+def test_columnar_engine_matches_sql(db, dimensions):
+    db.add_all([
+        Airport(id=3, name="Airport 3", iata="BRC", country="Argentina", latitude=-41.0, longitude=-71.0, altitude_ft=2772),
+        Airport(id=4, name="Airport 4", iata="GRU", country="Brazil", latitude=-23.0, longitude=-46.0, altitude_ft=2459),
+    ])
+    db.get(Airport, 1).altitude_ft = 20
+    db.commit()
+
+    engine = ColumnarEngine()
+    ingest_routes_service(db, _csv(
+        *(f"1|1|3|Y|0|320|95|100|10|1500|2024-01-0{d}" for d in (1, 2, 3, 5)),
+        "1|1|3|Y|0|738|10|100|10|1500|2024-01-04",
+        "2|1|2||0|320|90|100|10|1500|2024-01-01",
+        "2|1|2||0|738|90|0|10|1500|2024-01-02",   # capacity 0: sin ocupación
+        "3|4|1|Y|0|320|50|100|10|1500|2024-01-02",
+        "3|1|4|Y|0|320|99|100|10|1500|2024-01-03",
+        "4|3|1||0|320||180|10|1500|2024-01-03",    # sin tickets
+    ))
+    analytics_cache.bump_version()
+    _same_results(engine, db)
+    loaded = engine.snapshot(db)
+
+    # Carga incremental: solo se leen las rutas nuevas
+    ingest_routes_service(db, _csv(
+        "1|1|3|Y|0|320|99|100|10|1500|2024-01-04",
+        "5|3|4|Y|0|320|180|180|10|1500|2024-01-01",
+        "5|3|4|Y|0|320|170|180|10|1500|2024-01-02",
+    ))
+    analytics_cache.bump_version()
+    _same_results(engine, db)
+    assert len(engine.snapshot(db).tickets) == len(loaded.tickets) + 3
+    assert loaded.day.dtype == np.int16
+
+    # Fechas fuera del rango de int16 (±89 años de 2000): los días pasan a int32 sin desbordarse
+    ingest_routes_service(db, _csv(
+        "1|1|3|Y|0|320|99|100|10|1500|2095-01-01",
+        "1|1|3|Y|0|320|99|100|10|1500|2095-01-02",
+        "2|1|2||0|320|90|100|10|1500|1905-06-01",
+    ))
+    analytics_cache.bump_version()
+    _same_results(engine, db)
+    assert engine.snapshot(db).day.dtype == np.int32
+    for kwargs in ({"start": date(2090, 1, 1)}, {"end": date(1950, 1, 1)}):
+        assert engine.find_airline_occupancy_orm(db, **kwargs) == repo.find_airline_occupancy_orm(db, **kwargs)
+    streaks = engine.consecutive_high_occupancy_routes(db, 0.85, start=date(2090, 1, 1))
+    assert [(r.streak_start, r.streak_end) for r in streaks] == [(date(2095, 1, 1), date(2095, 1, 2))]
+
+
+def test_columnar_engine_loads_in_batches_and_picks_up_late_commits(db, dimensions, monkeypatch):
+    from app.models import Route
+    from app.services import columnar
+
+    monkeypatch.setattr(columnar, "LOAD_BATCH_ROWS", 2)
+    engine = ColumnarEngine()
+    ingest_routes_service(db, _csv(*(f"1|1|2|Y|0|320|9{d}|100|10|1500|2024-01-0{d}" for d in range(1, 6))))
+    analytics_cache.bump_version()
+    snap = engine.snapshot(db)
+    assert len(snap.tickets) == 5 and snap.recheck == (snap.last_id - 1, 1)  # lotes de 2, 2 y 1
+
+    def route(id_: int) -> Route:
+        return Route(id=id_, airline_id=2, origin_airport_id=1, destination_airport_id=2, flight_date=date(2024, 2, 1),
+                     operated_carrier=True, tickets_sold=50, capacity=100)
+
+    last = snap.last_id
+    db.add(route(last + 100))
+    db.commit()
+    analytics_cache.bump_version()
+    assert len(engine.snapshot(db).tickets) == 6
+
+    # Una ruta con id menor que el último cargado que se commitea tarde: se recarga todo
+    db.add(route(last + 50))
+    db.commit()
+    analytics_cache.bump_version()
+    snap = engine.snapshot(db)
+    assert len(snap.tickets) == 7 and snap.last_id == last + 100
@@ -0,0 +1,58 @@
+import gzip
+import io
+import pytest
+from app.ingest.compression import GZIP, ZSTD, detect_compression, open_decompressed
+from app.ingest.routes_csv import file_path, iter_routes_csv
+
+
+def test_detect_compression():
+    plain = io.BytesIO(b"IDAerolinea|...\n")
+    assert detect_compression(plain) is None
+    assert detect_compression(plain, filename="routes.csv.gz") == GZIP
+    assert detect_compression(plain, content_encoding="zstd") == ZSTD
+    assert detect_compression(io.BytesIO(gzip.compress(b"x"))) == GZIP
+    assert plain.tell() == 0
+
+
+def _stream(routes_csv, compression, tmp_path):
+    data = routes_csv(20, 2).getvalue()
+    if compression == GZIP:
+        packed = gzip.compress(data)
+    else:
+        zstandard = pytest.importorskip("zstandard")
+        packed = zstandard.ZstdCompressor().compress(data)
+    path = tmp_path / "routes.bin"
+    path.write_bytes(packed)
+    return open(path, "rb")
+
+
+@pytest.mark.parametrize("compression", [GZIP, ZSTD])
+def test_compressed_routes_stream_into_chunked_parser(routes_csv, compression, tmp_path):
+    with _stream(routes_csv, compression, tmp_path) as raw:
+        assert detect_compression(raw) == compression
+        stream = open_decompressed(raw, compression)
+        assert file_path(stream) is None  # nada de parseo paralelo sobre el comprimido
+        chunks = list(iter_routes_csv(stream, chunk_size=7))
+
+    assert sum(len(frame) for frame, _ in chunks) == 20
+    assert [e["row"] for _, errors in chunks for e in errors] == [20, 21]
+
+
+def test_dimension_csv_fallback_reparses_decompressed_stream(tmp_path, monkeypatch):
+    import pandas as pd
+    from app.ingest import readers
+
+    path = tmp_path / "airlines.csv.gz"
+    path.write_bytes(gzip.compress(b"IDAerolinea,NombreAerolinea\n1,Uno\n2,Dos\n"))
+    real_read_csv = pd.read_csv
+
+    def c_engine_fails(*args, **kw):
+        if kw.get("engine") != "python":
+            args[0].read()  # consume el buffer antes de fallar, como un error a mitad de archivo
+            raise ValueError("C error")
+        return real_read_csv(*args, **kw)
+
+    monkeypatch.setattr(readers.pd, "read_csv", c_engine_fails)
+    with open(path, "rb") as raw:
+        df = readers.read_dimension_csv(open_decompressed(raw, GZIP))
+    assert df["NombreAerolinea"].tolist() == ["Uno", "Dos"]
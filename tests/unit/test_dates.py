@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from app.ingest.dates import detect_date_format, parse_date, parse_dates
+
+VALUES = [
+    "2024-01-02", "2024-1-5", "01/02/2024", "1/2/2024", "13/02/2024", "2024/01/02", "20240105",
+    "2024-02-30", "0999-01-01", "2024-01-02T10:00:00", "2024-01-02 ", "01/02/24", "bad",
+]
+
+
+def _reference(v):
+    dt = pd.to_datetime(v, errors="coerce", dayfirst=False)
+    return dt.date() if not pd.isna(dt) else None
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_parse_date_matches_pandas_guessing():
+    assert [parse_date(v) for v in VALUES] == [_reference(v) for v in VALUES]
+    parsed = parse_dates(VALUES)
+    assert [None if pd.isna(d) else d.date() for d in parsed] == [_reference(v) for v in VALUES]
+
+
+def test_detect_date_format_prefers_month_first():
+    assert detect_date_format(["01/02/2024", "03/04/2024"]) == "%m/%d/%Y"
+    assert detect_date_format(["2024-01-02", "2024-12-31"]) == "%Y-%m-%d"
+    assert detect_date_format(["bad"]) is None
@@ -0,0 +1,30 @@
+from app.models import Airport
+from app.repositories.analytics import find_top_routes_by_country_orm
+from app.repositories.dimensions import DimensionCache, dimension_cache
+from app.services.routes import ingest_routes_service
+
+
+def test_dimension_cache_loads_once_until_invalidated(db, dimensions):
+    cache = DimensionCache()
+    dims = cache.get(db)
+    assert dims.airports_by_country == {"Argentina": [1, 2]}
+    assert dims.airlines[3].name == "Airline 3"
+    assert cache.get(db) is dims and cache.loads == 1
+
+    db.get(Airport, 2).iata = "EZE"
+    db.commit()
+    assert cache.get(db).airports[2].label == "Airport 2"  # sigue la foto vieja
+    cache.invalidate()
+    assert cache.get(db).airports[2].label == "EZE"
+    assert cache.loads == 2
+
+
+def test_top_routes_labels_come_from_dimension_cache(db, dimensions, routes_csv):
+    ingest_routes_service(db, routes_csv(3))
+    db.get(Airport, 1).iata = "AEP"
+    db.commit()
+    dimension_cache.invalidate()
+
+    top = find_top_routes_by_country_orm(db, country="Argentina")
+    assert [(r.origin, r.destination, r.flights) for r in top] == [("AEP", "Airport 2", 3)]
+    assert find_top_routes_by_country_orm(db, country="Chile") == []
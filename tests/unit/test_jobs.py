@@ -0,0 +1,237 @@
+import os
+import time
+from datetime import datetime
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.ingest.error_log import ErrorLog, read_error_log
+from app.models import IngestCheckpoint
+from app.services.jobs import FAILED, SUCCEEDED, JobManager, spool_upload
+
+
+@pytest.fixture
+def manager(db, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.INGEST_SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr("app.core.config.settings.INGEST_ERROR_DIR", str(tmp_path / "errors"))
+    return JobManager(1, session_factory=sessionmaker(bind=db.get_bind()))
+
+
+def _wait(manager: JobManager, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id).to_dict()
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("el job no terminó a tiempo")
+
+
+def test_routes_job_reports_progress(manager, dimensions, routes_csv, tmp_path):
+    path, sha256 = spool_upload(routes_csv(30, 2))
+    job = _wait(manager, manager.submit("routes", path, filename="routes.csv", sha256=sha256, chunk_size=8).id)
+
+    assert job["status"] == SUCCEEDED, job["error"]
+    assert job["rows_processed"] == 32
+    assert job["rows_rejected"] == 2
+    assert job["result"]["inserted"] == 30
+    assert set(job["result"]["timings"]) == {"read", "validate", "fk_check", "insert", "aggregate"}
+    assert not list((tmp_path / "spool").iterdir())  # el spool se borra al terminar
+
+
+def test_same_file_is_ingested_once(manager, dimensions, routes_csv):
+    results = []
+    for _ in range(2):
+        path, sha256 = spool_upload(routes_csv(10))
+        results.append(_wait(manager, manager.submit("routes", path, filename="r.csv", sha256=sha256).id)["result"])
+
+    assert results[0]["inserted"] == 10
+    assert results[1] == {"duplicate_file": True, "previous_filename": "r.csv", "previous_rows_inserted": 10, "inserted": 0}
+
+
+def test_older_airports_file_is_reapplied(manager, db):
+    import io
+    from app.models import Airport
+
+    header = "IDAirport,NombreAeropuerto,Ciudad,Pais,CodigoAeropuerto,icao,Latitud,Longitud,Altitud,DifUTC,CodigoContinente,TimezoneOlson\n"
+
+    def airports_file(name: str) -> io.BytesIO:
+        return io.BytesIO((header + f"1,{name},Buenos Aires,Argentina,EZE,SAEZ,-34.8,-58.5,67,-3,SA,America/Argentina/Buenos_Aires\n").encode())
+
+    for name in ("Ezeiza", "Ministro Pistarini", "Ezeiza"):  # A, B y otra vez A
+        path, sha256 = spool_upload(airports_file(name))
+        job = _wait(manager, manager.submit("airports", path, filename="airports.csv", sha256=sha256).id)
+        assert job["status"] == SUCCEEDED, job["error"]
+        assert "duplicate_file" not in job["result"]
+
+    db.expire_all()
+    assert db.get(Airport, 1).name == "Ezeiza"  # último gana
+
+
+def test_gzip_upload_is_decompressed_while_parsing(manager, dimensions, routes_csv):
+    import gzip
+    import io
+
+    path, sha256 = spool_upload(io.BytesIO(gzip.compress(routes_csv(12, 1).getvalue())))
+    job = _wait(manager, manager.submit("routes", path, filename="routes.csv.gz", sha256=sha256).id)
+
+    assert job["status"] == SUCCEEDED, job["error"]
+    assert (job["result"]["inserted"], job["result"]["skipped"]) == (12, 1)
+
+
+def test_rejected_rows_go_to_the_error_log(manager, dimensions, routes_csv):
+    path, sha256 = spool_upload(routes_csv(5, 25))
+    job_id = manager.submit("routes", path, filename="routes.csv", sha256=sha256, chunk_size=10).id
+    job = _wait(manager, job_id)
+
+    assert job["result"]["skipped_by_reason"] == {"validation_error": 25}
+    assert len(job["result"]["skipped_preview"]) == 10
+    log = manager.get(job_id).error_log_path
+    assert [e["row"] for e in read_error_log(log, offset=20, limit=10)] == [25, 26, 27, 28, 29]
+    assert read_error_log(log)[0]["errors"][0]["loc"] == ["IDAerolinea"]
+
+
+def test_error_log_is_readable_while_open(tmp_path):
+    path = str(tmp_path / "errors.ndjson")
+    with ErrorLog(path) as errors:
+        errors.write([{"row": 3, "reason": "orphan_fk"}])
+        assert read_error_log(path) == [{"row": 3, "reason": "orphan_fk"}]  # flush por lote
+
+
+def _fail_third_chunk(monkeypatch) -> list:
+    from app.repositories.routes import RoutesRepo
+
+    real_load = RoutesRepo.load_frame
+    calls = []
+
+    def flaky_load(db, frame, **kw):
+        calls.append(len(frame))
+        if len(calls) == 3:
+            raise RuntimeError("se cortó la conexión")
+        return real_load(db, frame, **kw)
+
+    monkeypatch.setattr(RoutesRepo, "load_frame", staticmethod(flaky_load))
+    return calls
+
+
+def test_failed_routes_job_resumes_from_checkpoint(manager, db, dimensions, routes_csv, monkeypatch):
+    calls = _fail_third_chunk(monkeypatch)
+    path, sha256 = spool_upload(routes_csv(30, 3))
+    job_id = manager.submit("routes", path, filename="routes.csv", sha256=sha256, chunk_size=10).id
+    failed = _wait(manager, job_id)
+    assert failed["status"] == FAILED and failed["resumable"]
+
+    # CSV sin comprimir: el checkpoint guarda dónde empieza la fila 20 y se retoma desde ahí
+    with open(path, "rb") as fh:
+        header_and_20_rows = b"".join(fh.readline() for _ in range(21))
+    assert db.get(IngestCheckpoint, job_id).byte_offset == len(header_and_20_rows)
+
+    resumed = manager.resume(job_id)
+    assert resumed.resumed_from_row == 20
+    job = _wait(manager, job_id)
+
+    assert job["status"] == SUCCEEDED, job["error"]
+    assert (job["result"]["inserted"], job["result"]["skipped"], job["result"]["duplicates"]) == (30, 3, 0)
+    assert calls == [10, 10, 10, 10, 0]  # solo se repite el chunk que falló (el último son 3 filas inválidas)
+    assert manager.resume(job_id) is None  # el checkpoint se borra al terminar
+
+
+def test_routes_job_parsed_in_parallel_resumes_from_byte_offset(manager, db, dimensions, routes_csv, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.INGEST_PARSE_WORKERS", 2)
+    monkeypatch.setattr("app.core.config.settings.INGEST_PARSE_BLOCK_BYTES", 300)
+    _fail_third_chunk(monkeypatch)
+    path, sha256 = spool_upload(routes_csv(30, 3))
+    job_id = manager.submit("routes", path, filename="routes.csv", sha256=sha256).id
+    assert _wait(manager, job_id, timeout=60)["status"] == FAILED
+
+    cp = db.get(IngestCheckpoint, job_id)
+    with open(path, "rb") as fh:
+        prefix = b"".join(fh.readline() for _ in range(cp.rows_done + 1))
+    assert cp.rows_done > 0 and cp.byte_offset == len(prefix)
+
+    manager.resume(job_id)
+    job = _wait(manager, job_id)
+    assert job["status"] == SUCCEEDED, job["error"]
+    assert (job["result"]["inserted"], job["result"]["skipped"]) == (30, 3)
+    assert [e["row"] for e in read_error_log(manager.get(job_id).error_log_path)] == [30, 31, 32]
+
+
+def test_checkpoint_without_byte_offset_skips_processed_lines(db, dimensions, routes_csv, tmp_path):
+    from app.repositories.checkpoints import CheckpointsRepo
+    from app.services.routes import ingest_routes_service
+
+    # Checkpoint escrito antes de que existiera `byte_offset`
+    path = tmp_path / "routes.csv"
+    path.write_bytes(routes_csv(30, 1).getvalue())
+    cp = CheckpointsRepo.create(db, "old-job", kind="routes", path=str(path), filename=None, sha256=None, options={})
+    cp.rows_done, cp.stats = 20, {"inserted": 20, "duplicates": 0, "chunks": 2, "skipped_by_reason": {}}
+    db.commit()
+
+    with open(path, "rb") as fh:
+        out = ingest_routes_service(db, fh, chunk_size=10, checkpoint=cp, workers=1)
+    assert (out["inserted"], out["skipped"]) == (30, 1)
+    assert [e["row"] for e in out["skipped_preview"]] == [30]
+
+
+def test_purge_expired_drops_abandoned_checkpoints_and_spool_files(manager, db, dimensions, routes_csv, monkeypatch):
+    _fail_third_chunk(monkeypatch)
+    path, sha256 = spool_upload(routes_csv(30))
+    job_id = manager.submit("routes", path, filename="routes.csv", sha256=sha256, chunk_size=10).id
+    assert _wait(manager, job_id)["status"] == FAILED
+    stray, _ = spool_upload(routes_csv(1))
+
+    log = manager.get(job_id).error_log_path
+    assert manager.purge_expired() == {"jobs": 0, "checkpoints": 0, "spool_files": 0, "error_logs": 0}  # todavía no vencen
+
+    db.get(IngestCheckpoint, job_id).updated_at = datetime(2000, 1, 1)
+    db.commit()
+    os.utime(stray, (0, 0))
+    os.utime(log, (0, 0))
+    manager.get(job_id).finished_at = 0
+    assert manager.purge_expired() == {"jobs": 1, "checkpoints": 1, "spool_files": 1, "error_logs": 1}
+    assert not any(os.path.exists(p) for p in (path, stray, log))
+    assert manager.get(job_id) is None
+    assert manager.resume(job_id) is None
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar.gz"])
+def test_bundle_loads_dimensions_then_routes(manager, routes_csv, tmp_path, fmt):
+    import io
+    import tarfile
+    import zipfile
+
+    files = {
+        "data/airports.csv": (
+            "IDAirport,NombreAeropuerto,Ciudad,Pais,CodigoAeropuerto,icao,Latitud,Longitud,Altitud,DifUTC,CodigoContinente,TimezoneOlson\n"
+            "1,Ezeiza,Buenos Aires,Argentina,EZE,SAEZ,-34.822222,-58.535833,67,-3,SA,America/Argentina/Buenos_Aires\n"
+            "2,Aeroparque,Buenos Aires,Argentina,AEP,SABE,-34.559175,-58.415606,18,-3,SA,America/Argentina/Buenos_Aires\n"
+        ).encode(),
+        "data/airlines.csv": (
+            "IDAerolinea,NombreAerolinea,IATA,ICAO,Pais,Callsign,Activa,Alias\n"
+            + "".join(f"{i},Airline {i},A{i},AL{i},Argentina,,Y,\n" for i in range(1, 5))
+        ).encode(),
+        "data/routes.csv": routes_csv(20, 1).getvalue(),
+        "README.txt": b"ignorado",
+    }
+    bundle = tmp_path / f"bundle.{fmt}"
+    if fmt == "zip":
+        with zipfile.ZipFile(bundle, "w") as zf:
+            for name, data in files.items():
+                zf.writestr(name, data)
+    else:
+        with tarfile.open(bundle, "w:gz") as tf:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+    with open(bundle, "rb") as fh:
+        path, sha256 = spool_upload(fh)
+    job = _wait(manager, manager.submit("bundle", path, filename=bundle.name, sha256=sha256, chunk_size=5).id)
+
+    assert job["status"] == SUCCEEDED, job["error"]
+    files_out = job["result"]["files"]
+    assert files_out["airports"]["rows"] == 2 and files_out["airlines"]["inserted"] == 4
+    routes = files_out["routes"]
+    # la aerolínea 5 no viene en el bundle: sus rutas quedan como orphan_fk
+    assert routes["inserted"] == 16
+    assert routes["skipped_by_reason"] == {"validation_error": 1, "orphan_fk": 4}
+    assert routes["member"] == "data/routes.csv"
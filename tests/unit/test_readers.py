@@ -0,0 +1,55 @@
+import io
+import pandas as pd
+import pytest
+from app.ingest.readers import ARROW_FILE, ARROW_STREAM, CSV, PARQUET, detect_format
+from app.ingest.routes_csv import iter_routes_csv
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def _routes_table(routes_csv) -> "pa.Table":
+    # Tipos "nativos" como los exportaría un warehouse: ints, floats, bool, fecha
+    raw = pd.read_csv(routes_csv(12, 2), sep="|", dtype=str, keep_default_na=False)
+    df = raw.copy()
+    for col in ["AeropuertoOrigenID", "AeropuertoDestinoID", "Stops", "TicketsVendidos", "Lugares"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    df["KilometrosTotales"] = pd.to_numeric(df["KilometrosTotales"], errors="coerce")
+    df["OperadoCarrier"] = df["OperadoCarrier"] == "Y"
+    df["Fecha"] = pd.to_datetime(df["Fecha"]).dt.date
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _serialize(table, fmt) -> io.BytesIO:
+    buf = io.BytesIO()
+    if fmt == PARQUET:
+        pq.write_table(table, buf, row_group_size=5)
+    elif fmt == ARROW_FILE:
+        with pa.ipc.new_file(buf, table.schema) as w:
+            w.write_table(table, max_chunksize=5)
+    else:
+        with pa.ipc.new_stream(buf, table.schema) as w:
+            w.write_table(table, max_chunksize=5)
+    buf.seek(0)
+    return buf
+
+
+@pytest.mark.parametrize("fmt", [PARQUET, ARROW_FILE, ARROW_STREAM])
+def test_columnar_routes_match_csv(routes_csv, fmt):
+    expected = list(iter_routes_csv(routes_csv(12, 2), chunk_size=100))[0]
+
+    buf = _serialize(_routes_table(routes_csv), fmt)
+    assert detect_format(buf) == fmt
+    chunks = list(iter_routes_csv(buf, chunk_size=4))
+
+    assert len(chunks) > 1
+    frame = pd.concat([f for f, _ in chunks])
+    errors = [e for _, errs in chunks for e in errs]
+    pd.testing.assert_frame_equal(frame, expected[0])
+    assert [e["row"] for e in errors] == [e["row"] for e in expected[1]]
+
+
+def test_detect_format_falls_back_to_content_type(routes_csv):
+    assert detect_format(routes_csv(1)) == CSV
+    assert detect_format(routes_csv(1), "application/vnd.apache.parquet") == PARQUET
@@ -0,0 +1,98 @@
+import io
+from datetime import date
+import pandas as pd
+from sqlalchemy import select
+from app.models import RouteDailyAgg
+from app.repositories.analytics import find_airline_occupancy_orm, find_top_routes_by_country_orm
+from app.services.routes import ingest_routes_service
+from conftest import ROUTES_HEADER
+
+
+def _csv(*rows: str) -> io.BytesIO:
+    return io.BytesIO(("\n".join([ROUTES_HEADER, *rows]) + "\n").encode())
+
+
+def test_ingest_refreshes_touched_daily_aggregates(db, dimensions):
+    ingest_routes_service(db, _csv(
+        "1|1|2|Y|0|320|90|100|10|1500|2024-01-01",
+        "1|1|2|Y|0|738|50|100|20|1500|2024-01-01",
+        "2|1|2||0|320|10|200|5|1500|2024-01-02",
+    ))
+    # segunda carga: suma un vuelo a una clave existente y repite uno ya cargado
+    out = ingest_routes_service(db, _csv(
+        "1|1|2|Y|0|77W|100|400|30|1500|2024-01-01",
+        "2|1|2||0|320|10|200|5|1500|2024-01-02",
+    ))
+    assert out["duplicates"] == 1
+
+    aggs = {
+        (a.airline_id, a.flight_date): (a.flights, a.tickets, a.capacity, a.revenue, a.max_occupancy)
+        for a in db.scalars(select(RouteDailyAgg))
+    }
+    assert aggs == {
+        (1, date(2024, 1, 1)): (3, 240, 600, 90 * 10 + 50 * 20 + 100 * 30, 0.9),
+        (2, date(2024, 1, 2)): (1, 10, 200, 50.0, 0.05),
+    }
+
+    occ = {r.airline_id: (r.flights, r.occupancy) for r in find_airline_occupancy_orm(db)}
+    assert occ == {1: (3, 240 / 600), 2: (1, 0.05)}
+    top = find_top_routes_by_country_orm(db, country="Argentina")
+    assert [(r.origin_airport_id, r.destination_airport_id, r.flights) for r in top] == [(1, 2, 4)]
+
+
+def test_refresh_upserts_one_row_per_key(db, dimensions):
+    from app.repositories.route_daily_agg import RouteDailyAggRepo
+
+    # Agregado que otro job dejó commiteado entre nuestro INSERT de rutas y el refresh
+    db.add(RouteDailyAgg(
+        airline_id=1, origin_airport_id=1, destination_airport_id=2, flight_date=date(2024, 1, 1),
+        operated_carrier=True, flights=1, tickets=5, capacity=100, revenue=50.0, max_occupancy=0.05,
+    ))
+    db.commit()
+    ingest_routes_service(db, _csv(
+        "1|1|2|Y|0|320|90|100|10|1500|2024-01-01",
+        "1|1|2|Y|0|738|50|100|20|1500|2024-01-01",
+        "1|1|2|Y|0|320|90|100|10|1500|2024-01-02",
+    ))
+    frame = pd.DataFrame({
+        "airline_id": [1, 1], "origin_airport_id": [1, 1], "destination_airport_id": [2, 2],
+        "flight_date": ["2024-01-01", "2024-01-02"], "operated_carrier": [True, True],
+    })
+    RouteDailyAggRepo.refresh(db, RouteDailyAggRepo.touched_keys(frame))  # otra vez: no duplica
+    db.commit()
+
+    aggs = sorted((a.flight_date.day, a.flights, a.tickets) for a in db.scalars(select(RouteDailyAgg)))
+    assert aggs == [(1, 2, 140), (2, 1, 90)]
+
+
+def test_consecutive_high_occupancy_streaks(db, dimensions):
+    from app.repositories.analytics import consecutive_high_occupancy_routes
+
+    ingest_routes_service(db, _csv(
+        *(f"1|1|2|Y|0|320|95|100|10|1500|2024-01-0{d}" for d in (1, 2, 3, 5)),
+        "1|1|2|Y|0|738|10|100|10|1500|2024-01-04",  # baja ocupación: corta la racha
+        "1|1|2|Y|0|320|99|100|10|1500|2024-01-06",
+        "2|1|2|Y|0|320|90|100|10|1500|2024-01-01",
+        "2|1|2||0|320|20|100|10|1500|2024-01-02",
+        "2|1|2|Y|0|738|90|100|10|1500|2024-01-02",  # otro vuelo del mismo día sí supera el umbral
+    ))
+
+    rows = consecutive_high_occupancy_routes(db, min_occupancy=0.85)
+    assert [(r.airline, r.streak_start.day, r.streak_end.day, r.days) for r in rows] == [
+        ("Airline 1", 1, 3, 3),
+        ("Airline 1", 5, 6, 2),
+        ("Airline 2", 1, 2, 2),
+    ]
+    rows = consecutive_high_occupancy_routes(db, min_occupancy=0.85, min_streak=3)
+    assert [(r.airline, r.days) for r in rows] == [("Airline 1", 3)]
+    rows = consecutive_high_occupancy_routes(db, min_occupancy=0.85, start=date(2024, 1, 2))
+    assert [(r.airline, r.streak_start.day, r.days) for r in rows] == [("Airline 1", 2, 2), ("Airline 1", 5, 2)]
+
+    # La respuesta de la API expone la racha y mantiene los nombres anteriores como alias
+    from app.schemas.analytics import ConsecutiveHighOccRoute
+    from app.services.analytics import consecutive_high_occupancy_routes as service
+
+    out = [ConsecutiveHighOccRoute(**r).model_dump() for r in service(db, min_occupancy=0.85, min_streak=3)]
+    assert [(r["streak_start"], r["streak_end"], r["first_date"], r["second_date"], r["days"]) for r in out] == [
+        (date(2024, 1, 1), date(2024, 1, 3), date(2024, 1, 1), date(2024, 1, 3), 3),
+    ]
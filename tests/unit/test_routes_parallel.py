@@ -0,0 +1,38 @@
+from app.ingest.parallel import iter_routes_parallel, split_byte_ranges
+from app.ingest.routes_csv import iter_routes_csv, parse_routes_csv
+
+
+def _write(tmp_path, buf):
+    path = tmp_path / "routes.csv"
+    path.write_bytes(buf.getvalue())
+    return str(path)
+
+
+def test_byte_ranges_cover_file_on_line_boundaries(tmp_path, routes_csv):
+    path = _write(tmp_path, routes_csv(40, 5))
+    header, ranges = split_byte_ranges(path, block_bytes=200)
+
+    data = open(path, "rb").read()
+    assert data.startswith(header)
+    assert ranges[0][0] == len(header) and ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, end in ranges)
+
+
+def test_parallel_matches_sequential(tmp_path, routes_csv):
+    path = _write(tmp_path, routes_csv(40, 5))
+
+    with open(path, "rb") as f:
+        seq = list(iter_routes_csv(f, chunk_size=1000))
+    par = list(iter_routes_parallel(path, workers=2, block_bytes=200))
+
+    assert len(par) > 2
+    seq_frame, seq_errors = seq[0]
+    par_rows = [i for frame, _ in par for i in frame.index]
+    par_errors = [e for _, errors in par for e in errors]
+    assert par_rows == list(seq_frame.index)
+    assert [e["row"] for e in par_errors] == [e["row"] for e in seq_errors] == list(range(40, 45))
+
+    with open(path, "rb") as f:
+        items, errors = parse_routes_csv(f, workers=2)
+    assert len(items) == 40 and [e["row"] for e in errors] == list(range(40, 45))
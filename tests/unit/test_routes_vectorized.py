@@ -0,0 +1,82 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from app.ingest.routes_csv import validate_routes_records
+from app.ingest.routes_vectorized import ROUTE_COLUMNS, frame_to_rows, validate_routes_frame
+
+INTS = ["1", " 42 ", "+7", "-3", "007", "1.0", "1,5", "1,000", "abc", "", "nan", "NULL", "None", "inf", "1_000", "١٢"]
+FLOATS = ["1500", "1500,5", " 12.25 ", "-1", "1e3", "1E-2", "inf", "-inf", "NaN", "", "abc", "1_0", ".5", "5.", "1.2.3"]
+PRICES = ["100", "123,456", "2.675", "2.665", "0.125", "0.135", "1.005", "9.995", "-0", "-5", "1e2", "", "null", "abc", "5.", ".5", "+3.14159", "12345678901234.5"]
+DATES = ["2024-01-02", "01/02/2024", "13/02/2024", "20240105", "2024-02-30", "", "bad", "2024-03-04T10:00:00"]
+FLAGS = ["Y", "y", " Y ", "N", "", "yes"]
+EQUIP = ["320", " 738 ", "", "a320 b738", "nan"]
+
+COLUMNS = {
+    "IDAerolinea": INTS,
+    "AeropuertoOrigenID": INTS,
+    "AeropuertoDestinoID": INTS,
+    "OperadoCarrier": FLAGS,
+    "Stops": INTS,
+    "Equipamiento": EQUIP,
+    "TicketsVendidos": INTS,
+    "Lugares": INTS,
+    "PrecioTicket": PRICES,
+    "KilometrosTotales": FLOATS,
+    "Fecha": DATES,
+}
+
+
+def _same(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b
+
+
+def _assert_parity(df: pd.DataFrame, row_offset: int = 0):
+    items, ref_errors = validate_routes_records(df, row_offset)
+    frame, errors = validate_routes_frame(df, row_offset)
+
+    assert [e["row"] for e in errors] == [e["row"] for e in ref_errors]
+    for got, ref in zip(errors, ref_errors):
+        assert got["reason"] == ref["reason"]
+        assert got["rec"] == ref["rec"]
+        assert [(e["type"], e["loc"]) for e in got["errors"]] == [(e["type"], e["loc"]) for e in ref["errors"]]
+
+    assert list(frame.columns) == ROUTE_COLUMNS
+    assert len(frame) == len(items)
+    for row, it in zip(frame_to_rows(frame), items):
+        ref = it.model_dump()
+        if ref["price_ticket"] is not None:
+            ref["price_ticket"] = float(ref["price_ticket"])
+        for col in ROUTE_COLUMNS:
+            assert _same(row[col], ref[col]), (col, row[col], ref[col])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parity_random_corpus(seed):
+    rnd = random.Random(seed)
+    # se sesga hacia valores válidos en los IDs para que haya filas de los dos tipos
+    good_ints = ["1", " 42 ", "+7", "007", "1_000"]
+    data = {
+        col: [rnd.choice(good_ints if col.startswith(("ID", "Aeropuerto", "Stops")) and rnd.random() < 0.9 else values) for _ in range(400)]
+        for col, values in COLUMNS.items()
+    }
+    _assert_parity(pd.DataFrame(data, dtype=str), row_offset=seed * 1000)
+
+
+@pytest.mark.parametrize("col", list(COLUMNS))
+def test_parity_each_value(col):
+    base = {c: "1" for c in COLUMNS}
+    base.update({"Fecha": "2024-01-02", "PrecioTicket": "10", "OperadoCarrier": "Y", "Equipamiento": "320", "Stops": "0"})
+    rows = [{**base, col: v} for v in COLUMNS[col]]
+    _assert_parity(pd.DataFrame(rows, dtype=str))
+
+
+def test_parity_missing_columns():
+    df = pd.DataFrame({"IDAerolinea": ["1", "x"], "AeropuertoOrigenID": ["2", "3"]}, dtype=str)
+    _assert_parity(df)
@@ -0,0 +1,41 @@
+import itertools
+from types import SimpleNamespace
+import pytest
+from app.ingest import timings
+from app.ingest.timings import StageTimer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Reloj falso: cada lectura avanza 1 segundo
+    ticks = itertools.count()
+    monkeypatch.setattr(timings, "time", SimpleNamespace(perf_counter=lambda: float(next(ticks))))
+
+
+def test_nested_stages_accumulate_separately(clock):
+    timer = StageTimer()
+    for _ in range(2):
+        with timer.stage("insert"):
+            with timer.stage("aggregate"):
+                pass
+    # Por vuelta: insert 4 lecturas del reloj (3 s, incluye la etapa anidada), aggregate 1 s
+    assert timer.as_dict() == {"aggregate": 2.0, "insert": 6.0}
+
+
+def test_stage_counts_time_even_if_it_raises(clock):
+    timer = StageTimer()
+    with pytest.raises(ValueError):
+        with timer.stage("insert"):
+            raise ValueError("falló")
+    assert timer.as_dict() == {"insert": 1.0}
+
+
+def test_timed_counts_only_time_spent_producing_items(clock):
+    timer = StageTimer()
+    seen = []
+    for item in timer.timed("read", ["a", "b"]):
+        with timer.stage("insert"):
+            seen.append(item)
+    # read: 3 `next` (2 items + StopIteration) de 1 s; lo que hace el consumidor no se suma
+    assert seen == ["a", "b"]
+    assert timer.as_dict() == {"read": 3.0, "insert": 2.0}